@@ -0,0 +1,106 @@
+"""Single-pass, numerically stable aggregates over operand streams."""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable, Iterator
+
+
+class RunningStats:
+    """Constant-memory summary of a stream of values.
+
+    The total is a Neumaier (improved Kahan) compensated sum, the mean and
+    variance use Welford's update, and the minimum and maximum are tracked
+    directly, so one pass over any iterable yields every statistic without
+    storing the values or losing precision to cancellation.
+    """
+
+    __slots__ = ("count", "minimum", "maximum", "_sum", "_compensation", "_mean", "_m2")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._sum = 0.0
+        self._compensation = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.extend(values)
+
+    def update(self, value: float) -> None:
+        """Add one value to the summary."""
+        self.extend((value,))
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Add every value of an iterable in one pass."""
+        # Work on locals and store once; attribute access per value would
+        # dominate the loop.
+        count = self.count
+        minimum = self.minimum
+        maximum = self.maximum
+        total = self._sum
+        compensation = self._compensation
+        mean = self._mean
+        m2 = self._m2
+        for value in values:
+            value = float(value)
+            count += 1
+            minimum = min(minimum, value)
+            maximum = max(maximum, value)
+            running = total + value
+            if abs(total) >= abs(value):
+                compensation += (total - running) + value
+            else:
+                compensation += (value - running) + total
+            total = running
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+        self.count = count
+        self.minimum = minimum
+        self.maximum = maximum
+        self._sum = total
+        self._compensation = compensation
+        self._mean = mean
+        self._m2 = m2
+
+    @property
+    def total(self) -> float:
+        """Compensated sum of the values."""
+        if not math.isfinite(self._sum):
+            return self._sum
+        return self._sum + self._compensation
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of the values."""
+        self._require(1, "mean")
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (``n - 1`` denominator) of the values."""
+        self._require(2, "variance")
+        return self._m2 / (self.count - 1)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def _require(self, count: int, statistic: str) -> None:
+        """Raise ValueError if too few values were seen for a statistic."""
+        if self.count < count:
+            plural = "value" if count == 1 else "values"
+            raise ValueError(f"{statistic} requires at least {count} {plural}.")
+
+
+def running_sum(values: Iterable[float]) -> Iterator[float]:
+    """Yield the compensated running total after each value."""
+    stats = RunningStats()
+    for value in values:
+        stats.update(value)
+        yield stats.total
+
+
+__all__ = ["RunningStats", "running_sum"]
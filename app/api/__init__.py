@@ -0,0 +1,135 @@
+"""Batched JSON-over-HTTP evaluation endpoint."""
+
+from __future__ import annotations
+
+import json
+import math
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from app.calculation import CalculationFactory
+
+EVALUATE_PATH = "/evaluate"
+# Largest request body accepted, enough for well over 100k items.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def evaluate_items(items: List[object]) -> List[Dict[str, object]]:
+    """Evaluate ``{"op", "a", "b"}`` items, reporting errors per item.
+
+    Each item yields ``{"result": value}`` or ``{"error": message}``, so one
+    bad item never fails the rest of the batch. Infinite and NaN results
+    are errors too, since JSON cannot represent them.
+    """
+    evaluate = CalculationFactory.evaluate
+    results: List[Dict[str, object]] = []
+    for item in items:
+        try:
+            operation, a, b = _unpack(item)
+            result = evaluate(operation, a, b)
+            if not isinstance(result, (int, float)):
+                raise ValueError("Result is not a real number.")
+            if not math.isfinite(result):
+                raise ValueError("Result is not a finite number.")
+            results.append({"result": result})
+        except (ArithmeticError, ValueError) as exc:
+            results.append({"error": str(exc)})
+    return results
+
+
+def _unpack(item: object) -> Tuple[str, float, float]:
+    """Validate one request item and return its operation and operands."""
+    if not isinstance(item, dict):
+        raise ValueError("Each item must be an object with 'op', 'a' and 'b'.")
+    operation = item.get("op")
+    if not isinstance(operation, str):
+        raise ValueError("Item field 'op' must be a string.")
+    operands = item.get("a"), item.get("b")
+    for operand in operands:
+        if isinstance(operand, bool) or not isinstance(operand, (int, float)):
+            raise ValueError("Item fields 'a' and 'b' must be numbers.")
+    return operation.lower(), float(operands[0]), float(operands[1])
+
+
+class EvaluationHandler(BaseHTTPRequestHandler):
+    """Serve ``POST /evaluate`` over persistent HTTP/1.1 connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Evaluate a JSON array of calculations."""
+        # Error responses sent before the body is read close the connection,
+        # since the unread body would otherwise be parsed as the next request.
+        if self.path != EVALUATE_PATH:
+            self._reject(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._reject(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required.")
+            return
+        if length < 0:
+            self._reject(HTTPStatus.BAD_REQUEST, "Content-Length must not be negative.")
+            return
+        if length > MAX_BODY_BYTES:
+            self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+            return
+
+        try:
+            items = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Body must be valid JSON."})
+            return
+        if not isinstance(items, list):
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON array of items."}
+            )
+            return
+        self._send_json(HTTPStatus.OK, {"results": evaluate_items(items)})
+
+    # pylint: disable-next=redefined-builtin
+    def log_message(self, format: str, *args: object) -> None:
+        """Skip per-request logging, which would dominate small requests."""
+
+    def _reject(self, status: HTTPStatus, message: str) -> None:
+        """Send an error and close the connection, leaving any body unread.
+
+        ``Connection: close`` tells the client, and makes the handler drop
+        the connection once the response is sent.
+        """
+        self._send_json(status, {"error": message}, close=True)
+
+    def _send_json(self, status: HTTPStatus, payload: object, close: bool = False) -> None:
+        """Write a JSON response with an explicit length for keep-alive."""
+        body = json.dumps(payload, allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Create (and bind) the evaluation HTTP server."""
+    return ThreadingHTTPServer((host, port), EvaluationHandler)
+
+
+def serve_http(host: str, port: int) -> None:
+    """Run the evaluation HTTP server in the foreground until interrupted."""
+    with create_server(host, port) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+__all__ = [
+    "EVALUATE_PATH",
+    "EvaluationHandler",
+    "create_server",
+    "evaluate_items",
+    "serve_http",
+]
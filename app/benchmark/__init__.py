@@ -0,0 +1,486 @@
+"""Benchmark suite for the calculator's parse, dispatch and execute stages."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from array import array
+from itertools import cycle, islice
+from time import perf_counter_ns
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from app.calculation import AddCalculation, CalculationFactory
+from app.calculator import Calculator
+from app.history import History, format_calculation
+from app.operations import Operations
+from app.output import NUMBER_FORMATS, OutputSink, number_formatter
+
+# Stored baseline results, relative to the repository root. Baselines are
+# machine-specific, so record them on the machine that runs the comparison.
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+# Lines evaluated by one scripted REPL session.
+SESSION_LINES = 1000
+# Operands folded by one n-ary reduction.
+REDUCE_OPERANDS = 1000
+# Rows in one no-raise batch evaluation.
+BATCH_ROWS = 1000
+# Pending calculations held by the memory benchmark.
+MEMORY_CALCULATIONS = 1_000_000
+# Thread counts compared by the concurrency benchmark.
+DEFAULT_THREAD_COUNTS = (1, 2, 4, 8)
+# Operation the concurrency benchmark's writer registers and removes again.
+_SCRATCH_OPERATION = "benchmark_scratch"
+
+_OPERATIONS = {
+    "add": Operations.addition,
+    "subtract": Operations.subtraction,
+    "multiply": Operations.multiplication,
+    "divide": Operations.division,
+    "power": Operations.power,
+}
+
+_SESSION_SCRIPT = list(
+    islice(cycle([f"{name} 3 1.5" for name in _OPERATIONS]), SESSION_LINES)
+) + ["exit"]
+
+
+class Measurement(NamedTuple):
+    """Throughput and per-operation batch-mean latencies for one benchmark.
+
+    Every latency is a batch's mean time per operation: ``min_ns`` is the
+    fastest batch, and the ``batch_p*_ns`` fields are percentiles over the
+    batches, not over individual calls.
+    """
+
+    name: str
+    ops_per_sec: float
+    min_ns: float
+    batch_p50_ns: float
+    batch_p90_ns: float
+    batch_p99_ns: float
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    number: int,
+    repeat: int,
+    ops_per_call: int = 1,
+) -> Measurement:
+    """Time ``repeat`` batches of ``number`` calls and summarise them.
+
+    Each batch yields one mean per-operation latency, so the percentiles
+    describe batch-to-batch variation, not the tail of single calls, and
+    no timer overhead is added per call.
+    """
+    if number < 1 or repeat < 1:
+        raise ValueError("Benchmark number and repeat must be at least 1.")
+    samples = []
+    calls = range(number)
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        for _ in calls:
+            func()
+        samples.append((perf_counter_ns() - start) / (number * ops_per_call))
+    samples.sort()
+    total_ns = sum(samples) * number * ops_per_call
+    return Measurement(
+        name,
+        number * repeat * ops_per_call * 1e9 / max(total_ns, 1.0),
+        samples[0],
+        _percentile(samples, 50),
+        _percentile(samples, 90),
+        _percentile(samples, 99),
+    )
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+class MemoryResult(NamedTuple):
+    """Retained memory and build time per pending calculation."""
+
+    name: str
+    count: int
+    bytes_per_calculation: float
+    ns_per_calculation: float
+
+
+def run_memory(count: int = MEMORY_CALCULATIONS) -> List[MemoryResult]:
+    """Compare ways of holding ``count`` pending additions.
+
+    ``instances`` is a list of ``create_calculation`` results, ``batch`` a
+    ``CalculationBatch`` from ``create_batch``. Memory is what the result
+    retains beyond the operand lists, measured with ``tracemalloc``; time
+    is measured in a separate run, as tracing slows allocation down.
+    """
+    if count < 1:
+        raise ValueError("Benchmark count must be at least 1.")
+    a_values = [float(index) for index in range(count)]
+    b_values = [index + 0.5 for index in range(count)]
+    create = CalculationFactory.create_calculation
+    builders: Dict[str, Callable[[], object]] = {
+        "instances": lambda: [create("add", a, b) for a, b in zip(a_values, b_values)],
+        "batch": lambda: CalculationFactory.create_batch("add", a_values, b_values),
+    }
+    results = []
+    for name, build in builders.items():
+        start = perf_counter_ns()
+        pending = build()
+        elapsed = perf_counter_ns() - start
+        del pending
+        tracemalloc.start()
+        try:
+            pending = build()
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del pending
+        results.append(MemoryResult(name, count, retained / count, elapsed / count))
+    return results
+
+
+def format_memory(results: List[MemoryResult]) -> str:
+    """Render memory results as an aligned text table."""
+    lines = [f"{'pending':<10} {'count':>10} {'bytes/calc':>11} {'ns/calc':>9}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<10} {result.count:>10,} "
+            f"{result.bytes_per_calculation:>11.1f} {result.ns_per_calculation:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+class ConcurrencyResult(NamedTuple):
+    """Throughput of concurrent readers while a writer changes the registry."""
+
+    threads: int
+    ops_per_sec: float
+    speedup: float
+    writes: int
+
+
+def run_concurrency(
+    thread_counts: Tuple[int, ...] = DEFAULT_THREAD_COUNTS, number: int = 100000
+) -> List[ConcurrencyResult]:
+    """Measure dispatch throughput as reader threads are added.
+
+    For each thread count, every reader evaluates ``number`` operations
+    through ``CalculationFactory.evaluate`` while one writer thread keeps
+    registering and unregistering a scratch operation, so the readers run
+    against snapshots that are being replaced under them. Speedup is
+    relative to the first thread count. Readers only scale on free-threaded
+    builds; with the GIL the throughput stays roughly flat.
+    """
+    if number < 1 or not thread_counts or min(thread_counts) < 1:
+        raise ValueError("Benchmark number and thread counts must be at least 1.")
+    results: List[ConcurrencyResult] = []
+    for threads in thread_counts:
+        ops_per_sec, writes = _measure_concurrency(threads, number)
+        speedup = ops_per_sec / results[0].ops_per_sec if results else 1.0
+        results.append(ConcurrencyResult(threads, ops_per_sec, speedup, writes))
+    return results
+
+
+def _measure_concurrency(threads: int, number: int) -> Tuple[float, int]:
+    """Run ``threads`` readers against one registry writer; return ops/s and writes."""
+    names = list(islice(cycle(_OPERATIONS), number))
+    evaluate = CalculationFactory.evaluate
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    writes = 0
+
+    def read() -> None:
+        start.wait()
+        try:
+            for name in names:
+                evaluate(name, 3.0, 1.5)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            errors.append(exc)
+
+    def write() -> None:
+        nonlocal writes
+        register = CalculationFactory.register_calculation(_SCRATCH_OPERATION)
+        while not stop.is_set():
+            register(AddCalculation)
+            CalculationFactory.unregister_calculation(_SCRATCH_OPERATION)
+            writes += 1
+
+    readers = [threading.Thread(target=read) for _ in range(threads)]
+    writer = threading.Thread(target=write)
+    for reader in readers:
+        reader.start()
+    writer.start()
+    began = perf_counter_ns()
+    start.wait()
+    for reader in readers:
+        reader.join()
+    elapsed = perf_counter_ns() - began
+    stop.set()
+    writer.join()
+    if errors:
+        raise errors[0]
+    return threads * number * 1e9 / max(elapsed, 1), writes
+
+
+def format_concurrency(results: List[ConcurrencyResult]) -> str:
+    """Render concurrency results as an aligned text table."""
+    lines = [f"{'threads':>7} {'ops/s':>14} {'speedup':>8} {'writes':>8}"]
+    for result in results:
+        lines.append(
+            f"{result.threads:>7} {result.ops_per_sec:>14,.0f} "
+            f"{result.speedup:>7.2f}x {result.writes:>8}"
+        )
+    if getattr(sys, "_is_gil_enabled", lambda: True)():
+        lines.append("The GIL is enabled, so reader threads cannot run in parallel.")
+    return "\n".join(lines)
+
+
+def benchmark_cases() -> Dict[str, Tuple[Callable[[], object], int]]:
+    """Return the benchmark cases as ``name -> (callable, ops per call)``."""
+    parse = Calculator()._parse_input  # pylint: disable=protected-access
+    cases: Dict[str, Tuple[Callable[[], object], int]] = {
+        "parse": (lambda: parse("add 1.5 2.5"), 1),
+        "create_calculation": (
+            lambda: CalculationFactory.create_calculation("add", 1.5, 2.5),
+            1,
+        ),
+    }
+    for name, function in _OPERATIONS.items():
+        cases[f"dispatch.{name}"] = (
+            lambda name=name: CalculationFactory.evaluate(name, 3.0, 1.5),
+            1,
+        )
+        cases[f"execute.{name}"] = (lambda function=function: function(3.0, 1.5), 1)
+    operands = array("d", [1.0] * REDUCE_OPERANDS)
+    for name in ("add", "multiply"):
+        cases[f"reduce.{name}"] = (
+            lambda name=name: CalculationFactory.reduce(name, operands),
+            REDUCE_OPERANDS,
+        )
+    # Every other divisor is zero in the second case; with status codes
+    # instead of exceptions the two should run at about the same speed.
+    dividends = array("d", [3.0] * BATCH_ROWS)
+    divisors = {
+        "divide": array("d", [1.5] * BATCH_ROWS),
+        "divide_zero": array("d", [1.5, 0.0] * (BATCH_ROWS // 2)),
+    }
+    for name, column in divisors.items():
+        cases[f"status.{name}"] = (
+            lambda column=column: CalculationFactory.execute_batch_status(
+                "divide", dividends, column
+            ),
+            BATCH_ROWS,
+        )
+    for mode in NUMBER_FORMATS:
+        cases[f"format.{mode}"] = (
+            lambda number_format=number_formatter(mode): format_calculation(
+                "divide", 2.0, 3.0, 2.0 / 3.0, number_format
+            ),
+            1,
+        )
+    cases.update(_output_cases())
+    cases["repl_session"] = (_run_session, SESSION_LINES)
+    return cases
+
+
+def _output_cases() -> Dict[str, Tuple[Callable[[], object], int]]:
+    """Return cases writing a session's result lines to a line-buffered file.
+
+    A line-buffered file behaves like a terminal: ``print`` costs a write
+    system call per line, while the sink writes the session in one call.
+    Each call opens and closes its own file, which costs little next to
+    the session's writes.
+    """
+    lines = [
+        format_calculation("add", float(index), 1.5, index + 1.5)
+        for index in range(SESSION_LINES)
+    ]
+
+    def print_lines() -> None:
+        with open(os.devnull, "w", encoding="utf-8", buffering=1) as terminal:
+            for line in lines:
+                print(line, file=terminal)
+
+    def sink_lines() -> None:
+        with open(os.devnull, "w", encoding="utf-8", buffering=1) as terminal:
+            sink = OutputSink(terminal.write, terminal.flush)
+            for line in lines:
+                sink(line)
+            sink.flush()
+
+    return {
+        "output.print": (print_lines, SESSION_LINES),
+        "output.sink": (sink_lines, SESSION_LINES),
+    }
+
+
+def _run_session() -> None:
+    """Drive one scripted REPL session through input_func and output_func."""
+    script = iter(_SESSION_SCRIPT)
+    Calculator(
+        input_func=lambda _prompt: next(script),
+        output_func=lambda _text: None,
+        history=History(SESSION_LINES),
+    ).run()
+
+
+def run_benchmarks(
+    number: int = 10000, repeat: int = 20, select: str | None = None
+) -> List[Measurement]:
+    """Run every benchmark whose name starts with ``select``."""
+    results = []
+    for name, (func, ops_per_call) in benchmark_cases().items():
+        if select is not None and not name.startswith(select):
+            continue
+        calls = max(1, number // ops_per_call)
+        results.append(measure(name, func, calls, repeat, ops_per_call))
+    return results
+
+
+def compare(
+    results: List[Measurement], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Describe every result slower than its baseline by more than ``threshold``.
+
+    The fastest sample is compared because it is the least disturbed by
+    other load on the machine.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        if result.min_ns > expected["min_ns"] * (1 + threshold):
+            change = result.min_ns / expected["min_ns"] - 1
+            regressions.append(
+                f"{result.name}: best {result.min_ns:.1f} ns/op is {change:.1%} "
+                f"slower than the baseline {expected['min_ns']:.1f} ns/op"
+            )
+    return regressions
+
+
+def format_results(results: List[Measurement]) -> str:
+    """Render results as an aligned text table."""
+    lines = [
+        f"{'benchmark':<20} {'ops/s':>14} {'min ns':>10} "
+        f"{'batch p50':>10} {'batch p90':>10} {'batch p99':>10}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<20} {result.ops_per_sec:>14,.0f} {result.min_ns:>10.1f} "
+            f"{result.batch_p50_ns:>10.1f} {result.batch_p90_ns:>10.1f} "
+            f"{result.batch_p99_ns:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the benchmark command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the calculator and compare against a stored baseline."
+    )
+    parser.add_argument("--number", type=int, default=10000, help="operations per sample")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per benchmark")
+    parser.add_argument("--select", help="only run benchmarks starting with this name")
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="baseline JSON file to compare against"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write these results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="fractional slowdown that counts as a regression",
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        nargs="?",
+        const=MEMORY_CALCULATIONS,
+        metavar="COUNT",
+        help="compare the memory held by COUNT pending calculations",
+    )
+    parser.add_argument(
+        "--threads",
+        type=_thread_counts,
+        help="run the concurrency benchmark for these comma-separated thread counts",
+    )
+    return parser
+
+
+def _thread_counts(value: str) -> Tuple[int, ...]:
+    """Parse a comma-separated list of positive thread counts."""
+    try:
+        counts = tuple(int(part) for part in value.split(","))
+    except ValueError:
+        counts = ()
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError(f"invalid thread counts: {value!r}")
+    return counts
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the benchmarks; exit with 1 when any benchmark regressed."""
+    args = build_parser().parse_args(argv)
+    if args.memory is not None:
+        print(format_memory(run_memory(args.memory)))
+        return 0
+    if args.threads:
+        print(format_concurrency(run_concurrency(args.threads, args.number)))
+        return 0
+    results = run_benchmarks(args.number, args.repeat, args.select)
+    print(format_results(results))
+
+    if args.save_baseline:
+        baseline = {result.name: result._asdict() for result in results}
+        for entry in baseline.values():
+            del entry["name"]
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(baseline, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as handle:
+        regressions = compare(results, json.load(handle), args.threshold)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+__all__ = [
+    "ConcurrencyResult",
+    "Measurement",
+    "MemoryResult",
+    "benchmark_cases",
+    "compare",
+    "format_concurrency",
+    "format_memory",
+    "format_results",
+    "main",
+    "measure",
+    "run_benchmarks",
+    "run_concurrency",
+    "run_memory",
+]
@@ -0,0 +1,7 @@
+"""Run the benchmark suite with ``python -m app.benchmark``."""
+
+import sys
+
+from app.benchmark import main
+
+sys.exit(main())
@@ -0,0 +1,380 @@
+"""Memoizing result cache for calculator evaluations."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from array import array
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from app.calculation import CalculationFactory
+
+Key = Tuple[str, float, float]
+
+# Keys per bulk lookup query; three parameters each stays far below
+# SQLite's bound-parameter limit.
+_LOOKUP_CHUNK = 300
+# Operand types ResultCache keys by type and value. Decimal is left out:
+# equal Decimals can print differently (1.0 and 1.00) and their results
+# depend on the active decimal context.
+_KEYED_TYPES = frozenset((float, int, Fraction))
+_INSERT = (
+    "INSERT OR REPLACE INTO results (operation, a, b, result, created) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+class ResultCache:
+    """Bounded LRU cache in front of ``CalculationFactory.evaluate``.
+
+    Float results are keyed by ``(operation, a, b)``; int and ``Fraction``
+    operands add their types to the key, since ``2 == 2.0 == Fraction(2)``
+    and all three hash alike. Failed evaluations such as division by zero
+    are deliberately not cached: the error is raised again on every call
+    and never occupies a slot. Zero and NaN operands bypass the cache
+    because ``0.0 == -0.0`` and ``nan != nan`` would make their keys
+    ambiguous or unmatchable, and so do ``Decimal`` operands.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def evaluate(self, operation: str, a: object, b: object) -> object:
+        """Return the cached result or compute, store and return it."""
+        # A zero, NaN or Decimal operand fails this test, sending the call
+        # straight to the factory. Floats keep the short key; any other
+        # pair carries its types so an exact result never meets a float one.
+        type_a, type_b = type(a), type(b)
+        if not (
+            type_a in _KEYED_TYPES
+            and type_b in _KEYED_TYPES
+            and a and b and a == a and b == b  # pylint: disable=comparison-with-itself
+        ):
+            self.misses += 1
+            return CalculationFactory.evaluate(operation, a, b)
+
+        if type_a is float and type_b is float:
+            key = (operation, a, b)
+        else:
+            key = (operation, a, b, type_a, type_b)
+        entries = self._entries
+        try:
+            result = entries[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = CalculationFactory.evaluate(operation, a, b)
+        entries[key] = result
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit, miss and eviction counters for capacity tuning."""
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class PersistentCache:  # pylint: disable=too-many-instance-attributes
+    """Result cache in an SQLite file shared across processes and restarts.
+
+    It sits in front of ``CalculationFactory`` like ``ResultCache``, with
+    the same rules, except that only float operands are stored: the
+    ``REAL`` columns hold float64, so they cannot key exact operands.
+    Errors, non-float or NaN results, and zero or NaN operands are never
+    stored either. The database runs in WAL mode, so readers in other
+    processes are not blocked while one process writes. New results are
+    buffered and written in one transaction every ``write_batch`` misses,
+    and on ``flush`` or ``close``. Entries older than ``ttl`` seconds are
+    ignored and later purged. Beyond ``capacity`` entries, the oldest are
+    evicted. Eviction goes by insertion time rather than last use, so a
+    cache hit never writes.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        *,
+        capacity: int = 1_000_000,
+        ttl: float | None = None,
+        write_batch: int = 256,
+        timeout: float = 30.0,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive.")
+        if write_batch < 1:
+            raise ValueError("Cache write batch must be at least 1.")
+        self.path = path
+        self.capacity = capacity
+        self.ttl = ttl
+        self.write_batch = write_batch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pending: Dict[Key, float] = {}
+        self._inserted_since_purge = 0
+        self._connection = sqlite3.connect(path, timeout=timeout)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Losing the last few results on power loss is fine for a cache.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "operation TEXT NOT NULL, a REAL NOT NULL, b REAL NOT NULL, "
+                "result REAL NOT NULL, created REAL NOT NULL, "
+                "UNIQUE (operation, a, b))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_created ON results (created)"
+            )
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM results WHERE created >= ?", (self._oldest(),)
+        ).fetchone()
+        return count
+
+    def evaluate(self, operation: str, a: float, b: float) -> float:
+        """Return the stored result or compute, store and return it."""
+        # Zero and NaN operands go straight through, as in ResultCache, and
+        # so do exact ones, which the float64 columns cannot key.
+        if not (
+            type(a) is float  # pylint: disable=unidiomatic-typecheck
+            and type(b) is float  # pylint: disable=unidiomatic-typecheck
+            and a and b and a == a and b == b  # pylint: disable=comparison-with-itself
+        ):
+            self.misses += 1
+            return CalculationFactory.evaluate(operation, a, b)
+
+        key = (operation, a, b)
+        result = self._pending.get(key)
+        if result is None:
+            row = self._connection.execute(
+                "SELECT result FROM results "
+                "WHERE operation = ? AND a = ? AND b = ? AND created >= ?",
+                key + (self._oldest(),),
+            ).fetchone()
+            if row is not None:
+                result = row[0]
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = CalculationFactory.evaluate(operation, a, b)
+        self._store(key, result)
+        return result
+
+    def get_many(self, keys: Iterable[Key]) -> Dict[Key, float]:
+        """Look up many ``(operation, a, b)`` keys with a few bulk queries."""
+        found: Dict[Key, float] = {}
+        missing = []
+        for key in keys:
+            if key in self._pending:
+                found[key] = self._pending[key]
+            else:
+                missing.append(key)
+        oldest = self._oldest()
+        for start in range(0, len(missing), _LOOKUP_CHUNK):
+            chunk = missing[start:start + _LOOKUP_CHUNK]
+            rows = ", ".join(["(?, ?, ?)"] * len(chunk))
+            parameters: List[object] = []
+            for key in chunk:
+                parameters.extend(key)
+            parameters.append(oldest)
+            # Joining against the keys (rather than IN) lets SQLite probe
+            # the unique index once per key instead of scanning the table.
+            for operation, a, b, result in self._connection.execute(
+                "SELECT r.operation, r.a, r.b, r.result "
+                f"FROM (VALUES {rows}) AS k CROSS JOIN results AS r "
+                "ON r.operation = k.column1 AND r.a = k.column2 AND r.b = k.column3 "
+                "WHERE r.created >= ?",
+                parameters,
+            ):
+                found[(operation, a, b)] = result
+        return found
+
+    def put_many(self, items: Iterable[Tuple[Key, float]]) -> None:
+        """Store many ``(key, result)`` pairs in one transaction."""
+        for key, result in items:
+            self._store(key, result, flush=False)
+        self.flush()
+
+    def execute_batch(
+        self, operations, a_values: Sequence[float], b_values: Sequence[float]
+    ) -> array:
+        """Evaluate a batch, computing only the rows not already stored.
+
+        ``operations`` is one operation name or a sequence of per-row names,
+        as for ``CalculationFactory.execute_batch``. Stored rows are found
+        with bulk lookups, the misses run through the factory's batch
+        kernels in one call, and their results are stored in one transaction.
+        """
+        if len(a_values) != len(b_values):
+            raise ValueError("Batch operands must have the same length.")
+        if isinstance(operations, str):
+            operations = [operations] * len(a_values)
+        elif len(operations) != len(a_values):
+            raise ValueError("Batch operations and operands must have the same length.")
+
+        keys = [
+            (str(operation).lower(), a, b)
+            for operation, a, b in zip(operations, a_values, b_values)
+        ]
+        found = self.get_many(key for key in keys if _cacheable(key))
+        results = array("d", bytes(8 * len(keys)))
+        missing = []
+        for index, key in enumerate(keys):
+            result = found.get(key)
+            if result is None:
+                missing.append(index)
+            else:
+                results[index] = result
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = CalculationFactory.execute_batch(
+                [keys[index][0] for index in missing],
+                [keys[index][1] for index in missing],
+                [keys[index][2] for index in missing],
+            )
+            for index, result in zip(missing, computed):
+                results[index] = result
+                if _cacheable(keys[index]):
+                    self._store(keys[index], result, flush=False)
+            self.flush()
+        return results
+
+    def flush(self) -> None:
+        """Write buffered results, evicting once enough have been added.
+
+        The buffer is emptied even when a row is rejected: the batch is then
+        retried one row at a time and the rejected rows are dropped, so one
+        bad result cannot fail every later flush.
+        """
+        if not self._pending:
+            return
+        now = time.time()
+        rows = [key + (result, now) for key, result in self._pending.items()]
+        self._pending.clear()
+        try:
+            with self._connection:
+                self._connection.executemany(_INSERT, rows)
+            stored = len(rows)
+        except sqlite3.IntegrityError:
+            stored = 0
+            for row in rows:
+                try:
+                    with self._connection:
+                        self._connection.execute(_INSERT, row)
+                    stored += 1
+                except sqlite3.IntegrityError:
+                    pass
+        self._inserted_since_purge += stored
+        if self._inserted_since_purge >= max(1, self.capacity // 8):
+            self.purge()
+
+    def purge(self) -> None:
+        """Delete expired entries and the oldest entries beyond capacity."""
+        self._inserted_since_purge = 0
+        with self._connection:
+            if self.ttl is not None:
+                self.evictions += self._connection.execute(
+                    "DELETE FROM results WHERE created < ?", (self._oldest(),)
+                ).rowcount
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.capacity:
+                self.evictions += self._connection.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY created, rowid LIMIT ?)",
+                    (count - self.capacity,),
+                ).rowcount
+
+    def clear(self) -> None:
+        """Drop every stored result and reset the counters."""
+        self._pending.clear()
+        with self._connection:
+            self._connection.execute("DELETE FROM results")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def close(self) -> None:
+        """Write buffered results and close the database."""
+        self.flush()
+        self._connection.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Return this process's hit, miss and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _store(self, key: Key, result: object, flush: bool = True) -> None:
+        """Buffer a float result for the next write; NaN cannot be stored."""
+        if (
+            type(result) is not float  # pylint: disable=unidiomatic-typecheck
+            or result != result  # pylint: disable=comparison-with-itself
+        ):
+            return
+        self._pending[key] = result
+        if flush and len(self._pending) >= self.write_batch:
+            self.flush()
+
+    def _oldest(self) -> float:
+        """Return the creation time before which entries have expired."""
+        return -1.0 if self.ttl is None else time.time() - self.ttl
+
+
+def _cacheable(key: Key) -> bool:
+    """Return whether a key's operands are neither zero nor NaN."""
+    _, a, b = key
+    return bool(a and b and a == a and b == b)  # pylint: disable=comparison-with-itself
+
+
+__all__ = ["PersistentCache", "ResultCache"]
@@ -1,8 +1,39 @@
 """Calculation types and factory registration for the calculator."""
 
+import math
+import numbers
+import operator
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from array import array
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import reduce
+from itertools import compress, count, islice
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Type
+from app.aggregate import RunningStats
 from app.operations import Operations
+from app.power import DEFAULT_ENGINE, MAX_FLOAT_LOG10, powmod
+
+# Entry-point group plugin distributions list their operations under, e.g.
+#     [project.entry-points."calculator.operations"]
+#     modulo = "calculator_modulo:ModuloCalculation"
+PLUGIN_GROUP = "calculator.operations"
+
+# Row status codes returned by execute_batch_status; the failing row's
+# result is NaN, or a signed infinity where IEEE 754 division or an
+# overflow gives one.
+STATUS_OK = 0
+STATUS_INVALID = 1
+STATUS_DIVIDE_BY_ZERO = 2
+STATUS_OVERFLOW = 3
+
+_NAN = float("nan")
+
+# Result typecodes for batches: float64 (the default), float32, which halves
+# the memory a batch moves, and int64, which keeps integer results exact.
+BATCH_TYPECODES = ("d", "f", "q")
 
 # These simple value-object style classes intentionally expose one public method.
 # pylint: disable=too-few-public-methods
@@ -11,6 +42,11 @@ from app.operations import Operations
 class Calculation(ABC):
     """Base class for calculators types such as add, subtract, multiply, divide."""
 
+    __slots__ = ("a", "b")
+    # Whether integer operands always give an integer result, so batches of
+    # int64 columns can produce int64 results.
+    integer_results = False
+
     def __init__(self, a: float, b: float):
         self.a = a
         self.b = b
@@ -19,6 +55,42 @@ class Calculation(ABC):
     def execute(self) -> float:
         """Perform the calculation. This method must be implemented by subclasses."""
 
+    @classmethod
+    def execute_batch(
+        cls, a_values: Sequence[float], b_values: Sequence[float]
+    ) -> Iterable[float]:
+        """Perform the calculation for every operand pair in the batch."""
+        # Subclasses override this with a single C-level kernel over the columns.
+        return [cls(a, b).execute() for a, b in zip(a_values, b_values)]
+
+    @classmethod
+    def execute_batch_status(
+        cls, a_values: Sequence[float], b_values: Sequence[float]
+    ) -> Tuple[array, array]:
+        """Perform the batch without raising for failing rows.
+
+        Returns float64 results and a parallel array of ``STATUS_*`` codes,
+        one byte per row. This default runs the batch kernel and only
+        evaluates row by row if it raises; subclasses whose rows can fail
+        override it with a kernel that never raises. Rows whose finite
+        operands give an infinite result are marked ``STATUS_OVERFLOW``.
+        """
+        try:
+            results = CalculationFactory._to_array(  # pylint: disable=protected-access
+                cls.execute_batch(a_values, b_values)
+            )
+        except (ArithmeticError, ValueError, TypeError):
+            return _evaluate_rows(cls, a_values, b_values)
+        statuses = array("B", bytes(len(results)))
+        _flag_overflow(results, statuses, a_values, b_values)
+        return results, statuses
+
+    @classmethod
+    def reduce(cls, operands: Sequence[float]) -> float:
+        """Fold the calculation left to right over two or more operands."""
+        # Subclasses override this with a single C-level reduction.
+        return reduce(lambda a, b: cls(a, b).execute(), operands)
+
     def __str__(self) -> str:
         """Return a formatted string representation of the calculation."""
         result = self.execute()
@@ -33,10 +105,28 @@ class Calculation(ABC):
 
 
 class CalculationFactory:
-    """Factory for registered calculation classes."""
+    """Factory for registered calculation classes.
+
+    The registries are immutable snapshots. Registration copies a registry,
+    changes the copy and publishes it with one attribute assignment while
+    holding ``_registry_lock``, so writes are atomic and serialized. Readers
+    never lock and always see a complete snapshot, which makes the factory
+    safe to share between threads, including on free-threaded builds.
+    """
 
     # Registry of calculation types mapped to their corresponding classes.
-    calculations: Dict[str, Type[Calculation]] = {}
+    calculations: Mapping[str, Type[Calculation]] = MappingProxyType({})
+    # Normalized operation names mapped straight to a two-operand callable.
+    dispatch: Mapping[str, Callable[[float, float], float]] = MappingProxyType({})
+    # Aggregate names mapped to one-pass reductions over an iterable.
+    aggregates: Mapping[str, Callable[[Iterable[float]], float]] = MappingProxyType({})
+    # Three-operand operation names mapped to their callable.
+    ternaries: Mapping[str, Callable[[float, float, float], float]] = MappingProxyType({})
+    # Plugin operations found in package metadata but not imported yet.
+    plugins: Mapping[str, object] = MappingProxyType({})
+    _plugins_discovered = False
+    # Reentrant, because loading a plugin may register calculations.
+    _registry_lock = threading.RLock()
 
     @classmethod
     def register_calculation(cls, calculation_type: str):
@@ -45,79 +135,805 @@ class CalculationFactory:
 
         def decorator(subclass: Type[Calculation]) -> Type[Calculation]:
             """Register the subclass under the normalized calculation type."""
-            if calculation_type_lower in cls.calculations:
-                raise ValueError(
-                    f"Calculation type '{calculation_type_lower}' is already registered."
+            with cls._registry_lock:
+                if calculation_type_lower in cls.calculations:
+                    raise ValueError(
+                        f"Calculation type '{calculation_type_lower}' is already registered."
+                    )
+                # Publish dispatch first, so every listed name is dispatchable.
+                cls.dispatch = _updated(
+                    cls.dispatch, calculation_type_lower, cls._build_dispatcher(subclass)
                 )
-            cls.calculations[calculation_type_lower] = subclass
+                cls.calculations = _updated(cls.calculations, calculation_type_lower, subclass)
+                cls.plugins = _updated(cls.plugins, calculation_type_lower)
             return subclass
 
         return decorator
 
+    @classmethod
+    def unregister_calculation(cls, calculation_type: str) -> None:
+        """Remove a registered calculation; unknown names raise ValueError."""
+        calculation_type_lower = calculation_type.lower()
+        with cls._registry_lock:
+            if calculation_type_lower not in cls.calculations:
+                raise ValueError(
+                    f"Calculation type '{calculation_type_lower}' is not registered."
+                )
+            cls.calculations = _updated(cls.calculations, calculation_type_lower)
+            cls.dispatch = _updated(cls.dispatch, calculation_type_lower)
+
+    @classmethod
+    def register_aggregate(cls, aggregate_name: str):
+        """Decorator to register a one-pass reduction by aggregate name."""
+        aggregate_name_lower = aggregate_name.lower()
+
+        def decorator(
+            function: Callable[[Iterable[float]], float]
+        ) -> Callable[[Iterable[float]], float]:
+            """Register the reduction under the normalized aggregate name."""
+            with cls._registry_lock:
+                if aggregate_name_lower in cls.aggregates:
+                    raise ValueError(
+                        f"Aggregate '{aggregate_name_lower}' is already registered."
+                    )
+                cls.aggregates = _updated(cls.aggregates, aggregate_name_lower, function)
+            return function
+
+        return decorator
+
+    @classmethod
+    def aggregate(cls, aggregate_name: str, values: Iterable[float]) -> float:
+        """Reduce any iterable of operands with a registered aggregate.
+
+        ``values`` is consumed once, so generators, file streams, arrays and
+        memoryviews are all reduced in constant memory.
+        """
+        aggregate_key = str(aggregate_name).lower()
+        function = cls.aggregates.get(aggregate_key)
+        if function is None:
+            raise ValueError(
+                f"Aggregate '{aggregate_key}' is not registered. "
+                f"Available aggregates: {list(cls.aggregates)}"
+            )
+        return function(values)
+
+    @classmethod
+    def register_ternary(cls, operation_name: str):
+        """Decorator to register a three-operand operation by name."""
+        operation_name_lower = operation_name.lower()
+
+        def decorator(
+            function: Callable[[float, float, float], float]
+        ) -> Callable[[float, float, float], float]:
+            """Register the function under the normalized operation name."""
+            with cls._registry_lock:
+                if operation_name_lower in cls.ternaries:
+                    raise ValueError(
+                        f"Ternary operation '{operation_name_lower}' is already registered."
+                    )
+                cls.ternaries = _updated(cls.ternaries, operation_name_lower, function)
+            return function
+
+        return decorator
+
+    @classmethod
+    def ternary(cls, operation_name: str, a: float, b: float, c: float) -> float:
+        """Evaluate a registered three-operand operation."""
+        operation_key = str(operation_name).lower()
+        function = cls.ternaries.get(operation_key)
+        if function is None:
+            raise ValueError(
+                f"Ternary operation '{operation_key}' is not registered. "
+                f"Available ternary operations: {list(cls.ternaries)}"
+            )
+        return function(a, b, c)
+
+    @classmethod
+    def discover_plugins(cls, group: str = PLUGIN_GROUP) -> List[str]:
+        """Record the plugin operations listed under an entry-point group.
+
+        Only package metadata is read; a plugin's module is imported the
+        first time its operation is used. Registered operations keep their
+        name over plugins, and the first distribution listing a name wins.
+        Returns the newly discovered names.
+        """
+        # importlib.metadata costs more to import than this whole module, so
+        # it is only loaded once something asks for plugins.
+        from importlib.metadata import entry_points  # pylint: disable=import-outside-toplevel
+
+        found = entry_points(group=group)
+        with cls._registry_lock:
+            cls._plugins_discovered = True
+            plugins = dict(cls.plugins)
+            discovered = []
+            for entry_point in found:
+                name = entry_point.name.lower()
+                if name in cls.calculations or name in plugins:
+                    continue
+                plugins[name] = entry_point
+                discovered.append(name)
+            cls.plugins = MappingProxyType(plugins)
+        return discovered
+
+    @classmethod
+    def operation_names(cls) -> List[str]:
+        """Return registered operation names followed by unloaded plugin names."""
+        if not cls._plugins_discovered:
+            cls.discover_plugins()
+        plugins = cls.plugins
+        calculations = cls.calculations
+        return list(calculations) + [name for name in plugins if name not in calculations]
+
     @classmethod
     def create_calculation(cls, operation, a: float, b: float) -> Calculation:
         """Create a calculation instance for the provided operation."""
+        # Registered lower-case names skip normalization, which otherwise
+        # costs more than building the slotted instance itself.
+        try:
+            calculation_class = cls.calculations[operation]
+        except (KeyError, TypeError):
+            calculation_class = cls._get_calculation_class(operation)
+        return calculation_class(a, b)
+
+    @classmethod
+    def create_batch(
+        cls,
+        operation,
+        a_values: Iterable[float] = (),
+        b_values: Iterable[float] = (),
+        typecode: str = "d",
+    ) -> "CalculationBatch":
+        """Create pending calculations of one operation as a compact batch."""
+        return CalculationBatch(
+            cls._get_calculation_class(operation), a_values, b_values, typecode
+        )
+
+    @classmethod
+    def evaluate(cls, operation: str, a: float, b: float) -> float:
+        """Evaluate one operation without allocating a calculation instance.
+
+        ``operation`` is expected to be a lower-case registry name; anything
+        the dispatch table does not know goes through ``create_calculation``
+        so unknown operations fail with the usual error.
+        """
+        # Subscripting the read-only snapshot is as fast as a plain dict,
+        # unlike calling its get method.
+        try:
+            function = cls.dispatch[operation]
+        except KeyError:
+            return cls.create_calculation(operation, a, b).execute()
+        return function(a, b)
+
+    @classmethod
+    def execute_batch(
+        cls,
+        operations,
+        a_values: Sequence[float],
+        b_values: Sequence[float],
+        typecode: str | None = None,
+    ) -> array:
+        """Evaluate whole columns of operations and operands in one call.
+
+        ``operations`` is either a single operation applied to every row or a
+        sequence of per-row operation codes, given as names or as integer
+        positions in the registry. Rows are grouped by operation and each
+        group runs through its calculation's batch kernel.
+
+        Results are packed into an array of ``typecode`` (one of
+        ``BATCH_TYPECODES``). By default they follow the operands: two
+        ``array('f')`` columns give float32 results, two ``array('q')``
+        columns give exact int64 results for operations whose
+        ``integer_results`` is set, and anything else gives float64.
+        """
+        if len(a_values) != len(b_values):
+            raise ValueError("Batch operands must have the same length.")
+
+        if isinstance(operations, str) or hasattr(operations, "name"):
+            calculation_class = cls._get_calculation_class(operations)
+            typecode = cls._result_typecode(a_values, b_values, typecode, (calculation_class,))
+            return cls._to_array(calculation_class.execute_batch(a_values, b_values), typecode)
+
+        if len(operations) != len(a_values):
+            raise ValueError("Batch operations and operands must have the same length.")
+
+        groups = cls._group_rows(operations)
+
+        calculations = cls.calculations
+        classes = {key: cls._get_batch_class(key[1], calculations) for key in groups}
+        typecode = cls._result_typecode(a_values, b_values, typecode, classes.values())
+        if len(groups) == 1:
+            calculation_class = classes[next(iter(groups))]
+            return cls._to_array(calculation_class.execute_batch(a_values, b_values), typecode)
+
+        results = array(typecode, [0]) * len(a_values)
+        for key, indexes in groups.items():
+            values = classes[key].execute_batch(
+                [a_values[index] for index in indexes],
+                [b_values[index] for index in indexes],
+            )
+            for index, value in zip(indexes, cls._to_array(values, typecode)):
+                results[index] = value
+        return results
+
+    @classmethod
+    def execute_batch_status(
+        cls, operations, a_values: Sequence[float], b_values: Sequence[float]
+    ) -> Tuple[array, array]:
+        """Evaluate a batch like ``execute_batch`` without raising per row.
+
+        Returns the float64 results and a parallel ``array('B')`` of
+        ``STATUS_*`` codes, so failing rows cost about as much as good ones
+        and callers can filter them in bulk, e.g. with
+        ``itertools.compress``. Per-row operation codes that are not
+        registered are marked ``STATUS_INVALID``; an unknown single
+        operation or mismatched columns still raise ``ValueError``.
+        """
+        if len(a_values) != len(b_values):
+            raise ValueError("Batch operands must have the same length.")
+
+        if isinstance(operations, str) or hasattr(operations, "name"):
+            calculation_class = cls._get_calculation_class(operations)
+            return calculation_class.execute_batch_status(a_values, b_values)
+
+        if len(operations) != len(a_values):
+            raise ValueError("Batch operations and operands must have the same length.")
+
+        groups = cls._group_rows(operations)
+
+        results = array("d", bytes(8 * len(a_values)))
+        statuses = array("B", bytes(len(a_values)))
+        for (_, code), indexes in groups.items():
+            try:
+                calculation_class = cls._get_batch_class(code, cls.calculations)
+            except ValueError:
+                for index in indexes:
+                    results[index] = _NAN
+                    statuses[index] = STATUS_INVALID
+                continue
+            if len(groups) == 1:
+                return calculation_class.execute_batch_status(a_values, b_values)
+            values, codes = calculation_class.execute_batch_status(
+                [a_values[index] for index in indexes],
+                [b_values[index] for index in indexes],
+            )
+            for index, value, status in zip(indexes, values, codes):
+                results[index] = value
+                statuses[index] = status
+        return results, statuses
+
+    @classmethod
+    def execute_parallel(  # pylint: disable=too-many-arguments
+        cls,
+        operations,
+        a_values: Sequence[float],
+        b_values: Sequence[float],
+        *,
+        threads: int | None = None,
+        chunk_size: int = 16384,
+        executor: Executor | None = None,
+        typecode: str | None = None,
+    ) -> array:
+        """Evaluate a batch in chunks on a thread pool.
+
+        Accepts the same ``operations`` as ``execute_batch``. Each chunk of
+        ``chunk_size`` rows runs through ``execute_batch`` on a worker thread
+        and the results come back in input order. Pass ``executor`` to reuse
+        a pool across calls; otherwise a pool of ``threads`` threads (the
+        CPU count by default) is created for the call. Chunks run in
+        parallel only on free-threaded builds; with the GIL they take turns.
+        ``typecode`` picks the result array type as in ``execute_batch``.
+        """
+        if len(a_values) != len(b_values):
+            raise ValueError("Batch operands must have the same length.")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        if threads is None:
+            threads = os.cpu_count() or 1
+        if threads < 1:
+            raise ValueError("Thread count must be at least 1.")
+        rows = len(a_values)
+        per_row = not (isinstance(operations, str) or hasattr(operations, "name"))
+        if per_row and len(operations) != rows:
+            raise ValueError("Batch operations and operands must have the same length.")
+        if rows <= chunk_size or (threads == 1 and executor is None):
+            return cls.execute_batch(operations, a_values, b_values, typecode)
+
+        def run(start: int) -> array:
+            end = start + chunk_size
+            chunk_operations = operations[start:end] if per_row else operations
+            return cls.execute_batch(
+                chunk_operations, a_values[start:end], b_values[start:end], typecode
+            )
+
+        starts = range(0, rows, chunk_size)
+        if executor is not None:
+            return _concatenate(executor.map(run, starts))
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return _concatenate(pool.map(run, starts))
+
+    @classmethod
+    def reduce(cls, operation, operands: Sequence[float]) -> float:
+        """Evaluate ``operands[0] op operands[1] op ...`` in one reduction.
+
+        The result is the same as chaining the binary operation left to
+        right, but it runs as one pass over the operands through the
+        calculation's ``reduce`` kernel, with no calculation object per step.
+        """
+        if len(operands) < 2:
+            raise ValueError("At least two operands are required.")
+        return cls._get_calculation_class(operation).reduce(operands)
+
+    @staticmethod
+    def _build_dispatcher(
+        calculation_class: Type[Calculation],
+    ) -> Callable[[float, float], float]:
+        """Return the callable that evaluates one operand pair for a class."""
+        # Only trust an operation declared on the class itself, so a subclass
+        # overriding execute() is never bypassed by an inherited one.
+        if "operation" in vars(calculation_class):
+            return calculation_class.operation
+
+        def evaluate(a: float, b: float) -> float:
+            return calculation_class(a, b).execute()
+
+        return evaluate
 
+    @classmethod
+    def _get_calculation_class(cls, operation) -> Type[Calculation]:
+        """Resolve an operation name to its registered calculation class."""
         operation_name = getattr(operation, "name", operation)
         operation_key = str(operation_name).lower()
         calculation_class = cls.calculations.get(operation_key)
+        if calculation_class is None:
+            calculation_class = cls._load_plugin(operation_key)
 
         if calculation_class is None:
             raise ValueError(
                 "Calculation type "
                 f"'{operation_key}' is not registered. "
-                f"Available calculations: {list(cls.calculations.keys())}"
+                f"Available calculations: {cls.operation_names()}"
             )
+        return calculation_class
 
-        return calculation_class(a, b)
+    @classmethod
+    def _load_plugin(cls, name: str) -> Type[Calculation] | None:
+        """Import a discovered plugin operation and register its class."""
+        if not cls._plugins_discovered:
+            cls.discover_plugins()
+        entry_point = cls.plugins.get(name)
+        if entry_point is None:
+            return None
+        try:
+            loaded = entry_point.load()
+        except (ImportError, AttributeError) as exc:
+            raise ValueError(f"Plugin operation '{name}' failed to load: {exc}") from exc
+
+        with cls._registry_lock:
+            # The plugin's module may already have registered itself on
+            # import, or another thread may have loaded it meanwhile.
+            if name not in cls.calculations:
+                if not (isinstance(loaded, type) and issubclass(loaded, Calculation)):
+                    raise ValueError(
+                        f"Plugin operation '{name}' is not a Calculation subclass."
+                    )
+                cls.register_calculation(name)(loaded)
+            cls.plugins = _updated(cls.plugins, name)
+            return cls.calculations[name]
+
+    @staticmethod
+    def _group_rows(operations: Iterable[object]) -> Dict[Tuple[type, object], List[int]]:
+        """Map each ``(type, code)`` in a per-row operation column to its rows.
+
+        Codes are keyed by type too, so True is never grouped with the code 1.
+        """
+        groups: Dict[Tuple[type, object], List[int]] = {}
+        for index, code in enumerate(operations):
+            groups.setdefault((type(code), code), []).append(index)
+        return groups
+
+    @classmethod
+    def _get_batch_class(
+        cls, code, calculations: Mapping[str, Type[Calculation]]
+    ) -> Type[Calculation]:
+        """Resolve a batch operation code, accepting positions in a snapshot."""
+        # bool is Integral, but True and False are not registry positions.
+        if (
+            not isinstance(code, bool)
+            and isinstance(code, numbers.Integral)
+            and 0 <= code < len(calculations)
+        ):
+            return list(calculations.values())[code]
+        return cls._get_calculation_class(code)
+
+    @staticmethod
+    def _result_typecode(
+        a_values: Sequence[float],
+        b_values: Sequence[float],
+        typecode: str | None,
+        calculation_classes: Iterable[Type[Calculation]],
+    ) -> str:
+        """Return the requested result typecode, or the one the operands imply."""
+        if typecode is not None:
+            if typecode not in BATCH_TYPECODES:
+                raise ValueError(f"Batch typecode must be one of {BATCH_TYPECODES}.")
+            return typecode
+        operand_typecode = getattr(a_values, "typecode", "d")
+        if operand_typecode != getattr(b_values, "typecode", "d"):
+            return "d"
+        if operand_typecode == "f":
+            return "f"
+        if operand_typecode == "q" and all(
+            calculation_class.integer_results for calculation_class in calculation_classes
+        ):
+            return "q"
+        return "d"
+
+    @staticmethod
+    def _to_array(values: Iterable[float], typecode: str = "d") -> array:
+        """Pack batch results into an array, float64 unless told otherwise."""
+        try:
+            return array(typecode, values)
+        except TypeError as exc:
+            kind = "integers" if typecode == "q" else "real numbers"
+            raise ValueError(f"Batch results must be {kind}.") from exc
+        except OverflowError as exc:
+            raise ValueError(f"Batch results do not fit in typecode '{typecode}'.") from exc
+
+
+def _concatenate(chunks: Iterable[array]) -> array:
+    """Join result chunks, which all share one typecode, into one array."""
+    chunks = iter(chunks)
+    results = next(chunks)
+    for chunk in chunks:
+        results.extend(chunk)
+    return results
+
+
+def _flag_overflow(
+    results: array,
+    statuses: array,
+    a_values: Sequence[float],
+    b_values: Sequence[float],
+) -> None:
+    """Mark rows whose finite operands gave an infinite result as overflowed."""
+    # One C-level scan for infinities keeps the common case to two passes.
+    if math.inf not in results and -math.inf not in results:
+        return
+    for index, value in enumerate(results):
+        if (
+            math.isinf(value)
+            and statuses[index] == STATUS_OK
+            and math.isfinite(a_values[index])
+            and math.isfinite(b_values[index])
+        ):
+            statuses[index] = STATUS_OVERFLOW
+
+
+def _evaluate_rows(
+    calculation_class: Type[Calculation],
+    a_values: Sequence[float],
+    b_values: Sequence[float],
+) -> Tuple[array, array]:
+    """Evaluate a batch row by row, turning each row's exception into a status."""
+    results = array("d", bytes(8 * len(a_values)))
+    statuses = array("B", bytes(len(a_values)))
+    for index, (a, b) in enumerate(zip(a_values, b_values)):
+        try:
+            results[index] = calculation_class(a, b).execute()
+        except ZeroDivisionError:
+            results[index] = _NAN
+            statuses[index] = STATUS_DIVIDE_BY_ZERO
+        except OverflowError:
+            results[index] = _NAN
+            statuses[index] = STATUS_OVERFLOW
+        except (ArithmeticError, ValueError, TypeError):
+            # TypeError includes results that are not real numbers.
+            results[index] = _NAN
+            statuses[index] = STATUS_INVALID
+    _flag_overflow(results, statuses, a_values, b_values)
+    return results, statuses
+
+
+class CalculationBatch:
+    """Pending calculations of one type, stored as two typed columns.
+
+    A flyweight over ``Calculation``: the calculation class is shared and
+    each pending calculation is just its two operands, 16 bytes in float64
+    columns instead of a separate instance with boxed floats. Indexing or
+    iterating builds ordinary ``Calculation`` instances on demand, so their
+    ``str`` and ``repr`` are unchanged, while ``execute`` runs the whole
+    batch through the class's batch kernel without building any.
+    ``typecode`` stores the columns as float64 (``"d"``), float32 (``"f"``,
+    8 bytes per calculation) or int64 (``"q"``), and the results follow it
+    as in ``execute_batch``.
+    """
+
+    __slots__ = ("calculation_class", "a_values", "b_values")
+
+    def __init__(
+        self,
+        calculation_class: Type[Calculation],
+        a_values: Iterable[float] = (),
+        b_values: Iterable[float] = (),
+        typecode: str = "d",
+    ) -> None:
+        if typecode not in BATCH_TYPECODES:
+            raise ValueError(f"Batch typecode must be one of {BATCH_TYPECODES}.")
+        self.calculation_class = calculation_class
+        self.a_values = array(typecode, a_values)
+        self.b_values = array(typecode, b_values)
+        if len(self.a_values) != len(self.b_values):
+            raise ValueError("Batch operands must have the same length.")
+
+    def append(self, a: float, b: float) -> None:
+        """Add one pending calculation."""
+        self.a_values.append(a)
+        self.b_values.append(b)
+
+    def __len__(self) -> int:
+        return len(self.a_values)
+
+    def __getitem__(self, index: int) -> Calculation:
+        return self.calculation_class(self.a_values[index], self.b_values[index])
+
+    def __iter__(self) -> Iterator[Calculation]:
+        return map(self.calculation_class, self.a_values, self.b_values)
+
+    def execute(self) -> array:
+        """Perform every pending calculation and return the results in order."""
+        # pylint: disable=protected-access
+        typecode = CalculationFactory._result_typecode(
+            self.a_values, self.b_values, None, (self.calculation_class,)
+        )
+        return CalculationFactory._to_array(
+            self.calculation_class.execute_batch(self.a_values, self.b_values), typecode
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.calculation_class.__name__}, {len(self)} pending)"
+
+
+def _updated(mapping: Mapping, key: str, value: object = None) -> Mapping:
+    """Return a read-only copy of ``mapping`` with ``key`` set, or removed if
+    ``value`` is None."""
+    copy = dict(mapping)
+    if value is None:
+        copy.pop(key, None)
+    else:
+        copy[key] = value
+    return MappingProxyType(copy)
 
 
 @CalculationFactory.register_calculation("add")
 class AddCalculation(Calculation):
     """Addition calculation."""
 
+    __slots__ = ()
+    integer_results = True
+    operation = staticmethod(Operations.addition)
+
     def execute(self) -> float:
         return Operations.addition(self.a, self.b)
 
+    @classmethod
+    def execute_batch(cls, a_values, b_values):
+        return map(operator.add, a_values, b_values)
+
+    @classmethod
+    def reduce(cls, operands):
+        # Not sum(), which compensates float rounding on Python 3.12+ and
+        # so would differ from chaining the binary add.
+        return reduce(operator.add, operands)
+
 
 @CalculationFactory.register_calculation("subtract")
 class SubtractCalculation(Calculation):
     """Subtraction calculation."""
 
+    __slots__ = ()
+    integer_results = True
+    operation = staticmethod(Operations.subtraction)
+
     def execute(self) -> float:
         return Operations.subtraction(self.a, self.b)
 
+    @classmethod
+    def execute_batch(cls, a_values, b_values):
+        return map(operator.sub, a_values, b_values)
+
+    @classmethod
+    def reduce(cls, operands):
+        return reduce(operator.sub, operands)
+
 
 @CalculationFactory.register_calculation("multiply")
 class MultiplyCalculation(Calculation):
     """Multiplication calculation."""
 
+    __slots__ = ()
+    integer_results = True
+    operation = staticmethod(Operations.multiplication)
+
     def execute(self) -> float:
         return Operations.multiplication(self.a, self.b)
 
+    @classmethod
+    def execute_batch(cls, a_values, b_values):
+        return map(operator.mul, a_values, b_values)
+
+    @classmethod
+    def reduce(cls, operands):
+        return math.prod(operands)
+
 
 @CalculationFactory.register_calculation("divide")
 class DivideCalculation(Calculation):
     """Division calculation."""
 
+    __slots__ = ()
+    operation = staticmethod(Operations.division)
+
     def execute(self) -> float:
         return Operations.division(self.a, self.b)
 
+    @classmethod
+    def execute_batch(cls, a_values, b_values):
+        # Fail the whole batch the same way a single division by zero fails.
+        if 0 in b_values:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return map(operator.truediv, a_values, b_values)
+
+    @classmethod
+    def execute_batch_status(cls, a_values, b_values):
+        zero = list(map(operator.not_, b_values))
+        try:
+            if not any(zero):
+                results = array("d", map(operator.truediv, a_values, b_values))
+                statuses = array("B", bytes(len(results)))
+            else:
+                # Adding the mask divides zero-divisor rows by 1 instead, then those
+                # rows take the IEEE 754 quotient a / ±0 == a * ±inf (NaN for 0 / 0).
+                results = array(
+                    "d", map(operator.truediv, a_values, map(operator.add, b_values, zero))
+                )
+                for index in compress(count(), zero):
+                    results[index] *= math.copysign(math.inf, b_values[index])
+                statuses = array(
+                    "B", bytes(zero).replace(b"\x01", bytes([STATUS_DIVIDE_BY_ZERO]))
+                )
+        except (OverflowError, TypeError):
+            # Integers beyond float range or operands that do not divide.
+            return _evaluate_rows(cls, a_values, b_values)
+        _flag_overflow(results, statuses, a_values, b_values)
+        return results, statuses
+
+    @classmethod
+    def reduce(cls, operands):
+        if 0 in islice(operands, 1, None):
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return reduce(operator.truediv, operands)
+
 
 @CalculationFactory.register_calculation("power")
 class PowerCalculation(Calculation):
     """Exponentiation calculation."""
 
+    __slots__ = ()
+    # Bounded by the power engine's limits rather than a bare a ** b.
+    operation = staticmethod(DEFAULT_ENGINE.power)
+
     def execute(self) -> float:
-        return Operations.power(self.a, self.b)
+        return DEFAULT_ENGINE.power(self.a, self.b)
+
+    @classmethod
+    def execute_batch(cls, a_values, b_values):
+        return map(DEFAULT_ENGINE.power, a_values, b_values)
+
+    @classmethod
+    def execute_batch_status(cls, a_values, b_values):
+        # Every failure is detected before computing, as the engine does for
+        # one call, so failing rows cost the same as good ones. Results are
+        # float64, so integer operands take the float path.
+        overflow_status = STATUS_OVERFLOW if DEFAULT_ENGINE.overflow == "error" else STATUS_OK
+        results = array("d", bytes(8 * len(a_values)))
+        statuses = array("B", bytes(len(a_values)))
+        try:
+            pairs = list(zip(map(float, a_values), map(float, b_values)))
+        except (OverflowError, TypeError):
+            # Integers beyond float range or operands that are not numbers.
+            return _evaluate_rows(cls, a_values, b_values)
+        for index, (a, b) in enumerate(pairs):
+            if a == 0 and b < 0:
+                results[index] = math.inf
+                statuses[index] = STATUS_DIVIDE_BY_ZERO
+            elif a < 0 and not b.is_integer() and math.isfinite(b):
+                results[index] = _NAN
+                statuses[index] = STATUS_INVALID
+            elif a and math.isfinite(a) and math.isfinite(b) and (
+                b * math.log10(abs(a)) > MAX_FLOAT_LOG10
+            ):
+                negative = a < 0 and b % 2 == 1
+                results[index] = -math.inf if negative else math.inf
+                statuses[index] = overflow_status
+            else:
+                try:
+                    results[index] = a**b
+                except OverflowError:
+                    # Rounding can push a result just under the estimate over.
+                    results[index] = math.inf
+                    statuses[index] = overflow_status
+        return results, statuses
+
+    @classmethod
+    def reduce(cls, operands):
+        return reduce(DEFAULT_ENGINE.power, operands)
+
+
+@CalculationFactory.register_aggregate("sum")
+def sum_aggregate(values: Iterable[float]) -> float:
+    """Correctly rounded sum of the values."""
+    return math.fsum(values)
+
+
+@CalculationFactory.register_aggregate("mean")
+def mean_aggregate(values: Iterable[float]) -> float:
+    """Arithmetic mean, updated with Welford's method."""
+    return RunningStats(values).mean
+
+
+@CalculationFactory.register_aggregate("variance")
+def variance_aggregate(values: Iterable[float]) -> float:
+    """Sample variance, computed with Welford's method."""
+    return RunningStats(values).variance
+
+
+@CalculationFactory.register_aggregate("stdev")
+def stdev_aggregate(values: Iterable[float]) -> float:
+    """Sample standard deviation, computed with Welford's method."""
+    return RunningStats(values).stdev
+
+
+@CalculationFactory.register_aggregate("min")
+def min_aggregate(values: Iterable[float]) -> float:
+    """Smallest value."""
+    result = min(values, default=None)
+    if result is None:
+        raise ValueError("min requires at least 1 value.")
+    return result
+
+
+@CalculationFactory.register_aggregate("max")
+def max_aggregate(values: Iterable[float]) -> float:
+    """Largest value."""
+    result = max(values, default=None)
+    if result is None:
+        raise ValueError("max requires at least 1 value.")
+    return result
+
+
+# Modular exponentiation: powmod 4 13 497 is 4 ** 13 % 497.
+CalculationFactory.register_ternary("powmod")(powmod)
 
 
 __all__ = [
+    "BATCH_TYPECODES",
+    "PLUGIN_GROUP",
+    "STATUS_DIVIDE_BY_ZERO",
+    "STATUS_INVALID",
+    "STATUS_OK",
+    "STATUS_OVERFLOW",
     "Calculation",
+    "CalculationBatch",
     "CalculationFactory",
     "AddCalculation",
     "SubtractCalculation",
     "MultiplyCalculation",
     "DivideCalculation",
     "PowerCalculation",
+    "max_aggregate",
+    "mean_aggregate",
+    "min_aggregate",
+    "stdev_aggregate",
+    "sum_aggregate",
+    "variance_aggregate",
 ]
@@ -2,34 +2,78 @@
 
 from __future__ import annotations
 
-from types import SimpleNamespace
-from typing import Callable, Dict, List, Tuple
+import sys
+from itertools import islice
+from typing import Callable, Dict, Iterable, Tuple
 
+from app.cache import ResultCache
 from app.calculation import CalculationFactory
+from app.expression import EXPRESSION_CHARACTERS, compile_expression
+from app.history import History, HistoryLog, format_calculation
+from app.metrics import Metrics
+from app.variables import Workspace
 
+# Number of history entries printed before asking whether to continue.
+HISTORY_PAGE_SIZE = 50
+# REPL commands, which cannot be used as variable names.
+COMMANDS = ("exit", "help", "history", "stats", "vars")
 
-class Calculator:  # pylint: disable=too-few-public-methods
+
+class Calculator:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """Interactive calculator that supports basic operations."""
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         operations: Dict[str, Callable[[float, float], float]] | None = None,
         input_func: Callable[[str], str] | None = None,
         output_func: Callable[[str], None] | None = None,
+        *,
+        cache: ResultCache | None = None,
+        history: History | HistoryLog | None = None,
+        metrics: Metrics | None = None,
+        variables: Workspace | None = None,
+        number_format: Callable[[object], str] = str,
+        number_parser: Callable[[str], object] = float,
+        paginate: bool | None = None,
     ) -> None:
         if operations is None:
             operations = self._build_operation_registry()
         self.operations = operations
         self.input_func = input if input_func is None else input_func
         self.output_func = print if output_func is None else output_func
-        self.history: List[str] = []
+        self.history = History() if history is None else history
+        self.cache = cache
+        self.metrics = metrics
+        self.variables = Workspace(COMMANDS) if variables is None else variables
+        # Renders every number in results; see app.output.number_formatter.
+        self.number_format = number_format
+        # Parses operands of binary and n-ary calculations, which keeps
+        # their type (exact ints, Decimal, Fraction); see app.numeric.
+        self.number_parser = number_parser
+        # Paging reads from input_func, so it is only safe when a person is
+        # typing; scripted or piped input would lose its next line to it.
+        if paginate is None:
+            paginate = input_func is None and sys.stdin.isatty()
+        self.paginate = paginate
+        # Every command in COMMANDS but exit, which also ends the session.
+        self._commands: Dict[str, Callable[[], None]] = {
+            "help": self._print_help,
+            "history": self._print_history,
+            "stats": self._print_stats,
+            "vars": self._print_variables,
+        }
+        # Line kinds in the order they are tried, as (test, evaluate) pairs.
+        self._line_kinds: Tuple[Tuple[Callable[[str], bool], Callable[[str], str]], ...] = (
+            (self._is_assignment, self._evaluate_assignment),
+            (self._is_variable, self._evaluate_variable),
+            (self._is_aggregate, self._evaluate_aggregate),
+            (self._is_ternary, self._evaluate_ternary),
+            (self._is_expression, self._evaluate_expression),
+            (self._is_reduction, self._evaluate_reduction),
+        )
 
     def _build_operation_registry(self) -> Dict[str, Callable[[float, float], float]]:
-        """Build an operations registry based on factory registrations."""
-        for attribute in ("calculations", "_calculations", "_registry"):
-            registry = getattr(CalculationFactory, attribute, None)
-            if isinstance(registry, dict) and registry:
-                return {name: None for name in registry}
-        return {}
+        """Build an operations registry from factory and plugin names."""
+        return dict.fromkeys(CalculationFactory.operation_names())
 
     def run(self) -> None:
         """Run the calculator REPL loop."""
@@ -37,38 +81,84 @@ class Calculator:  # pylint: disable=too-few-public-methods
         self._print_welcome()
         while True:
             try:
-                user_input = self.input_func(">>> ").strip()
-                if not user_input:
-                    continue
-
-                # Handle special commands
-                if user_input.lower() == "exit":
-                    self.output_func("Goodbye!")
+                if not self.process(self.input_func(">>> ")):
                     break
-                if user_input.lower() == "help":
-                    self._print_help()
-                    continue
-                if user_input.lower() == "history":
-                    self._print_history()
-                    continue
-
-                operation, operand1, operand2 = self._parse_input(user_input)
-                try:
-                    result = self._execute(operation, operand1, operand2)
-                except (ValueError, ZeroDivisionError) as exc:
-                    self.output_func(f"Error: {exc}")
-                    continue
-                output = f"{operand1} {operation} {operand2} = {result}"
-                self.history.append(output)
-                self.output_func(output)
-            except ValueError as exc:
-                self.output_func(f"Error: {exc}")
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 self.output_func("\n\nGoodbye!")
                 break
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 self.output_func(f"Unexpected error: {exc}")
 
+    def process(self, user_input: str) -> bool:
+        """Handle one REPL line and return whether the session continues."""
+        user_input = user_input.strip()
+        try:
+            if not user_input:
+                return True
+            command = user_input.lower()
+            if command == "exit":
+                self.output_func("Goodbye!")
+                return False
+            if command in self._commands:
+                self._commands[command]()
+            else:
+                self.output_func(self._evaluate_line(user_input))
+        except (ArithmeticError, ValueError) as exc:
+            self.output_func(f"Error: {exc}")
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.output_func(f"Unexpected error: {exc}")
+        return True
+
+    def _evaluate_line(self, user_input: str, record: bool = True) -> str:
+        """Evaluate a line that is not a command and return what to print.
+
+        The first line kind whose test matches evaluates the line; anything
+        else is a binary calculation, recorded in the history if ``record``.
+        The REPL and stream mode both evaluate lines here.
+        """
+        for matches, evaluate in self._line_kinds:
+            if matches(user_input):
+                return evaluate(user_input)
+        operation, operand1, operand2 = self._parse_input(user_input)
+        result = self._execute(operation, operand1, operand2)
+        # Format first so a result that cannot be printed is not recorded.
+        line = format_calculation(operation, operand1, operand2, result, self.number_format)
+        if record:
+            self.history.append(operation, operand1, operand2, result)
+        return line
+
+    def stream(
+        self,
+        lines: Iterable[str],
+        write: Callable[[str], object],
+        chunk_size: int = 4096,
+    ) -> None:
+        """Evaluate newline-delimited jobs without prompts or history.
+
+        Lines flow through a generator pipeline and results are written in
+        chunks of ``chunk_size`` lines, so memory stays constant regardless
+        of input size.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        jobs = filter(None, map(str.strip, lines))
+        results = map(self._stream_line, jobs)
+        while True:
+            chunk = list(islice(results, chunk_size))
+            if not chunk:
+                break
+            chunk.append("")
+            write("\n".join(chunk))
+
+    def _stream_line(self, user_input: str) -> str:
+        """Evaluate one streamed job, rendering errors the way the REPL does."""
+        try:
+            return self._evaluate_line(user_input, record=False)
+        except (ArithmeticError, ValueError) as exc:
+            return f"Error: {exc}"
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            return f"Unexpected error: {exc}"
+
     def _print_welcome(self) -> None:
         """Print usage instructions and available operations."""
         # Show usage instructions and available operations.
@@ -78,7 +168,11 @@ class Calculator:  # pylint: disable=too-few-public-methods
         )
         self.output_func("Usage: operation operand1 operand2")
         self.output_func("Example: add 1 1")
-        self.output_func("Special commands: help, history, exit")
+        self.output_func(
+            f"Aggregates: {', '.join(CalculationFactory.aggregates)} (e.g. mean 1 2 3 4)"
+        )
+        self.output_func("Variables: a = 5, x = add a 3 (x follows changes to a)")
+        self.output_func("Special commands: help, history, stats, vars, exit")
         self.output_func("Type 'help' for more information.\n")
 
     def _print_help(self) -> None:
@@ -90,9 +184,19 @@ class Calculator:  # pylint: disable=too-few-public-methods
         self.output_func("\nSpecial Commands:")
         self.output_func("  help       - Display this help message")
         self.output_func("  history    - Show calculation history")
+        self.output_func("  stats      - Show per-operation metrics")
+        self.output_func("  vars       - Show variables, their formulas and values")
         self.output_func("  exit       - Exit the calculator")
-        self.output_func("\nUsage: <operation> <operand1> <operand2>")
-        self.output_func("Example: add 5 3\n")
+        self.output_func("\nUsage: <operation> <operand1> <operand2> [<operand3> ...]")
+        self.output_func("Example: add 5 3, multiply 2 3 4")
+        self.output_func("Expressions: (1 + 2) * 3 ^ 2, power(2, 8) / 4")
+        self.output_func("\nAggregates over any number of operands:")
+        for name in sorted(CalculationFactory.aggregates):
+            self.output_func(f"  {name:<10} - e.g. {name} 1 2 3 4")
+        self.output_func("\nThree-operand operations:")
+        for name in sorted(CalculationFactory.ternaries):
+            self.output_func(f"  {name:<10} - {name} a b c")
+        self.output_func("")
 
     def _print_history(self) -> None:
         """Print calculation history."""
@@ -100,11 +204,46 @@ class Calculator:  # pylint: disable=too-few-public-methods
             self.output_func("No calculations in history.")
             return
 
-        self.output_func(
-            f"\n=== Calculation History ({len(self.history)} entries) ==="
-        )
-        for idx, entry in enumerate(self.history, 1):
+        total = len(self.history)
+        self.output_func(f"\n=== Calculation History ({total} entries) ===")
+        for idx, entry in enumerate(self.history.entries(self.number_format), 1):
             self.output_func(f"{idx}. {entry}")
+            if self.paginate and idx % HISTORY_PAGE_SIZE == 0 and idx < total:
+                answer = self.input_func("-- more (Enter to continue, q to stop) -- ")
+                if answer.strip().lower() == "q":
+                    break
+        self.output_func("")
+
+    def _print_stats(self) -> None:
+        """Print per-operation counters and latency estimates."""
+        if self.metrics is None:
+            self.output_func("Metrics are disabled.")
+            return
+        lines = self.metrics.summary()
+        if not lines:
+            self.output_func("No calculations measured yet.")
+            return
+        self.output_func("\n=== Operation Metrics ===")
+        for line in lines:
+            self.output_func(line)
+        self.output_func("")
+
+    def _print_variables(self) -> None:
+        """Print every variable with its formula and cached value."""
+        if not self.variables:
+            self.output_func("No variables defined.")
+            return
+        self.output_func(f"\n=== Variables ({len(self.variables)}) ===")
+        for name in self.variables:
+            formula = self.variables.formula(name)
+            try:
+                value = self.number_format(self.variables[name])
+            except (ArithmeticError, ValueError) as exc:
+                value = f"Error: {exc}"
+            if formula.operation is None and not formula.references:
+                self.output_func(f"{name} = {value}")
+            else:
+                self.output_func(f"{name} = {formula} = {value}")
         self.output_func("")
 
     def _parse_input(self, user_input: str) -> Tuple[str, float, float]:
@@ -121,8 +260,8 @@ class Calculator:  # pylint: disable=too-few-public-methods
             raise ValueError(f"Unknown operation '{operation}'")
 
         try:
-            operand1 = float(operand1_str)
-            operand2 = float(operand2_str)
+            operand1 = self.number_parser(operand1_str)
+            operand2 = self.number_parser(operand2_str)
         except ValueError as exc:
             raise ValueError(
                 f"Operands must be numbers. Got '{operand1_str}' and '{operand2_str}'"
@@ -130,13 +269,112 @@ class Calculator:  # pylint: disable=too-few-public-methods
 
         return operation, operand1, operand2
 
+    @staticmethod
+    def _is_assignment(user_input: str) -> bool:
+        """Return whether a line is 'name = formula'."""
+        return "=" in user_input
+
+    def _evaluate_assignment(self, user_input: str) -> str:
+        """Assign a variable and report every value that was recomputed."""
+        name, _, source = user_input.partition("=")
+        lines = []
+        updates = self._measure("assignment", self.variables.assign, name.strip(), source)
+        for variable, value in updates:
+            if isinstance(value, Exception):
+                value = f"Error: {value}"
+            else:
+                value = self.number_format(value)
+            lines.append(f"{variable} = {value}")
+        return "\n".join(lines)
+
+    def _is_variable(self, user_input: str) -> bool:
+        """Return whether a line is the name of a variable."""
+        return user_input in self.variables
+
+    def _evaluate_variable(self, user_input: str) -> str:
+        """Show the current value of a variable."""
+        return f"{user_input} = {self.number_format(self.variables[user_input])}"
+
+    def _is_aggregate(self, user_input: str) -> bool:
+        """Return whether a line is 'aggregate v1 v2 ...'."""
+        first = user_input.split(None, 1)[0].lower()
+        return first in CalculationFactory.aggregates and first not in self.operations
+
+    def _evaluate_aggregate(self, user_input: str) -> str:
+        """Reduce the operands of an aggregate line in one pass."""
+        name, *operands = user_input.replace(",", " ").split()
+        try:
+            values = [float(operand) for operand in operands]
+        except ValueError as exc:
+            raise ValueError(f"Operands must be numbers. Got {' '.join(operands)}") from exc
+        result = self._measure(name.lower(), CalculationFactory.aggregate, name.lower(), values)
+        return f"{name.lower()} of {len(values)} values = {self.number_format(result)}"
+
+    def _is_expression(self, user_input: str) -> bool:
+        """Return whether a line is an infix expression rather than 'op a b'."""
+        if user_input.split(None, 1)[0].lower() in self.operations:
+            return False
+        return not EXPRESSION_CHARACTERS.isdisjoint(user_input)
+
+    def _evaluate_expression(self, user_input: str) -> str:
+        """Evaluate an infix expression through the compiled-expression cache."""
+        result = self._measure("expression", lambda: compile_expression(user_input).evaluate())
+        return f"{user_input} = {self.number_format(result)}"
+
+    def _is_ternary(self, user_input: str) -> bool:
+        """Return whether a line is 'op a b c' for a three-operand operation."""
+        first = user_input.split(None, 1)[0].lower()
+        return first in CalculationFactory.ternaries and first not in self.operations
+
+    def _evaluate_ternary(self, user_input: str) -> str:
+        """Evaluate a three-operand operation such as 'powmod 4 13 497'."""
+        name, *operand_strs = user_input.split()
+        if len(operand_strs) != 3:
+            raise ValueError(f"{name.lower()} takes exactly 3 operands.")
+        try:
+            operands = list(map(self.number_parser, operand_strs))
+        except ValueError as exc:
+            raise ValueError(f"Operands must be numbers. Got {' '.join(operand_strs)}") from exc
+        result = self._measure(name.lower(), CalculationFactory.ternary, name, *operands)
+        arguments = ", ".join(map(self.number_format, operands))
+        return f"{name.lower()}({arguments}) = {self.number_format(result)}"
+
+    @staticmethod
+    def _is_reduction(user_input: str) -> bool:
+        """Return whether a line is 'op x1 x2 x3 ...' with three or more operands."""
+        return len(user_input.split(None, 3)) > 3
+
+    def _evaluate_reduction(self, user_input: str) -> str:
+        """Evaluate an n-ary line in one reduction over all of its operands."""
+        operation, *operand_strs = user_input.split()
+        if operation.lower() not in self.operations:
+            raise ValueError(f"Unknown operation '{operation}'")
+        try:
+            operands = list(map(self.number_parser, operand_strs))
+        except ValueError as exc:
+            raise ValueError(f"Operands must be numbers. Got {' '.join(operand_strs)}") from exc
+        operation_key = operation.lower()
+        result = self._measure(
+            f"reduce.{operation_key}", CalculationFactory.reduce, operation_key, operands
+        )
+        number_format = self.number_format
+        return f" {operation} ".join(map(number_format, operands)) + f" = {number_format(result)}"
+
+    def _measure(self, name: str, function: Callable[..., object], *args: object) -> object:
+        """Call ``function(*args)``, recorded under ``name`` when metrics are on."""
+        if self.metrics is None:
+            return function(*args)
+        return self.metrics.record(name, function, *args)
+
     def _execute(self, operation: str, operand1: float, operand2: float) -> float:
-        """Execute the selected operation and return the result."""
+        """Execute a binary calculation through the result cache, if any.
+
+        Only binary calculations are cached: n-ary, aggregate, ternary and
+        expression lines are evaluated directly, though metrics cover them.
+        """
         # Dispatch to the selected operation.
         operation_key = operation.lower()
-        calculation = CalculationFactory.create_calculation(
-            SimpleNamespace(name=operation_key),
-            operand1,
-            operand2,
-        )
-        return calculation.execute()
+        evaluate = CalculationFactory.evaluate if self.cache is None else self.cache.evaluate
+        if self.metrics is not None:
+            return self.metrics.observe(evaluate, operation_key, operand1, operand2)
+        return evaluate(operation_key, operand1, operand2)
@@ -0,0 +1,394 @@
+"""Command-line entry point for the calculator."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Iterable, Iterator, List, Tuple
+
+from app.cache import PersistentCache, ResultCache
+from app.api import serve_http
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.history import History, HistoryLog
+from app.metrics import Metrics
+from app.numeric import NUMBER_BACKENDS, number_parser
+from app.output import NUMBER_FORMATS, OutputSink, number_formatter
+from app.records import run_records
+from app.runner import ShardOptions, run_sharded
+from app.server import serve
+
+# Result cache and metrics options, as (attribute, flag) pairs. Modes that
+# do not apply them reject them rather than ignore them.
+_CACHE_OPTIONS = (("cache_size", "--cache-size"), ("cache_file", "--cache-file"))
+_METRICS_OPTIONS = (("metrics", "--metrics"), ("metrics_file", "--metrics-file"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the calculator command line."""
+    parser = argparse.ArgumentParser(
+        description="Interactive calculator with headless batch modes."
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="job file with one 'operation operand1 operand2' per line "
+        "(defaults to stdin)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="evaluate jobs without prompts and write one result per line",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="read packed binary job records and write packed result records",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4096,
+        help="number of lines (or binary records) evaluated per buffered write "
+        "in stream mode",
+    )
+    parser.add_argument(
+        "--aggregate",
+        metavar="NAME",
+        help="reduce whitespace-separated numbers from the input with one aggregate "
+        f"({', '.join(CalculationFactory.aggregates)}) in a single pass",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="evaluate the input file across N worker processes",
+    )
+    parser.add_argument(
+        "--format",
+        choices=NUMBER_FORMATS,
+        default="repr",
+        help="how result numbers are printed: as Python prints them, with fixed "
+        "decimals, or in the shortest general form",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        default=6,
+        help="decimals for --format fixed, significant digits for --format compact",
+    )
+    parser.add_argument(
+        "--numbers",
+        choices=NUMBER_BACKENDS,
+        default="float",
+        help="operand type for calculations: float, exact integers for integral "
+        "operands (auto), Decimal or Fraction",
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=int,
+        default=65536,
+        help="REPL output characters buffered before a write (0 writes every line)",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        metavar="SECONDS",
+        help="also write buffered REPL output at least this often",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="memoize up to N recent results (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="PATH",
+        help="share results through a persistent SQLite cache at PATH "
+        "(across worker processes and restarts)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        metavar="SECONDS",
+        help="ignore persistent cache entries older than SECONDS",
+    )
+    parser.add_argument(
+        "--history-size",
+        type=int,
+        default=1000,
+        help="keep at most N calculations in the REPL history",
+    )
+    parser.add_argument(
+        "--history-spill",
+        metavar="PATH",
+        help="append entries that overflow the history to this file",
+    )
+    parser.add_argument(
+        "--history-file",
+        metavar="PATH",
+        help="keep the REPL history in a persistent binary log at PATH",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="collect per-operation counters and latency (see the 'stats' command)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="write the metrics in Prometheus text format to PATH on exit "
+        "(implies --metrics)",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="serve calculator sessions over TCP on PORT instead of the REPL",
+    )
+    parser.add_argument(
+        "--http",
+        type=int,
+        metavar="PORT",
+        help="serve the batched JSON evaluation endpoint over HTTP on PORT",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address the TCP or HTTP server listens on",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=10000,
+        help="maximum number of concurrent server sessions",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=300.0,
+        help="seconds before an idle server session is closed",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the calculator in REPL, stream or server mode and return an exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_options(parser, args)
+    if args.http is not None:
+        _reject_options(parser, args, "--http", _CACHE_OPTIONS + _METRICS_OPTIONS)
+        serve_http(args.host, args.http)
+        return 0
+    if args.serve is not None:
+        _run_server(parser, args)
+        return 0
+    if args.aggregate is not None:
+        if args.aggregate.lower() not in CalculationFactory.aggregates:
+            parser.error(f"unknown aggregate '{args.aggregate}'")
+        _reject_options(parser, args, "--aggregate", _CACHE_OPTIONS + _METRICS_OPTIONS)
+        return _run_aggregate(args)
+    if args.stream or args.input or args.workers != 1 or args.binary:
+        _run_jobs(parser, args)
+        return 0
+    _run_interactive(args)
+    return 0
+
+
+def _check_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject option values that are invalid in every mode."""
+    if args.cache_size < 0:
+        parser.error("--cache-size must not be negative")
+    if args.history_size < 1:
+        parser.error("--history-size must be at least 1")
+    if args.cache_file is not None and args.cache_size:
+        parser.error("--cache-size and --cache-file cannot be combined")
+    if args.cache_ttl is not None and args.cache_ttl <= 0:
+        parser.error("--cache-ttl must be positive")
+    if args.precision < 0:
+        parser.error("--precision must not be negative")
+    if args.numbers == "fraction" and args.format != "repr":
+        parser.error("--numbers fraction prints exact n/d values and needs --format repr")
+    if args.buffer_size < 0:
+        parser.error("--buffer-size must not be negative")
+    if args.flush_interval is not None and args.flush_interval <= 0:
+        parser.error("--flush-interval must be positive")
+
+
+def _reject_options(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    mode: str,
+    options: Tuple[Tuple[str, str], ...],
+) -> None:
+    """Reject ``(attribute, flag)`` options that ``mode`` would silently ignore."""
+    for attribute, flag in options:
+        if getattr(args, attribute):
+            parser.error(f"{flag} cannot be combined with {mode}")
+
+
+def _run_server(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Serve calculator sessions over TCP until interrupted."""
+    if args.max_connections < 1:
+        parser.error("--max-connections must be at least 1")
+    if args.idle_timeout <= 0:
+        parser.error("--idle-timeout must be positive")
+    _reject_options(parser, args, "--serve", _CACHE_OPTIONS + _METRICS_OPTIONS)
+    serve(
+        args.host,
+        args.serve,
+        max_connections=args.max_connections,
+        idle_timeout=args.idle_timeout,
+        history_size=args.history_size,
+    )
+
+
+def _run_jobs(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Evaluate text or binary jobs, in one process or sharded over workers."""
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.binary:
+        _reject_options(parser, args, "--binary", _CACHE_OPTIONS + _METRICS_OPTIONS)
+        _run_binary(args)
+        return
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers == 1:
+        _run_stream(args)
+        return
+    if args.input is None:
+        parser.error("--workers requires an input file")
+    # Metrics are per process and would be lost with the workers.
+    _reject_options(parser, args, "--workers", _METRICS_OPTIONS)
+    options = ShardOptions(
+        args.cache_file,
+        args.cache_ttl,
+        number_formatter(args.format, args.precision),
+        number_parser(args.numbers),
+        args.cache_size,
+    )
+    run_sharded(args.input, sys.stdout.write, args.workers, options)
+    sys.stdout.flush()
+
+
+def _run_interactive(args: argparse.Namespace) -> None:
+    """Run the REPL on stdin, then write the metrics dump if one was asked for."""
+    # Interactive input needs output flushed at every prompt; piped input
+    # lets whole sessions through in buffer-sized writes.
+    sink = OutputSink(
+        buffer_size=args.buffer_size,
+        flush_interval=args.flush_interval,
+        flush_on_prompt=sys.stdin.isatty(),
+    )
+    if args.history_file is not None:
+        with HistoryLog(args.history_file) as history:
+            calculator = _make_calculator(args, history, sink)
+            _run_repl(calculator, sink)
+    else:
+        calculator = _make_calculator(args, output=sink)
+        _run_repl(calculator, sink)
+    _write_metrics(args, calculator)
+
+
+def _make_calculator(
+    args: argparse.Namespace,
+    history: HistoryLog | None = None,
+    output: OutputSink | None = None,
+) -> Calculator:
+    """Create a calculator configured from the command-line options."""
+    cache: ResultCache | PersistentCache | None = None
+    if args.cache_file is not None:
+        cache = PersistentCache(args.cache_file, ttl=args.cache_ttl)
+    elif args.cache_size:
+        cache = ResultCache(args.cache_size)
+    if history is None:
+        history = History(args.history_size, args.history_spill)
+    metrics = Metrics() if args.metrics or args.metrics_file else None
+    return Calculator(
+        input_func=None if output is None else output.read_line,
+        output_func=output,
+        cache=cache,
+        history=history,
+        metrics=metrics,
+        number_format=number_formatter(args.format, args.precision),
+        number_parser=number_parser(args.numbers),
+        paginate=output is not None and output.flush_on_prompt,
+    )
+
+
+def _run_repl(calculator: Calculator, sink: OutputSink) -> None:
+    """Run the REPL, then flush its output and a persistent cache's results."""
+    try:
+        calculator.run()
+    finally:
+        sink.close()
+        _close_cache(calculator)
+
+
+def _close_cache(calculator: Calculator) -> None:
+    """Close the calculator's cache if it is a persistent one."""
+    if isinstance(calculator.cache, PersistentCache):
+        calculator.cache.close()
+
+
+def _run_binary(args: argparse.Namespace) -> None:
+    """Evaluate packed binary jobs from a file or stdin to stdout."""
+    if args.input is None:
+        run_records(sys.stdin.buffer, sys.stdout.buffer.write, args.chunk_size)
+    else:
+        with open(args.input, "rb") as jobs:
+            run_records(jobs, sys.stdout.buffer.write, args.chunk_size)
+    sys.stdout.buffer.flush()
+
+
+def _run_aggregate(args: argparse.Namespace) -> int:
+    """Print one aggregate of the numbers in a file or stdin."""
+    try:
+        if args.input is None:
+            result = CalculationFactory.aggregate(args.aggregate, _read_values(sys.stdin))
+        else:
+            with open(args.input, encoding="utf-8") as source:
+                result = CalculationFactory.aggregate(args.aggregate, _read_values(source))
+    except (ArithmeticError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    number_format = number_formatter(args.format, args.precision)
+    print(f"{args.aggregate.lower()} = {number_format(result)}")
+    return 0
+
+
+def _read_values(lines: Iterable[str]) -> Iterator[float]:
+    """Yield every whitespace-separated number, one line in memory at a time."""
+    for line in lines:
+        for token in line.split():
+            try:
+                yield float(token)
+            except ValueError as exc:
+                raise ValueError(f"Operands must be numbers. Got '{token}'") from exc
+
+
+def _write_metrics(args: argparse.Namespace, calculator: Calculator) -> None:
+    """Write the Prometheus metrics dump if --metrics-file was given."""
+    if args.metrics_file is not None:
+        with open(args.metrics_file, "w", encoding="utf-8") as dump:
+            dump.write(calculator.metrics.to_prometheus())
+
+
+def _run_stream(args: argparse.Namespace) -> None:
+    """Stream jobs from a file or stdin to stdout."""
+    calculator = _make_calculator(args)
+    try:
+        if args.input is None:
+            calculator.stream(sys.stdin, sys.stdout.write, args.chunk_size)
+        else:
+            with open(args.input, encoding="utf-8") as jobs:
+                calculator.stream(jobs, sys.stdout.write, args.chunk_size)
+    finally:
+        _close_cache(calculator)
+    sys.stdout.flush()
+    _write_metrics(args, calculator)
+
+
+__all__ = ["build_parser", "main"]
@@ -0,0 +1,219 @@
+"""Infix expression compiler built on the registered calculations."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+from app.calculation import CalculationFactory
+
+# Infix operators mapped to the registered operation they evaluate with.
+BINARY_OPERATORS = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "divide",
+    "^": "power",
+    "**": "power",
+}
+
+# Characters that can only appear in an expression, never in a plain
+# ``operation operand1 operand2`` line (apart from signed operands).
+EXPRESSION_CHARACTERS = frozenset("+-*/^(),")
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<symbol>\*\*|[-+*/^(),])"
+    r")"
+)
+
+# Errors that leave a constant subexpression unfolded so that evaluation
+# raises them exactly as the REPL would.
+_FOLD_ERRORS = (ArithmeticError, ValueError)
+
+# A constant to push, or the name of an operation to apply.
+Instruction = Union[float, str]
+
+
+class CompiledExpression:  # pylint: disable=too-few-public-methods
+    """Postfix code for one expression, evaluated on a small value stack.
+
+    Each instruction is either a constant, pushed as is, or an operation
+    name (a ``str``), which pops two values and pushes the result of that
+    registered operation.
+    """
+
+    __slots__ = ("source", "code")
+
+    def __init__(self, source: str, code: Tuple[Instruction, ...]) -> None:
+        self.source = source
+        self.code = code
+
+    def evaluate(self) -> float:
+        """Run the compiled code and return the expression's value."""
+        code = self.code
+        if len(code) == 1:
+            return code[0]
+        evaluate = CalculationFactory.evaluate
+        stack: List[float] = []
+        push = stack.append
+        pop = stack.pop
+        for instruction in code:
+            if instruction.__class__ is str:
+                b = pop()
+                push(evaluate(instruction, pop(), b))
+            else:
+                push(instruction)
+        return stack[0]
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r}, code={self.code!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """Compile an infix expression, reusing the compiled form for repeated text.
+
+    Supports ``+ - * / ^`` (``**`` is accepted for ``^``), unary signs,
+    parentheses, and calls to any registered operation such as
+    ``power(2, 8)``. Constant subexpressions are folded at compile time.
+    """
+    return CompiledExpression(source, tuple(_Parser(source).parse()))
+
+
+class _Parser:  # pylint: disable=too-few-public-methods
+    """Recursive-descent parser emitting folded postfix code."""
+
+    def __init__(self, source: str) -> None:
+        self.tokens = self._tokenize(source)
+        self.position = 0
+
+    def parse(self) -> List[Instruction]:
+        """Parse the whole source as one expression."""
+        if not self.tokens:
+            raise ValueError("Invalid expression: nothing to evaluate")
+        code = self._sum()
+        if self.position < len(self.tokens):
+            raise ValueError(
+                f"Invalid expression: unexpected '{self.tokens[self.position][1]}'"
+            )
+        return code
+
+    @staticmethod
+    def _tokenize(source: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        end = len(source.rstrip())
+        while position < end:
+            match = _TOKEN.match(source, position)
+            if match is None:
+                raise ValueError(
+                    f"Invalid expression: unexpected '{source[position:].split()[0]}'"
+                )
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return None
+
+    def _take(self) -> Tuple[str, str]:
+        if self.position == len(self.tokens):
+            raise ValueError("Invalid expression: unexpected end of input")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expect(self, symbol: str) -> None:
+        if self._take()[1] != symbol:
+            self.position -= 1
+            raise ValueError(
+                f"Invalid expression: expected '{symbol}' "
+                f"but got '{self.tokens[self.position][1]}'"
+            )
+
+    def _sum(self) -> List[Instruction]:
+        code = self._product()
+        while self._peek() in ("+", "-"):
+            operation = BINARY_OPERATORS[self._take()[1]]
+            code = _combine(operation, code, self._product())
+        return code
+
+    def _product(self) -> List[Instruction]:
+        code = self._unary()
+        while self._peek() in ("*", "/"):
+            operation = BINARY_OPERATORS[self._take()[1]]
+            code = _combine(operation, code, self._unary())
+        return code
+
+    def _unary(self) -> List[Instruction]:
+        symbol = self._peek()
+        if symbol in ("+", "-"):
+            self.position += 1
+            code = self._unary()
+            if symbol == "-":
+                # Multiplying by -1 keeps the sign of zero, unlike 0 - x.
+                code = _combine("multiply", [-1.0], code)
+            return code
+        return self._power()
+
+    def _power(self) -> List[Instruction]:
+        code = self._atom()
+        if self._peek() in ("^", "**"):
+            self.position += 1
+            # Right-associative, and binds tighter than a unary minus on
+            # its left: -2^2 is -(2^2) while 2^-1 is 2^(-1).
+            code = _combine("power", code, self._unary())
+        return code
+
+    def _atom(self) -> List[Instruction]:
+        kind, text = self._take()
+        if kind == "number":
+            return [float(text)]
+        if text == "(":
+            code = self._sum()
+            self._expect(")")
+            return code
+        if kind == "name":
+            return self._call(text)
+        raise ValueError(f"Invalid expression: unexpected '{text}'")
+
+    def _call(self, name: str) -> List[Instruction]:
+        operation = name.lower()
+        if operation not in CalculationFactory.operation_names():
+            raise ValueError(f"Unknown operation '{name}'")
+        self._expect("(")
+        code = self._sum()
+        self._expect(",")
+        code = _combine(operation, code, self._sum())
+        # More arguments fold left to right: add(1, 2, 3) is add(add(1, 2), 3).
+        while self._peek() == ",":
+            self.position += 1
+            code = _combine(operation, code, self._sum())
+        self._expect(")")
+        return code
+
+
+def _combine(
+    operation: str, left: List[Instruction], right: List[Instruction]
+) -> List[Instruction]:
+    """Emit ``left right operation``, folding it when both sides are constants."""
+    if len(left) == 1 and len(right) == 1:
+        try:
+            return [CalculationFactory.evaluate(operation, left[0], right[0])]
+        except _FOLD_ERRORS:
+            pass
+    return left + right + [operation]
+
+
+__all__ = [
+    "BINARY_OPERATORS",
+    "EXPRESSION_CHARACTERS",
+    "CompiledExpression",
+    "compile_expression",
+]
@@ -0,0 +1,311 @@
+"""Bounded in-memory and persistent calculation history for the calculator."""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import queue
+import struct
+import threading
+from array import array
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# One history log record: result kind, operation name (NUL padded, longer
+# names are truncated), operands, and the real and imaginary result parts.
+RECORD = struct.Struct("<B31sdddd")
+_REAL_RESULT = 0
+_COMPLEX_RESULT = 1
+# History slot kinds: which values sit in the int64 column instead of the
+# float64 ones.
+_INT_OPERANDS = 1
+_INT_RESULT = 2
+_INT64_LIMIT = 1 << 63
+
+
+def format_calculation(
+    operation: str,
+    a: float,
+    b: float,
+    result: object,
+    number_format: Callable[[object], str] = str,
+) -> str:
+    """Format one calculation the way the REPL prints it.
+
+    ``number_format`` renders each number, for example one returned by
+    ``app.output.number_formatter``.
+    """
+    if number_format is str:
+        return f"{a} {operation} {b} = {result}"
+    return f"{number_format(a)} {operation} {number_format(b)} = {number_format(result)}"
+
+
+class History:  # pylint: disable=too-many-instance-attributes
+    """Fixed-capacity ring buffer of calculations, formatted only when read.
+
+    Each entry is an operation id plus operands and result stored in
+    parallel typed arrays, so an entry costs a few dozen bytes instead of a
+    formatted string. Operation spellings are interned once, which keeps
+    ``ADD 1 2`` printing back as typed. Exact ints that fit in 64 bits go
+    to an ``array('q')`` column, allocated when the first one arrives.
+    Other results (for example a complex result from a power engine with
+    ``allow_complex`` set) and operands (larger ints, ``Decimal`` or
+    ``Fraction``) are kept aside by slot.
+
+    The columns grow as entries arrive, up to ``capacity``, so an idle
+    history costs almost nothing however large its capacity. When the
+    buffer is full the oldest entry is overwritten, unless
+    ``spill_path`` is set: then the oldest half of the buffer is appended
+    to that file as text in one write before making room.
+    """
+
+    def __init__(self, capacity: int = 1000, spill_path: str | None = None) -> None:
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1.")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spilled = 0
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._operations = array("I")
+        self._a = array("d")
+        self._b = array("d")
+        self._results = array("d")
+        self._kinds = array("B")
+        # Three int64 values per slot (a, b, result), or empty until needed.
+        self._ints = array("q")
+        self._other_results: Dict[int, object] = {}
+        self._other_operands: Dict[int, Tuple[object, object]] = {}
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        return self.entries()
+
+    def entries(self, number_format: Callable[[object], str] = str) -> Iterator[str]:
+        """Yield the entries oldest first, rendering numbers with ``number_format``."""
+        for offset in range(self._count):
+            yield self._format_slot((self._start + offset) % self.capacity, number_format)
+
+    def append(self, operation: str, a: float, b: float, result: object) -> None:
+        """Record one calculation, evicting or spilling the oldest if full."""
+        if self._count == self.capacity:
+            if self.spill_path is None:
+                self._drop(1)
+            else:
+                self._spill(max(1, self.capacity // 2))
+
+        operation_id = self._name_ids.get(operation)
+        if operation_id is None:
+            operation_id = self._name_ids[operation] = len(self._names)
+            self._names.append(operation)
+
+        slot = (self._start + self._count) % self.capacity
+        if slot == len(self._operations):
+            # Not full yet: grow every column by the one slot being filled.
+            self._operations.append(0)
+            self._a.append(0.0)
+            self._b.append(0.0)
+            self._results.append(0.0)
+            self._kinds.append(0)
+            if self._ints:
+                self._ints.extend((0, 0, 0))
+        self._operations[slot] = operation_id
+        kinds = 0
+        if isinstance(a, float) and isinstance(b, float):
+            self._a[slot] = a
+            self._b[slot] = b
+        elif _fits_int64(a) and _fits_int64(b):
+            ints = self._int_column()
+            ints[3 * slot] = a
+            ints[3 * slot + 1] = b
+            kinds = _INT_OPERANDS
+        else:
+            self._other_operands[slot] = (a, b)
+        if isinstance(result, float):
+            self._results[slot] = result
+        elif _fits_int64(result):
+            self._int_column()[3 * slot + 2] = result
+            kinds |= _INT_RESULT
+        else:
+            self._other_results[slot] = result
+        self._kinds[slot] = kinds
+        self._count += 1
+
+    def clear(self) -> None:
+        """Forget every in-memory entry; spilled entries stay on disk."""
+        self._other_results.clear()
+        self._other_operands.clear()
+        self._start = 0
+        self._count = 0
+
+    def _int_column(self) -> array:
+        """Return the int64 column, allocating it for every slot so far."""
+        if not self._ints:
+            self._ints = array("q", bytes(24 * len(self._operations)))
+        return self._ints
+
+    def _format_slot(self, slot: int, number_format: Callable[[object], str] = str) -> str:
+        """Format the entry stored in one ring-buffer slot."""
+        kinds = self._kinds[slot]
+        if kinds & _INT_OPERANDS:
+            a, b = self._ints[3 * slot], self._ints[3 * slot + 1]
+        else:
+            a, b = self._other_operands.get(slot) or (self._a[slot], self._b[slot])
+        if kinds & _INT_RESULT:
+            result = self._ints[3 * slot + 2]
+        else:
+            result = self._other_results.get(slot, self._results[slot])
+        operation = self._names[self._operations[slot]]
+        return format_calculation(operation, a, b, result, number_format)
+
+    def _drop(self, count: int) -> None:
+        """Discard the ``count`` oldest entries."""
+        for offset in range(count):
+            slot = (self._start + offset) % self.capacity
+            self._other_results.pop(slot, None)
+            self._other_operands.pop(slot, None)
+        self._start = (self._start + count) % self.capacity
+        self._count -= count
+
+    def _spill(self, count: int) -> None:
+        """Append the ``count`` oldest entries to the spill file, then drop them."""
+        lines = [
+            self._format_slot((self._start + offset) % self.capacity) + "\n"
+            for offset in range(count)
+        ]
+        with open(self.spill_path, "a", encoding="utf-8") as spill:
+            spill.write("".join(lines))
+        self.spilled += count
+        self._drop(count)
+
+
+def _fits_int64(value: object) -> bool:
+    """Return whether a value is an int (not a bool) that fits in 64 bits."""
+    # Bools are ints too, but would print back as 1 and 0.
+    if type(value) is not int:  # pylint: disable=unidiomatic-typecheck
+        return False
+    return -_INT64_LIMIT <= value < _INT64_LIMIT
+
+
+class HistoryLog:
+    """Append-only binary history file that survives restarts.
+
+    Every calculation is one fixed-width ``RECORD``, so reopening a log of
+    any size only memory-maps the file and counts records; entries are
+    decoded one at a time as they are iterated. Numbers are stored as
+    float64, so exact operands and results are rounded, and integers beyond
+    the float range are stored as infinities. Appends are packed on the
+    caller's thread and written in batches by a background thread, so the
+    REPL never waits on disk. Call ``close()`` (or use the log as a context
+    manager) to flush outstanding writes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # Drop a partial trailing record left by an interrupted write so
+        # new records stay aligned.
+        with open(path, "ab") as log:
+            size = log.tell()
+            if size % RECORD.size:
+                size -= size % RECORD.size
+                log.truncate(size)
+        self._count = size // RECORD.size
+        # Both handles live as long as the log and are released in close().
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        self._reader = open(path, "rb")  # pylint: disable=consider-using-with
+        self._map: mmap.mmap | None = None
+        self._remap()
+        self._queue: queue.Queue[bytes | None] = queue.Queue()
+        self._writer = threading.Thread(target=self._write_batches, daemon=True)
+        self._writer.start()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        return self.entries()
+
+    def entries(self, number_format: Callable[[object], str] = str) -> Iterator[str]:
+        """Yield the logged entries, rendering numbers with ``number_format``."""
+        self.flush()
+        self._remap()
+        if self._map is None:
+            return
+        for offset in range(0, len(self._map), RECORD.size):
+            kind, name, a, b, real, imag = RECORD.unpack_from(self._map, offset)
+            result = complex(real, imag) if kind == _COMPLEX_RESULT else real
+            operation = name.rstrip(b"\0").decode("utf-8", "ignore")
+            yield format_calculation(operation, a, b, result, number_format)
+
+    def __enter__(self) -> HistoryLog:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def append(self, operation: str, a: float, b: float, result: object) -> None:
+        """Queue one calculation for the background writer."""
+        if not (isinstance(a, float) and isinstance(b, float)):
+            a = _to_double(a)
+            b = _to_double(b)
+        if isinstance(result, complex):
+            kind, real, imag = _COMPLEX_RESULT, result.real, result.imag
+        else:
+            kind, real, imag = _REAL_RESULT, _to_double(result), 0.0
+        self._queue.put(RECORD.pack(kind, operation.encode("utf-8"), a, b, real, imag))
+        self._count += 1
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush outstanding records and release the file and its mapping."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._reader.close()
+
+    def _remap(self) -> None:
+        """Map the file again if records were written since the last map."""
+        size = os.fstat(self._reader.fileno()).st_size
+        if size == 0 or (self._map is not None and len(self._map) == size):
+            return
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._reader.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _write_batches(self) -> None:
+        """Write queued records, draining everything available per write."""
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._file.write(b"".join(record for record in batch if record))
+            self._file.flush()
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+
+def _to_double(value: object) -> float:
+    """Convert a number to float64, saturating integers beyond its range."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+__all__ = ["RECORD", "History", "HistoryLog", "format_calculation"]
@@ -0,0 +1,157 @@
+"""Per-operation counters and latency histograms for calculator evaluations."""
+
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Tuple
+
+# Latency histogram buckets are powers of two, from 2**8 ns (256 ns) to
+# 2**24 ns (about 16.8 ms), plus an overflow bucket. A duration's bucket is
+# looked up from its bit length, which is far cheaper than a bisect.
+MIN_BUCKET_BITS = 8
+MAX_BUCKET_BITS = 24
+BUCKETS_NS = tuple(1 << bits for bits in range(MIN_BUCKET_BITS, MAX_BUCKET_BITS + 1))
+_BUCKET_BY_BIT_LENGTH = tuple(
+    min(max(bits - MIN_BUCKET_BITS, 0), len(BUCKETS_NS)) for bits in range(65)
+)
+
+
+class _OperationStats:  # pylint: disable=too-few-public-methods
+    """Counters and histogram for one operation."""
+
+    __slots__ = ("calls", "total_ns", "buckets")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.buckets = [0] * bucket_count
+
+
+class Metrics:
+    """Low-overhead per-operation metrics.
+
+    ``observe`` times one evaluation with two ``perf_counter_ns`` calls and
+    a table lookup for the histogram bucket. Calls that raise are counted per
+    exception type and kept out of the latency histogram. A calculator
+    without metrics skips all of this behind a single ``None`` check.
+    """
+
+    def __init__(self) -> None:
+        self._operations: Dict[str, _OperationStats] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+
+    def observe(
+        self,
+        evaluate: Callable[[str, float, float], float],
+        operation: str,
+        a: float,
+        b: float,
+    ) -> float:
+        """Evaluate ``operation`` through ``evaluate`` and record the outcome."""
+        return self.record(operation, evaluate, operation, a, b)
+
+    def record(self, name: str, function: Callable[..., object], *args: object) -> object:
+        """Call ``function(*args)`` and record the outcome under ``name``.
+
+        Evaluations that are not two-operand calculations, such as n-ary
+        reductions, aggregates and expressions, are measured through here.
+        """
+        stats = self._operations.get(name)
+        if stats is None:
+            stats = self._operations[name] = _OperationStats(len(BUCKETS_NS) + 1)
+        stats.calls += 1
+        start = perf_counter_ns()
+        try:
+            result = function(*args)
+        except Exception as exc:
+            key = (name, type(exc).__name__)
+            self.errors[key] = self.errors.get(key, 0) + 1
+            raise
+        elapsed = perf_counter_ns() - start
+        stats.total_ns += elapsed
+        stats.buckets[_BUCKET_BY_BIT_LENGTH[elapsed.bit_length()]] += 1
+        return result
+
+    def reset(self) -> None:
+        """Drop every counter and histogram."""
+        self._operations.clear()
+        self.errors.clear()
+
+    def summary(self) -> List[str]:
+        """Return one human-readable line per operation, busiest first."""
+        lines = []
+        ordered = sorted(self._operations.items(), key=lambda item: -item[1].calls)
+        for operation, stats in ordered:
+            errors = sum(
+                count for (name, _), count in self.errors.items() if name == operation
+            )
+            timed = stats.calls - errors
+            line = f"{operation:<10} {stats.calls} calls, {errors} errors"
+            if timed:
+                line += (
+                    f", mean {stats.total_ns / timed / 1000:.2f} us"
+                    f", p50 {self._quantile_bound(stats, timed, 0.5)}"
+                    f", p99 {self._quantile_bound(stats, timed, 0.99)}"
+                )
+            lines.append(line)
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP calculator_calculations_total Evaluations per operation, "
+            "including failed ones.",
+            "# TYPE calculator_calculations_total counter",
+        ]
+        for operation, stats in sorted(self._operations.items()):
+            lines.append(
+                f'calculator_calculations_total{{operation="{operation}"}} {stats.calls}'
+            )
+        lines += [
+            "# HELP calculator_errors_total Failed evaluations per operation and error.",
+            "# TYPE calculator_errors_total counter",
+        ]
+        for (operation, error), count in sorted(self.errors.items()):
+            lines.append(
+                f'calculator_errors_total{{operation="{operation}",error="{error}"}} {count}'
+            )
+        lines += [
+            "# HELP calculator_operation_duration_seconds Latency of successful "
+            "evaluations.",
+            "# TYPE calculator_operation_duration_seconds histogram",
+        ]
+        name = "calculator_operation_duration_seconds"
+        for operation, stats in sorted(self._operations.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS_NS + (None,), stats.buckets):
+                cumulative += count
+                le = "+Inf" if bound is None else f"{bound / 1e9:g}"
+                lines.append(
+                    f'{name}_bucket{{operation="{operation}",le="{le}"}} {cumulative}'
+                )
+            lines.append(f'{name}_sum{{operation="{operation}"}} {stats.total_ns / 1e9:g}')
+            lines.append(f'{name}_count{{operation="{operation}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _quantile_bound(stats: _OperationStats, timed: int, quantile: float) -> str:
+        """Return the upper bound of the bucket holding a latency quantile."""
+        rank = quantile * timed
+        cumulative = 0
+        for bound, count in zip(BUCKETS_NS, stats.buckets):
+            cumulative += count
+            if cumulative >= rank:
+                return f"< {_format_ns(bound)}"
+        return f">= {_format_ns(BUCKETS_NS[-1])}"
+
+
+def _format_ns(value: int) -> str:
+    """Format a nanosecond duration with a readable unit."""
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.3g} ms"
+    if value >= 1_000:
+        return f"{value / 1_000:.3g} us"
+    return f"{value} ns"
+
+
+__all__ = ["BUCKETS_NS", "Metrics"]
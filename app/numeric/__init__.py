@@ -0,0 +1,63 @@
+"""Operand parsing for the float, exact integer, Decimal and Fraction backends."""
+
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Callable
+
+# Number backends: ``float`` parses every operand as a float (the default),
+# ``auto`` keeps integral operands as exact ints and parses the rest as
+# floats, while ``decimal`` and ``fraction`` parse every operand as a
+# ``Decimal`` or ``Fraction``.
+NUMBER_BACKENDS = ("float", "auto", "decimal", "fraction")
+
+
+def parse_auto(token: str) -> int | float:
+    """Parse an integral token as an exact ``int`` and anything else as a float.
+
+    A character test picks the type, so a float token costs one string
+    check rather than a failed ``int()`` call.
+    """
+    digits = token[1:] if token[0] in "+-" else token
+    if digits.isdecimal():
+        return int(token)
+    return float(token)
+
+
+def parse_decimal(token: str) -> Decimal:
+    """Parse a token as a ``Decimal``, raising ValueError like ``float``."""
+    try:
+        return Decimal(token)
+    except InvalidOperation as exc:
+        raise ValueError(f"could not convert string to Decimal: '{token}'") from exc
+
+
+def parse_fraction(token: str) -> Fraction:
+    """Parse a token such as ``0.1`` or ``1/3`` as an exact ``Fraction``."""
+    try:
+        return Fraction(token)
+    except ZeroDivisionError as exc:
+        raise ValueError(f"Fraction '{token}' has a zero denominator") from exc
+
+
+def number_parser(backend: str = "float") -> Callable[[str], object]:
+    """Return the function that parses one operand token for a backend.
+
+    The backend shows in the output: exact ints print without a trailing
+    ``.0``, Decimals with their own digits and Fractions as ``n/d``, and a
+    result that had to fall back to a float (``divide 1 3`` on ints, say)
+    prints as one.
+    """
+    if backend not in NUMBER_BACKENDS:
+        raise ValueError(f"Number backend must be one of {NUMBER_BACKENDS}.")
+    if backend == "auto":
+        return parse_auto
+    if backend == "decimal":
+        return parse_decimal
+    if backend == "fraction":
+        return parse_fraction
+    return float
+
+
+__all__ = ["NUMBER_BACKENDS", "number_parser", "parse_auto", "parse_decimal", "parse_fraction"]
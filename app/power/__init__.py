@@ -0,0 +1,142 @@
+"""Bounded-cost exponentiation for the power calculation."""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal, DecimalException, Overflow
+from fractions import Fraction
+
+# log10 of the largest finite float; anything estimated above this overflows.
+MAX_FLOAT_LOG10 = math.log10(1.7976931348623157e308)
+OVERFLOW_POLICIES = ("error", "inf")
+
+
+def estimate_log10(a: float, b: float) -> float:
+    """Estimate ``log10(abs(a ** b))`` without computing the power."""
+    if a == 0:
+        return -math.inf if b > 0 else 0.0
+    return b * math.log10(abs(a))
+
+
+class PowerEngine:  # pylint: disable=too-few-public-methods
+    """Exponentiation whose cost is decided before any work is done.
+
+    The result's magnitude is estimated in log space first. Float results
+    that would overflow either raise ``ValueError`` (``overflow="error"``)
+    or return a signed infinity (``overflow="inf"``). Integer operands take
+    an exact integer path while the result stays under ``max_int_bits``
+    bits and fall back to the float path beyond it, so no request can
+    build an arbitrarily large integer; ``Fraction`` operands with an
+    integral exponent stay exact under the same limit. ``Decimal`` operands
+    are raised in decimal arithmetic, whose fixed precision bounds the
+    cost. A negative base with a fractional exponent is rejected with
+    ``ValueError`` unless ``allow_complex=True``, which returns the complex
+    result instead.
+    """
+
+    def __init__(
+        self,
+        max_int_bits: int = 1 << 16,
+        overflow: str = "error",
+        allow_complex: bool = False,
+    ) -> None:
+        if max_int_bits < 1:
+            raise ValueError("Integer bit limit must be at least 1.")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow policy must be one of {OVERFLOW_POLICIES}.")
+        self.max_int_bits = max_int_bits
+        self.overflow = overflow
+        self.allow_complex = allow_complex
+
+    def power(self, a: float, b: float) -> float:
+        """Return ``a ** b`` within the engine's limits."""
+        if (
+            isinstance(a, int)
+            and isinstance(b, int)
+            and b >= 0
+            and b * a.bit_length() <= self.max_int_bits
+        ):
+            return a**b
+        if type(a) is Fraction and type(b) is Fraction:  # pylint: disable=unidiomatic-typecheck
+            if b.denominator == 1 and abs(b.numerator) * max(
+                a.numerator.bit_length(), a.denominator.bit_length()
+            ) <= self.max_int_bits:
+                if not a and b < 0:
+                    raise ZeroDivisionError("0 cannot be raised to a negative power")
+                return a**b
+        elif type(a) is Decimal and type(b) is Decimal:  # pylint: disable=unidiomatic-typecheck
+            return _decimal_power(a, b)
+
+        a = float(a)
+        b = float(b)
+        if a < 0 and not b.is_integer() and not self.allow_complex:
+            raise ValueError("Power of a negative base to a fractional exponent is not real.")
+        if math.isfinite(a) and math.isfinite(b):
+            magnitude = estimate_log10(a, b)
+            if magnitude > MAX_FLOAT_LOG10:
+                return self._overflow(a, b, magnitude)
+        try:
+            return a**b
+        except OverflowError:
+            # The estimate can sit just under the limit when rounding pushes
+            # the exact result over it.
+            return self._overflow(a, b, estimate_log10(a, b))
+
+    def _overflow(self, a: float, b: float, magnitude: float) -> float:
+        """Apply the overflow policy to a result too large for a float."""
+        if self.overflow == "error":
+            raise ValueError(f"Result too large: about 10^{magnitude:.0f}.")
+        if a < 0 and b.is_integer() and b % 2:
+            return -math.inf
+        if a > 0 or b.is_integer():
+            return math.inf
+        return complex(math.inf, math.inf)
+
+
+def _decimal_power(a: Decimal, b: Decimal) -> Decimal:
+    """Return ``a ** b`` in decimal arithmetic with the engine's error types."""
+    if not a and b < 0:
+        raise ZeroDivisionError("0 cannot be raised to a negative power")
+    try:
+        return a**b
+    except Overflow as exc:
+        raise ValueError("Result too large for a Decimal.") from exc
+    except DecimalException as exc:
+        raise ValueError(f"{a} ** {b} is undefined for decimals.") from exc
+
+
+def _integral(value: float) -> int:
+    """Return an integral powmod operand as an ``int``."""
+    if isinstance(value, int):
+        return value
+    if not float(value).is_integer():
+        raise ValueError("powmod operands must be integers.")
+    return int(value)
+
+
+def powmod(base: float, exponent: float, modulus: float) -> int:
+    """Return ``base ** exponent % modulus`` using modular exponentiation.
+
+    Operands must be integral; the work grows with the bit length of the
+    exponent and modulus only, never with the size of the full power.
+    Registered as the ternary operation ``powmod``.
+    """
+    base = _integral(base)
+    exponent = _integral(exponent)
+    modulus = _integral(modulus)
+    if modulus == 0:
+        raise ValueError("powmod modulus must not be zero.")
+    return pow(base, exponent, modulus)
+
+
+# Engine used by the registered power calculation; adjust its attributes to
+# change the limits process-wide.
+DEFAULT_ENGINE = PowerEngine()
+
+__all__ = [
+    "DEFAULT_ENGINE",
+    "MAX_FLOAT_LOG10",
+    "PowerEngine",
+    "estimate_log10",
+    "powmod",
+]
@@ -0,0 +1,115 @@
+"""Packed binary job and result records for bulk evaluation."""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Callable, Iterable, List, Tuple
+
+from app.calculation import (
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_INVALID,
+    STATUS_OK,
+    STATUS_OVERFLOW,
+    CalculationFactory,
+)
+
+# One job: operation id (its position in the factory registry), padding
+# that keeps the operands 8-byte aligned, then both float64 operands.
+JOB_RECORD = struct.Struct("<I4xdd")
+# One result: a STATUS_* code, padding, then the float64 result (NaN or a
+# signed infinity on error).
+RESULT_RECORD = struct.Struct("<I4xd")
+
+
+def pack_jobs(jobs: Iterable[Tuple[object, float, float]]) -> bytes:
+    """Pack ``(operation, a, b)`` jobs, given by name or registry id."""
+    names = list(CalculationFactory.calculations)
+    packed = bytearray()
+    for operation, a, b in jobs:
+        if isinstance(operation, str):
+            operation = names.index(operation.lower())
+        packed += JOB_RECORD.pack(operation, a, b)
+    return bytes(packed)
+
+
+def unpack_results(data: bytes) -> List[Tuple[int, float]]:
+    """Unpack result records into ``(status, result)`` pairs."""
+    return list(RESULT_RECORD.iter_unpack(data))
+
+
+def evaluate_records(data: bytes | bytearray | memoryview) -> bytearray:
+    """Evaluate packed job records and return the packed result records.
+
+    The operation and operand columns are strided ``memoryview`` casts of
+    ``data``, so nothing is parsed or copied before the batch kernels of
+    ``CalculationFactory.execute_batch_status`` run. Failing records get
+    their own status code without raising, so they cost about as much as
+    records that succeed.
+    """
+    view = memoryview(data)
+    if view.nbytes % JOB_RECORD.size:
+        raise ValueError(
+            f"Binary job data must be a whole number of {JOB_RECORD.size}-byte records."
+        )
+    count = view.nbytes // JOB_RECORD.size
+    output = bytearray(count * RESULT_RECORD.size)
+    if not count:
+        return output
+    # The casts read native byte order, which is the records' little-endian
+    # layout on practically every host; others go through ``struct``.
+    if sys.byteorder != "little":
+        return _evaluate_unpacked(view, output)
+
+    # Each record is three 8-byte words: the id word and the two operands.
+    words = view.cast("B").cast("d")
+    operations = view.cast("B").cast("I")[0::6]
+    a_values = words[1::3]
+    b_values = words[2::3]
+
+    results, codes = CalculationFactory.execute_batch_status(operations, a_values, b_values)
+    memoryview(output).cast("d")[1::2] = results
+    # The output starts zeroed, so statuses only need writing after a failure.
+    if any(codes):
+        memoryview(output).cast("I")[0::4] = memoryview(array("I", codes))
+    return output
+
+
+def _evaluate_unpacked(view: memoryview, output: bytearray) -> bytearray:
+    """Evaluate job records through ``struct``, whatever the host byte order."""
+    operations, a_values, b_values = zip(*JOB_RECORD.iter_unpack(view))
+    results, codes = CalculationFactory.execute_batch_status(operations, a_values, b_values)
+    for index, record in enumerate(zip(codes, results)):
+        RESULT_RECORD.pack_into(output, index * RESULT_RECORD.size, *record)
+    return output
+
+
+def run_records(
+    source: BinaryIO,
+    write: Callable[[bytes], object],
+    chunk_records: int = 65536,
+) -> None:
+    """Stream packed jobs from ``source`` and write packed results in order."""
+    if chunk_records < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    chunk_bytes = chunk_records * JOB_RECORD.size
+    while True:
+        data = source.read(chunk_bytes)
+        if not data:
+            break
+        write(evaluate_records(data))
+
+
+__all__ = [
+    "JOB_RECORD",
+    "RESULT_RECORD",
+    "STATUS_DIVIDE_BY_ZERO",
+    "STATUS_INVALID",
+    "STATUS_OK",
+    "STATUS_OVERFLOW",
+    "evaluate_records",
+    "pack_jobs",
+    "run_records",
+    "unpack_results",
+]
@@ -0,0 +1,384 @@
+"""Record REPL sessions and replay them as load against the calculator."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from time import perf_counter
+from typing import Callable, Iterable, List, NamedTuple, Sequence, Tuple
+
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+
+CalculatorFactory = Callable[[Callable[[str], None]], Calculator]
+
+
+class Step(NamedTuple):
+    """One input line, when it was entered and what the calculator printed.
+
+    ``at`` is seconds since the session started. ``outputs`` is ``None``
+    for synthetic steps, whose output is not checked on replay.
+    """
+
+    at: float
+    line: str
+    outputs: Tuple[str, ...] | None
+
+
+class Session(NamedTuple):
+    """A recorded REPL session: output before the first prompt, the steps,
+    and output after input ended."""
+
+    preamble: Tuple[str, ...]
+    steps: Tuple[Step, ...]
+    epilogue: Tuple[str, ...] = ()
+
+
+class Divergence(NamedTuple):
+    """A replayed step whose output differs from the recording."""
+
+    step: int
+    line: str
+    expected: Tuple[str, ...]
+    actual: Tuple[str, ...]
+
+
+class SessionResult(NamedTuple):
+    """Per-step latencies and divergences of one replayed session."""
+
+    latencies: List[float]
+    divergences: List[Divergence]
+
+
+class ReplayReport(NamedTuple):
+    """Throughput, latency percentiles (seconds) and divergences of a replay."""
+
+    sessions: int
+    lines: int
+    elapsed: float
+    lines_per_sec: float
+    p50: float
+    p90: float
+    p99: float
+    max_latency: float
+    divergences: Tuple[Divergence, ...]
+
+
+class SessionRecorder:  # pylint: disable=too-many-instance-attributes
+    """Capture a session through a ``Calculator``'s input and output hooks.
+
+    Pass ``recorder.input`` as ``input_func`` and ``recorder.output`` as
+    ``output_func``; both forward to the wrapped functions (``input`` and
+    ``print`` by default), so the session runs as usual while every line,
+    its time and its output are kept.
+    """
+
+    def __init__(
+        self,
+        input_func: Callable[[str], str] | None = None,
+        output_func: Callable[[str], None] | None = None,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        self._input_func = input if input_func is None else input_func
+        self._output_func = print if output_func is None else output_func
+        self._clock = clock
+        self._start = clock()
+        self._preamble: List[str] = []
+        self._steps: List[Tuple[float, str, List[str]]] = []
+        self._epilogue: List[str] = []
+        self._current = self._preamble
+
+    def input(self, prompt: str) -> str:
+        """Read a line through the wrapped input function and record it."""
+        try:
+            line = self._input_func(prompt)
+        except (EOFError, KeyboardInterrupt):
+            self._current = self._epilogue
+            raise
+        self._current = []
+        self._steps.append((self._clock() - self._start, line, self._current))
+        return line
+
+    def output(self, text: str) -> None:
+        """Record output for the current step and pass it on."""
+        self._current.append(text)
+        self._output_func(text)
+
+    def session(self) -> Session:
+        """Return what has been recorded so far."""
+        return Session(
+            tuple(self._preamble),
+            tuple(Step(at, line, tuple(outputs)) for at, line, outputs in self._steps),
+            tuple(self._epilogue),
+        )
+
+
+def save_sessions(path: str, sessions: Iterable[Session], append: bool = False) -> None:
+    """Write sessions to a JSON Lines file, one session per line."""
+    with open(path, "a" if append else "w", encoding="utf-8") as handle:
+        for session in sessions:
+            record = {
+                "preamble": list(session.preamble),
+                "steps": [
+                    {
+                        "at": step.at,
+                        "input": step.line,
+                        "output": None if step.outputs is None else list(step.outputs),
+                    }
+                    for step in session.steps
+                ],
+                "epilogue": list(session.epilogue),
+            }
+            handle.write(json.dumps(record) + "\n")
+
+
+def load_sessions(path: str) -> List[Session]:
+    """Read the sessions written by ``save_sessions``."""
+    sessions = []
+    with open(path, encoding="utf-8") as handle:
+        for number, text in enumerate(handle, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+                steps = tuple(
+                    Step(
+                        float(step["at"]),
+                        step["input"],
+                        None if step["output"] is None else tuple(step["output"]),
+                    )
+                    for step in record["steps"]
+                )
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid session on line {number} of {path}: {exc}") from exc
+            sessions.append(
+                Session(tuple(record.get("preamble", ())), steps, tuple(record.get("epilogue", ())))
+            )
+    return sessions
+
+
+def synthetic_sessions(
+    count: int, lines: int, seed: int = 0, think_time: float = 0.0
+) -> List[Session]:
+    """Generate ``count`` sessions of ``lines`` random binary calculations.
+
+    Operands are integers in [-100, 100], with the second one non-negative
+    so some divisions by zero show up as they would in real use. Steps are
+    ``think_time`` seconds apart and their output is not checked.
+    """
+    if count < 1 or lines < 1:
+        raise ValueError("Session and line counts must be at least 1.")
+    generator = random.Random(seed)
+    operations = list(CalculationFactory.calculations)
+    return [
+        Session(
+            (),
+            tuple(
+                Step(
+                    index * think_time,
+                    f"{generator.choice(operations)} {generator.randint(-100, 100)} "
+                    f"{generator.randint(0, 100)}",
+                    None,
+                )
+                for index in range(lines)
+            ),
+        )
+        for _ in range(count)
+    ]
+
+
+def _default_calculator(output_func: Callable[[str], None]) -> Calculator:
+    """Build a calculator with default settings that writes to ``output_func``."""
+    return Calculator(output_func=output_func, paginate=False)
+
+
+def replay_session(
+    session: Session,
+    speed: float | None = None,
+    calculator_factory: CalculatorFactory = _default_calculator,
+    sleep: Callable[[float], object] = time.sleep,
+) -> SessionResult:
+    """Drive one session through a fresh calculator and time every step.
+
+    With ``speed`` each step waits for its recorded time divided by
+    ``speed`` (1.0 is the recorded pace); without it steps run back to
+    back. Steps run through ``Calculator.process``, so a step's latency is
+    the time to evaluate and print that one line.
+    """
+    outputs: List[str] = []
+    calculator = calculator_factory(outputs.append)
+    latencies = []
+    divergences = []
+    start = perf_counter()
+    for index, step in enumerate(session.steps):
+        if speed is not None:
+            delay = start + step.at / speed - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        outputs.clear()
+        began = perf_counter()
+        running = calculator.process(step.line)
+        latencies.append(perf_counter() - began)
+        if step.outputs is not None and tuple(outputs) != step.outputs:
+            divergences.append(Divergence(index, step.line, step.outputs, tuple(outputs)))
+        if not running:
+            break
+    return SessionResult(latencies, divergences)
+
+
+def replay(  # pylint: disable=too-many-arguments
+    sessions: Sequence[Session],
+    concurrency: int = 1,
+    speed: float | None = None,
+    repeat: int = 1,
+    calculator_factory: CalculatorFactory = _default_calculator,
+) -> ReplayReport:
+    """Replay every session ``repeat`` times, ``concurrency`` at a time.
+
+    Each session gets its own calculator. Concurrent sessions run on
+    threads, so paced sessions overlap the way independent users would;
+    at full speed the GIL keeps one evaluating at a time.
+    """
+    if concurrency < 1 or repeat < 1:
+        raise ValueError("Concurrency and repeat must be at least 1.")
+    if speed is not None and speed <= 0:
+        raise ValueError("Replay speed must be positive.")
+    jobs = list(sessions) * repeat
+    run = partial(replay_session, speed=speed, calculator_factory=calculator_factory)
+    began = perf_counter()
+    if concurrency == 1:
+        results = [run(session) for session in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(run, jobs))
+    elapsed = perf_counter() - began
+    latencies = sorted(chain.from_iterable(result.latencies for result in results))
+    return ReplayReport(
+        len(jobs),
+        len(latencies),
+        elapsed,
+        len(latencies) / elapsed if elapsed > 0 else 0.0,
+        _percentile(latencies, 50),
+        _percentile(latencies, 90),
+        _percentile(latencies, 99),
+        latencies[-1] if latencies else 0.0,
+        tuple(chain.from_iterable(result.divergences for result in results)),
+    )
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of a sorted list, or 0 if empty."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def format_report(report: ReplayReport, max_divergences: int = 5) -> str:
+    """Render a replay report, listing the first few divergences."""
+    lines = [
+        f"sessions      {report.sessions}",
+        f"lines         {report.lines}",
+        f"elapsed       {report.elapsed:.3f} s",
+        f"throughput    {report.lines_per_sec:,.0f} lines/s",
+        f"latency p50   {report.p50 * 1e6:.1f} us",
+        f"latency p90   {report.p90 * 1e6:.1f} us",
+        f"latency p99   {report.p99 * 1e6:.1f} us",
+        f"latency max   {report.max_latency * 1e6:.1f} us",
+        f"divergences   {len(report.divergences)}",
+    ]
+    for divergence in report.divergences[:max_divergences]:
+        lines.append(
+            f"  step {divergence.step} {divergence.line!r}: "
+            f"expected {list(divergence.expected)}, got {list(divergence.actual)}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the record and replay command line."""
+    parser = argparse.ArgumentParser(
+        description="Record calculator sessions and replay them as load."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="run the REPL and append the session to PATH")
+    record.add_argument("path")
+
+    replay_options = argparse.ArgumentParser(add_help=False)
+    replay_options.add_argument(
+        "--concurrency", type=int, default=1, help="sessions replayed at the same time"
+    )
+    replay_options.add_argument(
+        "--repeat", type=int, default=1, help="times every session is replayed"
+    )
+    replay_options.add_argument(
+        "--speed",
+        type=float,
+        help="replay at this multiple of the recorded pace (default: as fast as possible)",
+    )
+    run = commands.add_parser(
+        "run", parents=[replay_options], help="replay the sessions recorded in PATH"
+    )
+    run.add_argument("path")
+    synthetic = commands.add_parser(
+        "synthetic", parents=[replay_options], help="replay generated sessions"
+    )
+    synthetic.add_argument("--sessions", type=int, default=10, help="sessions to generate")
+    synthetic.add_argument("--lines", type=int, default=1000, help="lines per session")
+    synthetic.add_argument("--seed", type=int, default=0, help="random seed")
+    synthetic.add_argument(
+        "--think-time", type=float, default=0.0, help="seconds between generated lines"
+    )
+    synthetic.add_argument("--save", metavar="PATH", help="write the sessions to PATH instead")
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Record or replay sessions; exit with 1 when a replay diverged."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        recorder = SessionRecorder()
+        try:
+            Calculator(input_func=recorder.input, output_func=recorder.output).run()
+        finally:
+            save_sessions(args.path, [recorder.session()], append=True)
+        return 0
+
+    try:
+        if args.command == "run":
+            sessions = load_sessions(args.path)
+        else:
+            sessions = synthetic_sessions(args.sessions, args.lines, args.seed, args.think_time)
+            if args.save is not None:
+                save_sessions(args.save, sessions)
+                return 0
+        report = replay(sessions, args.concurrency, args.speed, args.repeat)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(format_report(report))
+    return 1 if report.divergences else 0
+
+
+__all__ = [
+    "Divergence",
+    "ReplayReport",
+    "Session",
+    "SessionRecorder",
+    "SessionResult",
+    "Step",
+    "format_report",
+    "load_sessions",
+    "main",
+    "replay",
+    "replay_session",
+    "save_sessions",
+    "synthetic_sessions",
+]
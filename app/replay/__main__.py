@@ -0,0 +1,7 @@
+"""Record or replay calculator sessions with ``python -m app.replay``."""
+
+import sys
+
+from app.replay import main
+
+sys.exit(main())
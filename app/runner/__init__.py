@@ -0,0 +1,154 @@
+"""Sharded multi-process runner for large calculator job files."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
+from typing import Callable, Iterable, List, NamedTuple, Tuple
+
+from app.cache import PersistentCache, ResultCache
+from app.calculator import Calculator
+
+# Upper bound on the bytes a single worker task reads into memory at once.
+MAX_SHARD_BYTES = 64 * 1024 * 1024
+
+
+def shard_offsets(path: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a file into at most ``shards`` byte ranges aligned to line starts."""
+    if shards < 1:
+        raise ValueError("Shard count must be at least 1.")
+
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as jobs:
+        for index in range(1, shards):
+            target = size * index // shards
+            if target <= boundaries[-1]:
+                continue
+            # Step back one byte so a boundary that already sits on a line
+            # start is kept rather than skipped.
+            jobs.seek(target - 1)
+            jobs.readline()
+            position = jobs.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end
+    ]
+
+
+class ShardOptions(NamedTuple):
+    """Calculator settings every shard is evaluated with.
+
+    ``cache_path`` names a persistent result cache that every worker
+    shares, with entries older than ``cache_ttl`` seconds ignored.
+    ``number_format`` renders result numbers and ``number_parser`` parses
+    operands, as in ``Calculator``. All fields must be picklable, as the
+    functions from ``app.output.number_formatter`` and
+    ``app.numeric.number_parser`` are. Without ``cache_path``, a
+    ``cache_size`` above zero gives each shard its own in-memory
+    ``ResultCache`` of that size.
+    """
+
+    cache_path: str | None = None
+    cache_ttl: float | None = None
+    number_format: Callable[[object], str] = str
+    number_parser: Callable[[str], object] = float
+    cache_size: int = 0
+
+
+def evaluate_shard(
+    path: str, start: int, end: int, options: ShardOptions = ShardOptions()
+) -> str:
+    """Evaluate the jobs in one byte range and return the formatted output."""
+    with open(path, "rb") as jobs:
+        jobs.seek(start)
+        data = jobs.read(end - start)
+
+    # Split on newlines only, as shard_offsets and file iteration do;
+    # splitlines() would also break lines at form feeds and the like.
+    lines = data.decode("utf-8").split("\n")
+    if not lines[-1]:
+        lines.pop()
+    parts: List[str] = []
+    _stream(lines, parts.append, options)
+    return "".join(parts)
+
+
+def _stream(
+    lines: Iterable[str], write: Callable[[str], object], options: ShardOptions
+) -> None:
+    """Stream job lines through one calculator built from ``options``."""
+    with _open_cache(options) as cache:
+        calculator = Calculator(
+            cache=cache,
+            number_format=options.number_format,
+            number_parser=options.number_parser,
+        )
+        calculator.stream(lines, write)
+
+
+def _open_cache(
+    options: ShardOptions,
+) -> AbstractContextManager[PersistentCache | ResultCache | None]:
+    """Open the shared persistent cache, or a context yielding a shard's own cache."""
+    if options.cache_path is not None:
+        return PersistentCache(options.cache_path, ttl=options.cache_ttl)
+    return nullcontext(ResultCache(options.cache_size) if options.cache_size else None)
+
+
+def has_assignments(path: str, block_size: int = 1 << 20) -> bool:
+    """Return whether any job in the file assigns a variable.
+
+    The file is scanned in ``block_size`` blocks for ``=``, which only
+    assignments contain, so the check costs one read of the file.
+    """
+    with open(path, "rb") as jobs:
+        return any(b"=" in block for block in iter(partial(jobs.read, block_size), b""))
+
+
+def run_sharded(
+    path: str,
+    write: Callable[[str], object],
+    workers: int | None = None,
+    options: ShardOptions = ShardOptions(),
+) -> None:
+    """Evaluate a job file across worker processes, writing output in input order.
+
+    The file is cut into byte-range shards at line boundaries. Each worker
+    evaluates its shard through the ``CalculationFactory`` registry and the
+    results are written back in shard order, so the output is identical to
+    a single-process stream run. A file that assigns variables is streamed
+    through one calculator instead, since later jobs may read variables
+    set by earlier ones.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Worker count must be at least 1.")
+
+    if has_assignments(path):
+        with open(path, encoding="utf-8") as jobs:
+            _stream(jobs, write, options)
+        return
+
+    shard_count = max(workers * 4, -(-os.path.getsize(path) // MAX_SHARD_BYTES))
+    offsets = shard_offsets(path, shard_count)
+    evaluate = partial(evaluate_shard, path, options=options)
+
+    if workers == 1:
+        for start, end in offsets:
+            write(evaluate(start, end))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts = [start for start, _ in offsets]
+        ends = [end for _, end in offsets]
+        for output in executor.map(evaluate, starts, ends):
+            write(output)
+
+
+__all__ = ["ShardOptions", "evaluate_shard", "has_assignments", "run_sharded", "shard_offsets"]
@@ -0,0 +1,142 @@
+"""asyncio line-protocol server hosting many calculator sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.history import History
+
+
+class CalculatorServer:  # pylint: disable=too-many-instance-attributes
+    """TCP server speaking the REPL protocol, one line in and lines out.
+
+    Every connection gets its own ``Calculator`` session, and so its own
+    history, while all sessions share one operation registry. Requests are
+    read and answered strictly in order, so clients may pipeline many lines
+    without waiting: every complete line in a received chunk is answered
+    with a single write followed by ``drain()``, which only blocks when the
+    client stops reading. Connections over
+    ``max_connections``, idle for ``idle_timeout`` seconds or sending a line
+    longer than ``line_limit`` bytes are closed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        max_connections: int = 10000,
+        idle_timeout: float = 300.0,
+        line_limit: int = 4096,
+        history_size: int = 100,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("Connection limit must be at least 1.")
+        if idle_timeout <= 0:
+            raise ValueError("Idle timeout must be positive.")
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.line_limit = line_limit
+        self.history_size = history_size
+        self.active_connections = 0
+        self._operations: Dict[str, None] = dict.fromkeys(
+            CalculationFactory.operation_names()
+        )
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Bind the listening socket; ``port`` holds the bound port afterwards."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and accept connections until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and wait for the listener to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection until exit, idle timeout, or disconnect."""
+        if self.active_connections >= self.max_connections:
+            writer.write(b"Error: server is at its connection limit\n")
+            await self._close(writer)
+            return
+
+        self.active_connections += 1
+        lines: List[str] = []
+        session = Calculator(
+            operations=self._operations,
+            input_func=lambda _prompt: "",
+            output_func=lines.append,
+            history=History(self.history_size),
+        )
+        pending = b""
+        keep_open = True
+        try:
+            while keep_open:
+                try:
+                    chunk = await asyncio.wait_for(
+                        reader.read(self.line_limit), self.idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    writer.write(b"Error: idle timeout\n")
+                    break
+                # Answer every complete line that arrived with this chunk in
+                # one write; a final line without a newline runs at EOF.
+                requests = (pending + chunk).split(b"\n")
+                pending = requests.pop() if chunk else b""
+                if len(pending) > self.line_limit:
+                    writer.write(b"Error: line too long\n")
+                    break
+                for request in requests:
+                    keep_open = session.process(request.decode("utf-8", "replace"))
+                    if not keep_open:
+                        break
+                if lines:
+                    lines.append("")
+                    writer.write("\n".join(lines).encode("utf-8"))
+                    lines.clear()
+                await writer.drain()
+                if not chunk:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.active_connections -= 1
+            await self._close(writer)
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter) -> None:
+        """Flush and close a client connection, ignoring a vanished peer."""
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def serve(host: str, port: int, **options: float) -> None:
+    """Run a calculator server in the foreground until interrupted."""
+    server = CalculatorServer(host, port, **options)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["CalculatorServer", "serve"]
@@ -0,0 +1,210 @@
+"""Named variables with formulas that recompute incrementally."""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from app.calculation import CalculationFactory
+
+_NAME = re.compile(r"[A-Za-z_]\w*\Z")
+# Marks a variable that had no value before its first evaluation.
+_MISSING = object()
+
+
+class Formula(NamedTuple):
+    """An operation over numbers and variable names, or a single argument.
+
+    ``operation`` is ``None`` for a plain number or a reference to another
+    variable, in which case ``arguments`` holds exactly that one value.
+    """
+
+    operation: str | None
+    arguments: Tuple[float | str, ...]
+
+    @property
+    def references(self) -> Tuple[str, ...]:
+        """Variable names the formula reads."""
+        return tuple(argument for argument in self.arguments if isinstance(argument, str))
+
+    def __str__(self) -> str:
+        parts = [] if self.operation is None else [self.operation]
+        return " ".join(parts + [str(argument) for argument in self.arguments])
+
+
+class Workspace:
+    """Spreadsheet-style variables over the registered operations.
+
+    ``assign("x", "add a b")`` stores a formula and records ``x`` as a
+    dependent of ``a`` and ``b``. Changing a variable recomputes only its
+    transitive dependents, in topological order, and a dependent whose
+    inputs all came out unchanged is skipped along with everything below
+    it. Values are cached between assignments, so reading a variable never
+    evaluates anything. A failed evaluation is stored as the variable's
+    error and reported by every variable that depends on it.
+    """
+
+    def __init__(self, reserved_names: Iterable[str] = ()) -> None:
+        self.reserved_names = frozenset(name.lower() for name in reserved_names)
+        self._formulas: Dict[str, Formula] = {}
+        self._values: Dict[str, object] = {}
+        # Insertion-ordered "sets", so recomputation order is repeatable.
+        self._dependents: Dict[str, Dict[str, None]] = {}
+        self.evaluations = 0
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._formulas
+
+    def __len__(self) -> int:
+        return len(self._formulas)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._formulas)
+
+    def __getitem__(self, name: str) -> float:
+        """Return a variable's cached value, raising its error if it failed."""
+        if name not in self._formulas:
+            raise ValueError(f"Unknown variable '{name}'")
+        value = self._values[name]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def formula(self, name: str) -> Formula:
+        """Return the formula a variable was assigned."""
+        if name not in self._formulas:
+            raise ValueError(f"Unknown variable '{name}'")
+        return self._formulas[name]
+
+    def assign(self, name: str, source: str) -> List[Tuple[str, object]]:
+        """Assign ``source`` to ``name`` and recompute what depends on it.
+
+        Returns ``(name, value)`` for every variable whose value was
+        recomputed, in evaluation order; a value is an exception when that
+        variable's evaluation failed.
+        """
+        self._check_name(name)
+        formula = self._parse(source)
+        dependents = self._affected(name)
+        downstream = set(dependents)
+        for reference in formula.references:
+            if reference == name or reference in downstream:
+                raise ValueError(f"Circular reference: '{name}' depends on itself")
+
+        previous = self._formulas.get(name)
+        if previous is not None:
+            for reference in previous.references:
+                self._dependents[reference].pop(name, None)
+        for reference in formula.references:
+            self._dependents.setdefault(reference, {})[name] = None
+        self._formulas[name] = formula
+        return self._recompute(name, dependents)
+
+    def _check_name(self, name: str) -> None:
+        """Reject names that are not identifiers, read as numbers or shadow commands."""
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid variable name '{name}'")
+        # Arguments are read as numbers first, so 'inf' or 'nan' could be
+        # assigned but never referenced.
+        try:
+            float(name)
+        except ValueError:
+            pass
+        else:
+            raise ValueError(f"'{name}' is a number and cannot be a variable name")
+        lowered = name.lower()
+        if (
+            lowered in self.reserved_names
+            or lowered in CalculationFactory.aggregates
+            or lowered in CalculationFactory.operation_names()
+        ):
+            raise ValueError(f"'{name}' is reserved and cannot be a variable name")
+
+    def _parse(self, source: str) -> Formula:
+        """Parse ``number``, ``variable`` or ``operation arg1 arg2 ...``."""
+        tokens = source.split()
+        if len(tokens) == 1:
+            return Formula(None, (self._parse_argument(tokens[0]),))
+        if len(tokens) < 3:
+            raise ValueError(
+                "Invalid formula. Please provide: name = operation operand1 operand2"
+            )
+        operation = tokens[0].lower()
+        if operation not in CalculationFactory.operation_names():
+            raise ValueError(f"Unknown operation '{tokens[0]}'")
+        return Formula(operation, tuple(map(self._parse_argument, tokens[1:])))
+
+    def _parse_argument(self, token: str) -> float | str:
+        """Return a number, or the name of an already defined variable."""
+        try:
+            return float(token)
+        except ValueError:
+            pass
+        if token not in self._formulas:
+            raise ValueError(f"Unknown variable '{token}'")
+        return token
+
+    def _affected(self, name: str) -> List[str]:
+        """Return the transitive dependents of ``name`` in topological order."""
+        # Reverse post-order of an iterative depth-first walk over the
+        # dependent edges, so long chains never hit the recursion limit.
+        # Children are walked newest first, so independent dependents come
+        # out in the order they were defined.
+        order: List[str] = []
+        visited = {name}
+        stack = [(name, reversed(self._dependents.get(name, {})))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, reversed(self._dependents.get(child, {}))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+        order.pop()
+        order.reverse()
+        return order
+
+    def _recompute(self, name: str, dependents: List[str]) -> List[Tuple[str, object]]:
+        """Evaluate ``name``, then every dependent whose inputs changed."""
+        updates = []
+        changed = set()
+        for node in [name] + dependents:
+            formula = self._formulas[node]
+            if node != name and changed.isdisjoint(formula.references):
+                continue
+            value = self._evaluate(formula)
+            previous = self._values.get(node, _MISSING)
+            self._values[node] = value
+            updates.append((node, value))
+            if (
+                isinstance(value, Exception)
+                or isinstance(previous, Exception)
+                or value != previous
+            ):
+                changed.add(node)
+        return updates
+
+    def _evaluate(self, formula: Formula) -> object:
+        """Evaluate one formula from cached values, returning errors as values."""
+        self.evaluations += 1
+        operands = []
+        for argument in formula.arguments:
+            if isinstance(argument, str):
+                value = self._values[argument]
+                if isinstance(value, Exception):
+                    return ValueError(f"'{argument}' has an error")
+                argument = value
+            operands.append(argument)
+        if formula.operation is None:
+            return operands[0]
+        try:
+            if len(operands) == 2:
+                return CalculationFactory.evaluate(formula.operation, operands[0], operands[1])
+            return CalculationFactory.reduce(formula.operation, operands)
+        except (ArithmeticError, ValueError) as exc:
+            return exc
+
+__all__ = ["Formula", "Workspace"]
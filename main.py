@@ -1,6 +1,9 @@
-# This line imports the Calculator class from another file.
-# Think of it as bringing in a reusable tool that can run the calculator REPL.
-from app.calculator import Calculator
+# This line imports the main function from another file.
+# Think of it as bringing in a reusable tool that reads the command line and
+# then either runs the calculator REPL or streams a job file through it.
+import sys
+
+from app.cli import main
 
 # This part of the code is super important! It checks if this file is being run directly by the computer.
 # Let me explain: when we write Python programs, sometimes we want to run them directly,
@@ -11,5 +14,6 @@ from app.calculator import Calculator
 # So, what this line means is: "If you're running this program directly
 # (not as part of another program), then start the calculator."
 if __name__ == "__main__":
-    # Create the calculator and run the REPL.
-    Calculator().run()
+    # Start the calculator. With no options this is the REPL; with --stream it
+    # reads "operation operand1 operand2" lines from a file or stdin instead.
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Tests for single-pass aggregate operations."""
+
+import math
+import statistics
+from array import array
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.aggregate import RunningStats, running_sum
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.cli import main
+
+
+@pytest.mark.parametrize(
+    "name,values,expected",
+    [
+        ("sum", [0.1] * 10, 1.0),
+        ("sum", [1e100, 1.0, -1e100], 1.0),
+        ("mean", [1, 2, 3, 4], 2.5),
+        ("variance", [2, 4, 4, 4, 5, 5, 7, 9], statistics.variance([2, 4, 4, 4, 5, 5, 7, 9])),
+        ("stdev", [2, 4, 4, 4, 5, 5, 7, 9], statistics.stdev([2, 4, 4, 4, 5, 5, 7, 9])),
+        ("min", [3, -1, 2], -1),
+        ("max", [3, -1, 2], 3),
+    ],
+    ids=[
+        "sums without accumulated rounding",
+        "sums without cancellation",
+        "computes the mean",
+        "computes the sample variance",
+        "computes the sample standard deviation",
+        "finds the minimum",
+        "finds the maximum",
+    ],
+)
+def test_aggregates(name, values, expected):
+    """Verify each registered aggregate against a reference result."""
+    assert CalculationFactory.aggregate(name, values) == pytest.approx(expected, rel=1e-15)
+
+
+def test_variance_is_stable_for_large_offsets():
+    """Verify Welford's method keeps precision around a large mean."""
+    values = [1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]
+    assert CalculationFactory.aggregate("variance", values) == 30.0
+
+
+def test_aggregates_consume_any_iterable_once():
+    """Verify generators, arrays and memoryviews are reduced in one pass."""
+    assert CalculationFactory.aggregate("MEAN", (float(x) for x in range(1, 101))) == 50.5
+    data = array("d", [1.5, 2.5, 3.0])
+    assert CalculationFactory.aggregate("sum", data) == 7.0
+    assert CalculationFactory.aggregate("max", memoryview(data)) == 3.0
+
+
+@pytest.mark.parametrize(
+    "name,values,message",
+    [
+        ("mean", [], "mean requires at least 1 value"),
+        ("variance", [1.0], "variance requires at least 2 values"),
+        ("min", [], "min requires at least 1 value"),
+        ("max", [], "max requires at least 1 value"),
+        ("median", [1.0], "Aggregate 'median' is not registered"),
+    ],
+    ids=[
+        "rejects an empty mean",
+        "rejects a variance of one value",
+        "rejects an empty min",
+        "rejects an empty max",
+        "rejects unknown aggregates",
+    ],
+)
+def test_aggregate_errors(name, values, message):
+    """Ensure invalid aggregates raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        CalculationFactory.aggregate(name, values)
+
+
+def test_register_aggregate_rejects_duplicates():
+    """Ensure an aggregate name can only be registered once."""
+    with patch.object(CalculationFactory, "aggregates", CalculationFactory.aggregates):
+        @CalculationFactory.register_aggregate("Count")
+        def count(values):
+            return sum(1 for _ in values)
+
+        assert CalculationFactory.aggregate("count", [5, 6]) == 2
+        with pytest.raises(ValueError, match="already registered"):
+            CalculationFactory.register_aggregate("count")(count)
+
+
+def test_running_stats_updates_incrementally():
+    """Verify every statistic is available while values stream in."""
+    stats = RunningStats([2.0, 4.0])
+    stats.update(9.0)
+    stats.extend(iter([1.0]))
+    assert stats.count == 4
+    assert stats.total == 16.0
+    assert stats.mean == 4.0
+    assert stats.variance == pytest.approx(statistics.variance([2, 4, 9, 1]))
+    assert stats.stdev == pytest.approx(statistics.stdev([2, 4, 9, 1]))
+    assert (stats.minimum, stats.maximum) == (1.0, 9.0)
+
+
+def test_running_stats_compensates_sums():
+    """Verify the compensated total matches a correctly rounded sum."""
+    values = [1.0, 1e100, 1.0, -1e100] * 1000
+    assert RunningStats(values).total == math.fsum(values) == 2000.0
+    assert RunningStats([math.inf, 1.0]).total == math.inf
+
+
+def test_running_sum():
+    """Verify running totals are compensated after every value."""
+    values = [0.1, 1e100, 0.2, -1e100, 0.3]
+    expected = [math.fsum(values[:end]) for end in range(1, len(values) + 1)]
+    assert list(running_sum(values)) == pytest.approx(expected, rel=1e-15)
+    assert not list(running_sum([]))
+
+
+def test_calculator_evaluates_aggregates():
+    """Verify aggregate lines in the REPL, including errors and help."""
+    outputs = []
+    Calculator(
+        input_func=Mock(
+            side_effect=['mean 1 2 3 4', 'sum 0.1, 0.2, 0.3', 'min', 'max 1 x', 'help', 'exit']
+        ),
+        output_func=outputs.append,
+    ).run()
+    assert 'mean of 4 values = 2.5' in outputs
+    assert 'sum of 3 values = 0.6' in outputs
+    assert 'Error: min requires at least 1 value.' in outputs
+    assert 'Error: Operands must be numbers. Got 1 x' in outputs
+    assert '  stdev      - e.g. stdev 1 2 3 4' in outputs
+
+
+def test_calculator_streams_aggregates():
+    """Verify aggregate lines are evaluated in stream mode."""
+    written = []
+    Calculator().stream(["stdev 2 4 4 4 5 5 7 9", "add 1 2"], written.append)
+    assert written == [
+        f"stdev of 8 values = {statistics.stdev([2, 4, 4, 4, 5, 5, 7, 9])}\n"
+        "1.0 add 2.0 = 3.0\n"
+    ]
+
+
+def test_main_aggregates_stdin():
+    """Verify --aggregate reduces whitespace-separated numbers from stdin."""
+    with patch('sys.stdin', new=StringIO("1 2\n3\n\n4 5 6\n")):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--aggregate', 'Max']) == 0
+            assert fake_out.getvalue() == "max = 6.0\n"
+
+
+def test_main_aggregates_file(tmp_path):
+    """Verify --aggregate reads numbers from an input file."""
+    values = tmp_path / "values.txt"
+    values.write_text("\n".join(["0.1"] * 10) + "\n", encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main([str(values), '--aggregate', 'sum']) == 0
+        assert main(
+            [str(values), '--aggregate', 'mean', '--format', 'fixed', '--precision', '2']
+        ) == 0
+        assert fake_out.getvalue() == "sum = 1.0\nmean = 0.10\n"
+
+
+def test_main_aggregate_errors():
+    """Ensure bad input and unknown aggregates fail with an error."""
+    with patch('sys.stdin', new=StringIO("1 two\n")):
+        with patch('sys.stderr', new=StringIO()) as fake_err:
+            assert main(['--aggregate', 'sum']) == 1
+            assert fake_err.getvalue() == "Error: Operands must be numbers. Got 'two'\n"
+    with patch('sys.stderr', new=StringIO()):
+        with pytest.raises(SystemExit) as excinfo:
+            main(['--aggregate', 'median'])
+    assert excinfo.value.code == 2
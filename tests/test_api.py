@@ -0,0 +1,144 @@
+"""Tests for the batched JSON-over-HTTP endpoint."""
+
+import json
+import threading
+from http.client import HTTPConnection
+from unittest.mock import patch
+
+import pytest
+
+from app.api import MAX_BODY_BYTES, create_server, evaluate_items, serve_http
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Run the HTTP server on a free localhost port for one test."""
+    server = create_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _post(connection, body, path="/evaluate", headers=None):
+    """POST a raw body and return the status and decoded JSON response."""
+    connection.request("POST", path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_evaluate_items_reports_errors_per_item():
+    """Verify good items succeed while bad items carry their own error."""
+    results = evaluate_items([
+        {"op": "add", "a": 1, "b": 2},
+        {"op": "DIVIDE", "a": 1, "b": 0},
+        {"op": "modulo", "a": 1, "b": 2},
+        {"op": "power", "a": -8, "b": 0.5},
+        {"op": "add", "a": True, "b": 2},
+        {"op": 3, "a": 1, "b": 2},
+        [1, 2],
+        {"op": "multiply", "a": 2.5, "b": 4},
+    ])
+    assert results[0] == {"result": 3.0}
+    assert results[1] == {"error": "Cannot divide by zero."}
+    assert "is not registered" in results[2]["error"]
+    assert results[3] == {
+        "error": "Power of a negative base to a fractional exponent is not real."
+    }
+    assert results[4] == {"error": "Item fields 'a' and 'b' must be numbers."}
+    assert results[5] == {"error": "Item field 'op' must be a string."}
+    assert results[6] == {"error": "Each item must be an object with 'op', 'a' and 'b'."}
+    assert results[7] == {"result": 10.0}
+
+
+def test_evaluate_items_rejects_non_finite_results():
+    """Ensure overflow and NaN become item errors, keeping the response valid JSON."""
+    results = evaluate_items([
+        {"op": "subtract", "a": -1e308, "b": 1e308},
+        {"op": "multiply", "a": 1e308, "b": 10},
+        {"op": "add", "a": float("inf"), "b": float("-inf")},
+        {"op": "add", "a": 1, "b": 1},
+    ])
+    assert results[:3] == [{"error": "Result is not a finite number."}] * 3
+    assert results[3] == {"result": 2.0}
+
+
+def test_endpoint_answers_overflow_with_valid_json(server):
+    """Verify a batch with an overflowing item still returns strict JSON."""
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.request("POST", "/evaluate", body='[{"op": "multiply", "a": 1e308, "b": 10}]')
+    body = connection.getresponse().read()
+    assert json.loads(body, parse_constant=pytest.fail) == {
+        "results": [{"error": "Result is not a finite number."}]
+    }
+    connection.close()
+
+
+def test_endpoint_batches_over_keep_alive(server):
+    """Verify several batches share one persistent connection."""
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    batch = [{"op": "add", "a": n, "b": 1} for n in range(1000)]
+    status, payload = _post(connection, json.dumps(batch))
+    assert status == 200
+    assert payload["results"][999] == {"result": 1000.0}
+    socket = connection.sock
+    status, payload = _post(connection, '[{"op": "divide", "a": 1, "b": 0}]')
+    assert status == 200
+    assert payload == {"results": [{"error": "Cannot divide by zero."}]}
+    assert connection.sock is socket
+    connection.close()
+
+
+@pytest.mark.parametrize(
+    "path,body,headers,expected",
+    [
+        ("/nope", "[]", None, (404, "Not found.")),
+        ("/evaluate", "{not json", None, (400, "Body must be valid JSON.")),
+        ("/evaluate", '{"op": "add"}', None, (400, "Body must be a JSON array of items.")),
+        ("/evaluate", "[]", {"Content-Length": "x"}, (411, "Content-Length is required.")),
+        (
+            "/evaluate",
+            "",
+            {"Content-Length": "-1"},
+            (400, "Content-Length must not be negative."),
+        ),
+        (
+            "/evaluate",
+            "",
+            {"Content-Length": str(MAX_BODY_BYTES + 1)},
+            (413, "Request body too large."),
+        ),
+    ],
+    ids=[
+        "rejects unknown paths",
+        "rejects malformed JSON",
+        "rejects non-array bodies",
+        "requires a content length",
+        "rejects a negative content length",
+        "rejects oversized bodies",
+    ],
+)
+def test_endpoint_rejects_bad_requests(server, path, body, headers, expected):
+    """Ensure malformed requests get an HTTP error with a JSON message."""
+    status, message = expected
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    assert _post(connection, body, path, headers) == (status, {"error": message})
+    connection.close()
+
+
+def test_rejected_requests_close_the_connection(server):
+    """Verify an error sent before the body is read tells the client to close."""
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.request("POST", "/nope", body="[]")
+    response = connection.getresponse()
+    response.read()
+    assert response.getheader("Connection") == "close"
+    connection.close()
+
+
+def test_serve_http_runs_until_interrupted():
+    """Verify serve_http exits cleanly on Ctrl+C."""
+    with patch('app.api.ThreadingHTTPServer.serve_forever', side_effect=KeyboardInterrupt):
+        serve_http("127.0.0.1", 0)
@@ -0,0 +1,214 @@
+"""Tests for the benchmark suite."""
+
+import json
+import runpy
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.benchmark import (
+    ConcurrencyResult,
+    Measurement,
+    MemoryResult,
+    benchmark_cases,
+    compare,
+    format_concurrency,
+    format_memory,
+    format_results,
+    main,
+    measure,
+    run_benchmarks,
+    run_concurrency,
+    run_memory,
+)
+from app.calculation import CalculationFactory
+
+
+def test_measure_reports_throughput_and_percentiles():
+    """Verify a measurement is built from per-batch mean latencies."""
+    calls = []
+    result = measure("noop", lambda: calls.append(None), number=5, repeat=4, ops_per_call=2)
+    assert len(calls) == 20
+    assert result.name == "noop"
+    assert result.ops_per_sec > 0
+    assert result.min_ns <= result.batch_p50_ns <= result.batch_p90_ns <= result.batch_p99_ns
+
+
+def test_measure_rejects_empty_runs():
+    """Ensure a benchmark must run at least once."""
+    with pytest.raises(ValueError, match="must be at least 1"):
+        measure("noop", lambda: None, number=0, repeat=1)
+
+
+def test_benchmark_cases_cover_every_stage():
+    """Verify parse, factory, dispatch, execute and REPL stages are benchmarked."""
+    cases = benchmark_cases()
+    assert {
+        "parse", "create_calculation", "repl_session", "reduce.add",
+        "status.divide", "status.divide_zero",
+    } <= set(cases)
+    for operation in ["add", "subtract", "multiply", "divide", "power"]:
+        assert f"dispatch.{operation}" in cases
+        assert f"execute.{operation}" in cases
+    for func, _ in cases.values():
+        func()
+
+
+def test_run_benchmarks_selects_by_prefix():
+    """Verify --select style filtering runs only matching benchmarks."""
+    results = run_benchmarks(number=10, repeat=2, select="execute.")
+    assert [result.name for result in results] == [
+        "execute.add",
+        "execute.subtract",
+        "execute.multiply",
+        "execute.divide",
+        "execute.power",
+    ]
+    assert "execute.power" in format_results(results)
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Verify only slowdowns past the threshold are reported."""
+    results = [
+        Measurement("fast", 1e6, 100.0, 100.0, 100.0, 100.0),
+        Measurement("slow", 1e6, 130.0, 130.0, 130.0, 130.0),
+        Measurement("new", 1e6, 500.0, 500.0, 500.0, 500.0),
+    ]
+    baseline = {"fast": {"min_ns": 90.0}, "slow": {"min_ns": 100.0}}
+    assert compare(results, baseline, threshold=0.25) == [
+        "slow: best 130.0 ns/op is 30.0% slower than the baseline 100.0 ns/op"
+    ]
+
+
+def test_main_saves_and_compares_baselines(tmp_path):
+    """Verify the command line stores a baseline and then checks against it."""
+    baseline = tmp_path / "bench" / "baseline.json"
+    argv = ['--number', '20', '--repeat', '2', '--select', 'execute.add',
+            '--baseline', str(baseline)]
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(argv + ['--save-baseline']) == 0
+    assert "Saved baseline" in fake_out.getvalue()
+    assert set(json.loads(baseline.read_text(encoding="utf-8"))["execute.add"]) == {
+        "ops_per_sec", "min_ns", "batch_p50_ns", "batch_p90_ns", "batch_p99_ns",
+    }
+
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(argv + ['--threshold', '1000']) == 0
+    assert "No regressions" in fake_out.getvalue()
+
+    baseline.write_text(json.dumps({"execute.add": {"min_ns": 0.001}}), encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(argv) == 1
+    assert "Regressions:" in fake_out.getvalue()
+
+
+def test_main_without_baseline(tmp_path):
+    """Verify a missing baseline is reported without failing."""
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(['--number', '1', '--repeat', '1', '--select', 'parse',
+                     '--baseline', str(tmp_path / "missing.json")]) == 0
+    assert "No baseline" in fake_out.getvalue()
+
+
+def test_module_entry_point(tmp_path):
+    """Verify ``python -m app.benchmark`` runs the suite."""
+    argv = ['app.benchmark', '--number', '1', '--repeat', '1', '--select', 'parse',
+            '--baseline', str(tmp_path / "missing.json")]
+    with patch('sys.argv', argv), patch('sys.stdout', new=StringIO()):
+        with pytest.raises(SystemExit) as excinfo:
+            runpy.run_module('app.benchmark', run_name='__main__')
+    assert excinfo.value.code == 0
+
+
+def test_run_concurrency_reports_speedup_per_thread_count():
+    """Verify each thread count is measured against a churning registry."""
+    results = run_concurrency((1, 2), number=200)
+    assert [result.threads for result in results] == [1, 2]
+    assert results[0].speedup == 1.0
+    assert all(result.ops_per_sec > 0 for result in results)
+    assert "benchmark_scratch" not in CalculationFactory.calculations
+
+
+@pytest.mark.parametrize(
+    "thread_counts,number",
+    [((1,), 0), ((), 10), ((0, 2), 10)],
+    ids=["rejects zero operations", "rejects no thread counts", "rejects zero threads"],
+)
+def test_run_concurrency_rejects_empty_runs(thread_counts, number):
+    """Ensure the concurrency benchmark needs threads and operations."""
+    with pytest.raises(ValueError, match="must be at least 1"):
+        run_concurrency(thread_counts, number)
+
+
+def test_run_concurrency_surfaces_reader_errors():
+    """Ensure a failing reader fails the benchmark instead of inflating it."""
+    failing = {"add": Mock(side_effect=RuntimeError("reader failed"))}
+    with patch.object(CalculationFactory, "dispatch", failing), \
+            patch('app.benchmark._OPERATIONS', {"add": None}):
+        with pytest.raises(RuntimeError, match="reader failed"):
+            run_concurrency((1,), number=5)
+
+
+@pytest.mark.parametrize(
+    "gil_enabled,noted",
+    [(True, True), (False, False)],
+    ids=["notes the GIL", "omits the note on free-threaded builds"],
+)
+def test_format_concurrency(gil_enabled, noted):
+    """Verify the concurrency table and the GIL note."""
+    results = [ConcurrencyResult(1, 1000.0, 1.0, 3), ConcurrencyResult(4, 3500.0, 3.5, 2)]
+    with patch('sys._is_gil_enabled', new=lambda: gil_enabled, create=True):
+        table = format_concurrency(results)
+    assert "3.50x" in table
+    assert ("GIL is enabled" in table) is noted
+
+
+def test_main_runs_concurrency_benchmark():
+    """Verify --threads runs the concurrency benchmark instead of the suite."""
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(['--number', '50', '--threads', '1,2']) == 0
+    assert "speedup" in fake_out.getvalue()
+
+
+@pytest.mark.parametrize("value", ["", "two", "0,1"], ids=["empty", "not a number", "zero"])
+def test_main_rejects_bad_thread_counts(value):
+    """Ensure --threads only accepts positive counts."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(['--threads', value])
+    assert "invalid thread counts" in fake_err.getvalue()
+
+
+def test_run_memory_compares_instances_with_batches():
+    """Verify a batch holds pending calculations in far less memory."""
+    results = run_memory(20000)
+    assert [result.name for result in results] == ["instances", "batch"]
+    instances, batch = results[0], results[1]
+    assert batch.count == instances.count == 20000
+    assert batch.bytes_per_calculation < instances.bytes_per_calculation / 2
+    assert batch.ns_per_calculation > 0
+
+
+def test_run_memory_rejects_empty_runs():
+    """Ensure the memory benchmark needs at least one calculation."""
+    with pytest.raises(ValueError, match="must be at least 1"):
+        run_memory(0)
+
+
+def test_main_runs_memory_benchmark():
+    """Verify --memory prints the memory comparison instead of the suite."""
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main(['--memory', '100']) == 0
+    output = fake_out.getvalue()
+    assert "bytes/calc" in output and "batch" in output
+    assert format_memory([MemoryResult("batch", 10, 16.0, 50.0)]).endswith(
+        "batch              10        16.0      50.0"
+    )
+
+
+def test_benchmark_cases_cover_output():
+    """Verify number formats and output sinks are benchmarked."""
+    cases = benchmark_cases()
+    assert {"format.repr", "format.fixed", "format.compact"} <= set(cases)
+    assert cases["output.print"][1] == cases["output.sink"][1]
@@ -0,0 +1,318 @@
+"""Tests for the memoizing result cache."""
+
+import math
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.cache import PersistentCache, ResultCache
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.power import DEFAULT_ENGINE
+
+
+def test_cache_hits_repeated_calculations():
+    """Verify repeated triples are served from the cache."""
+    cache = ResultCache(capacity=4)
+    assert cache.evaluate("add", 2.0, 3.0) == 5.0
+    with patch.object(CalculationFactory, 'evaluate') as evaluate:
+        assert cache.evaluate("add", 2.0, 3.0) == 5.0
+        evaluate.assert_not_called()
+    assert cache.stats() == {
+        "capacity": 4,
+        "size": 1,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cache_evicts_least_recently_used():
+    """Verify the least recently used entry is evicted at capacity."""
+    cache = ResultCache(capacity=2)
+    cache.evaluate("add", 1.0, 1.0)
+    cache.evaluate("add", 2.0, 2.0)
+    cache.evaluate("add", 1.0, 1.0)
+    cache.evaluate("add", 3.0, 3.0)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.evaluate("add", 1.0, 1.0)
+    assert cache.hits == 2
+    cache.evaluate("add", 2.0, 2.0)
+    assert cache.misses == 4
+
+
+def test_cache_does_not_store_errors():
+    """Ensure failed calculations are raised every time and never cached."""
+    cache = ResultCache()
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+            cache.evaluate("divide", 1.0, 0.0)
+    assert len(cache) == 0
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (-0.0, -0.0, "-0.0"),
+        (0.0, 0.0, "0.0"),
+        (float("nan"), 1.0, "nan"),
+    ],
+    ids=[
+        "keeps the sign of negative zero",
+        "keeps the sign of positive zero",
+        "evaluates NaN operands",
+    ],
+)
+def test_cache_bypasses_ambiguous_operands(a, b, expected):
+    """Verify zero and NaN operands are computed rather than cached."""
+    cache = ResultCache()
+    cache.evaluate("add", -0.0, -0.0)
+    assert str(cache.evaluate("add", a, b)) == expected
+    assert len(cache) == 0
+
+
+def test_cache_clear_resets_counters():
+    """Verify clear drops entries and resets statistics."""
+    cache = ResultCache()
+    cache.evaluate("multiply", 2.0, 3.0)
+    cache.clear()
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["misses"] == 0
+    assert cache.stats()["hit_rate"] == 0.0
+
+
+def test_cache_rejects_invalid_capacity():
+    """Ensure the cache capacity must be positive."""
+    with pytest.raises(ValueError, match="Cache capacity must be at least 1"):
+        ResultCache(capacity=0)
+
+
+def test_calculator_uses_cache():
+    """Verify the calculator routes evaluations through its cache."""
+    cache = ResultCache()
+    outputs = []
+    calc = Calculator(
+        input_func=Mock(side_effect=['add 1 2', 'ADD 1 2', 'exit']),
+        output_func=outputs.append,
+        cache=cache,
+    )
+    calc.run()
+    assert '1.0 add 2.0 = 3.0' in outputs
+    assert '1.0 ADD 2.0 = 3.0' in outputs
+    assert cache.hits == 1
+
+
+@pytest.fixture(name="cache_path")
+def fixture_cache_path(tmp_path):
+    """Path for a fresh persistent cache database."""
+    return str(tmp_path / "results.db")
+
+
+def test_persistent_cache_survives_restarts(cache_path):
+    """Verify results stored by one cache instance are reused by the next."""
+    with PersistentCache(cache_path) as cache:
+        assert cache.evaluate("power", 3.0, 500.0) == 3.0**500
+        assert cache.evaluate("power", 3.0, 500.0) == 3.0**500
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    with PersistentCache(cache_path) as cache:
+        with patch.object(CalculationFactory, 'evaluate') as evaluate:
+            assert cache.evaluate("power", 3.0, 500.0) == 3.0**500
+            evaluate.assert_not_called()
+        assert len(cache) == 1
+
+
+def test_persistent_cache_buffers_writes(cache_path):
+    """Verify results are written in batches but visible to their writer."""
+    with PersistentCache(cache_path, write_batch=3) as writer, \
+            PersistentCache(cache_path) as reader:
+        writer.evaluate("add", 1.0, 2.0)
+        writer.evaluate("add", 2.0, 2.0)
+        assert writer.evaluate("add", 1.0, 2.0) == 3.0
+        assert writer.hits == 1
+        assert not reader.get_many([("add", 1.0, 2.0)])
+        assert writer.get_many([("add", 2.0, 2.0)]) == {("add", 2.0, 2.0): 4.0}
+        writer.evaluate("add", 3.0, 2.0)
+        assert reader.get_many([("add", 1.0, 2.0)]) == {("add", 1.0, 2.0): 3.0}
+
+
+def test_persistent_cache_uses_wal_so_readers_are_not_blocked(cache_path):
+    """Verify a reader still answers while another connection is writing."""
+    with PersistentCache(cache_path) as writer, PersistentCache(cache_path) as reader:
+        writer.put_many([(("add", 1.0, 1.0), 2.0)])
+        journal_mode, = reader._connection.execute(  # pylint: disable=protected-access
+            "PRAGMA journal_mode"
+        ).fetchone()
+        assert journal_mode == "wal"
+
+        connection = writer._connection  # pylint: disable=protected-access
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(
+            "INSERT INTO results VALUES ('add', 5.0, 5.0, 10.0, 0.0)"
+        )
+        assert reader.evaluate("add", 1.0, 1.0) == 2.0
+        assert reader.hits == 1
+        connection.rollback()
+
+
+def test_persistent_cache_skips_uncacheable_results(cache_path):
+    """Ensure errors, complex results and zero or NaN operands are not stored."""
+    with PersistentCache(cache_path, write_batch=1) as cache:
+        with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+            cache.evaluate("divide", 1.0, 0.0)
+        assert str(cache.evaluate("add", -0.0, -0.0)) == "-0.0"
+        with patch.object(DEFAULT_ENGINE, "allow_complex", True):
+            assert isinstance(cache.evaluate("power", -8.0, 0.5), complex)
+        assert str(cache.evaluate("add", float("nan"), 1.0)) == "nan"
+        assert len(cache) == 0
+        assert cache.misses == 4
+
+
+def test_persistent_cache_skips_nan_results(cache_path):
+    """Ensure a NaN result from float operands is returned but never stored."""
+    inf = float("inf")
+    with PersistentCache(cache_path, write_batch=1) as cache:
+        assert math.isnan(cache.evaluate("add", inf, -inf))
+        assert math.isnan(cache.execute_batch("subtract", [inf], [inf])[0])
+        cache.put_many([(("add", 1.0, 1.0), float("nan")), (("add", 2.0, 2.0), 4.0)])
+        assert cache.evaluate("add", 1.0, 2.0) == 3.0
+        assert len(cache) == 2
+
+
+def test_persistent_cache_flush_drops_rejected_rows(cache_path):
+    """Verify a row the database rejects is dropped instead of blocking later flushes."""
+    with PersistentCache(cache_path, write_batch=10) as cache:
+        cache.evaluate("add", 1.0, 2.0)
+        cache._pending[("add", 5.0, 5.0)] = None  # pylint: disable=protected-access
+        cache.evaluate("add", 3.0, 2.0)
+        cache.flush()
+        cache.evaluate("add", 4.0, 2.0)
+        cache.flush()
+        assert sorted(cache.get_many([("add", a, 2.0) for a in (1.0, 3.0, 4.0)]).values()) == [
+            3.0, 5.0, 6.0,
+        ]
+        assert len(cache) == 3
+
+
+def test_persistent_cache_skips_exact_operands(cache_path):
+    """Ensure exact operands never read or write float entries."""
+    with PersistentCache(cache_path, write_batch=1) as cache:
+        assert cache.evaluate("add", 1.0, 2.0) == 3.0
+        result = cache.evaluate("add", 1, 2)
+        assert isinstance(result, int)
+        assert isinstance(cache.evaluate("add", Decimal(1), Decimal(2)), Decimal)
+        assert (len(cache), cache.hits, cache.misses) == (1, 0, 3)
+
+
+def test_persistent_cache_expires_entries(cache_path):
+    """Verify entries older than the TTL are ignored and then purged."""
+    with patch('app.cache.time.time', return_value=1000.0):
+        with PersistentCache(cache_path, ttl=60, write_batch=1) as cache:
+            cache.evaluate("add", 1.0, 2.0)
+    with patch('app.cache.time.time', return_value=1059.0):
+        with PersistentCache(cache_path, ttl=60) as cache:
+            cache.evaluate("add", 1.0, 2.0)
+            assert cache.hits == 1
+    with patch('app.cache.time.time', return_value=1061.0):
+        with PersistentCache(cache_path, ttl=60) as cache:
+            assert len(cache) == 0
+            assert not cache.get_many([("add", 1.0, 2.0)])
+            cache.evaluate("add", 1.0, 2.0)
+            assert cache.misses == 1
+            cache.evaluate("add", 5.0, 2.0)
+            cache.purge()
+            assert cache.evictions == 1
+    with patch('app.cache.time.time', return_value=1200.0):
+        with PersistentCache(cache_path, ttl=60) as cache:
+            cache.purge()
+            assert cache.evictions == 2
+
+
+def test_persistent_cache_evicts_oldest_beyond_capacity(cache_path):
+    """Verify size-based eviction keeps the newest entries."""
+    with PersistentCache(cache_path, capacity=3, write_batch=1) as cache:
+        for a in (1.0, 2.0, 3.0, 4.0, 5.0):
+            cache.evaluate("add", a, 1.0)
+        assert len(cache) == 3
+        assert cache.evictions == 2
+        assert sorted(cache.get_many([("add", a, 1.0) for a in (1.0, 2.0, 3.0, 4.0, 5.0)])) == [
+            ("add", 3.0, 1.0), ("add", 4.0, 1.0), ("add", 5.0, 1.0),
+        ]
+
+
+def test_persistent_cache_bulk_batch(cache_path):
+    """Verify batches compute only rows that are not already stored."""
+    a_values = [float(value) for value in range(1, 701)]
+    with PersistentCache(cache_path) as cache:
+        first = cache.execute_batch("multiply", a_values, [3.0] * 700)
+        assert cache.misses == 700
+        assert len(cache) == 700
+
+    with PersistentCache(cache_path) as cache:
+        with patch.object(CalculationFactory, 'execute_batch') as execute_batch:
+            assert cache.execute_batch("MULTIPLY", a_values, [3.0] * 700) == first
+            execute_batch.assert_not_called()
+        results = cache.execute_batch(["multiply", "add", "add"], [1.0, 0.0, 2.0], [3.0, 4.0, 5.0])
+        assert list(results) == [3.0, 4.0, 7.0]
+        assert (cache.hits, cache.misses) == (701, 2)
+        assert len(cache) == 701
+
+
+@pytest.mark.parametrize(
+    "operations,a_values,b_values,expected",
+    [
+        ("add", [1.0, 2.0], [1.0], (ValueError, "same length")),
+        (["add"], [1.0, 2.0], [1.0, 2.0], (ValueError, "same length")),
+        ("divide", [1.0, 2.0], [1.0, 0.0], (ZeroDivisionError, "Cannot divide by zero")),
+    ],
+    ids=[
+        "rejects mismatched operand columns",
+        "rejects mismatched operation column",
+        "raises batch errors without storing anything",
+    ],
+)
+def test_persistent_cache_batch_errors(cache_path, operations, a_values, b_values, expected):
+    """Ensure invalid batches raise the same errors as the factory."""
+    error, match = expected
+    with PersistentCache(cache_path) as cache:
+        with pytest.raises(error, match=match):
+            cache.execute_batch(operations, a_values, b_values)
+        assert len(cache) == 0
+
+
+def test_persistent_cache_clear_and_stats(cache_path):
+    """Verify clear drops stored results and resets the counters."""
+    with PersistentCache(cache_path, capacity=10) as cache:
+        cache.evaluate("add", 1.0, 2.0)
+        cache.evaluate("add", 1.0, 2.0)
+        assert cache.stats() == {
+            "capacity": 10,
+            "size": 1,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "hit_rate": 0.5,
+        }
+        cache.clear()
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["hit_rate"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "options,message",
+    [
+        ({"capacity": 0}, "Cache capacity must be at least 1"),
+        ({"ttl": 0}, "Cache TTL must be positive"),
+        ({"write_batch": 0}, "Cache write batch must be at least 1"),
+    ],
+    ids=["rejects a zero capacity", "rejects a zero TTL", "rejects a zero write batch"],
+)
+def test_persistent_cache_rejects_invalid_options(cache_path, options, message):
+    """Ensure invalid persistent cache options raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        PersistentCache(cache_path, **options)
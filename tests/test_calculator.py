@@ -48,14 +48,18 @@ def test_calculator_basic_operations(user_input, expected):
         ("invalid 1 2", "Error: Unknown operation 'invalid'"),
         ("add 1 abc", "Error: Operands must be numbers"),
         ("add 1", "Error: Invalid format"),
-        ("add 1 2 3", "Error: Invalid format"),
+        ("add 1 2 x", "Error: Operands must be numbers. Got 1 2 x"),
+        ("invalid 1 2 3", "Error: Unknown operation 'invalid'"),
+        ("divide 1 2 0", "Error: Cannot divide by zero."),
     ],
     ids=[
         "reports an error for division by zero",
         "reports an error for an unknown operation",
         "reports an error for non-numeric operands",
         "reports an error for too few arguments",
-        "reports an error for too many arguments",
+        "reports an error for non-numeric n-ary operands",
+        "reports an error for an unknown n-ary operation",
+        "reports an error for n-ary division by zero",
     ],
 )
 def test_calculator_error_cases(user_input, expected):
@@ -67,6 +71,34 @@ def test_calculator_error_cases(user_input, expected):
             assert expected in output
 
 
+@pytest.mark.parametrize(
+    "user_input,expected",
+    [
+        ("add 1 2 3 4", "1.0 add 2.0 add 3.0 add 4.0 = 10.0"),
+        ("multiply 2 3 4", "2.0 multiply 3.0 multiply 4.0 = 24.0"),
+        ("subtract 10 1 2", "10.0 subtract 1.0 subtract 2.0 = 7.0"),
+        ("DIVIDE 24 2 3", "24.0 DIVIDE 2.0 DIVIDE 3.0 = 4.0"),
+        ("power 2 3 2", "2.0 power 3.0 power 2.0 = 64.0"),
+    ],
+    ids=[
+        "adds many operands",
+        "multiplies many operands",
+        "subtracts left to right",
+        "divides left to right, keeping the typed name",
+        "raises to powers left to right",
+    ],
+)
+def test_calculator_n_ary_operations(user_input, expected):
+    """Verify operations accept more than two operands in the REPL and streams."""
+    outputs = []
+    calc = Calculator(input_func=Mock(side_effect=[user_input, 'exit']), output_func=outputs.append)
+    calc.run()
+    assert expected in outputs
+    writes = []
+    calc.stream([user_input], writes.append)
+    assert writes == [expected + "\n"]
+
+
 def test_calculator_exit_command():
     """Verify the exit command stops the REPL."""
     # Ensure a single exit command terminates the REPL.
@@ -99,6 +131,26 @@ def test_calculator_keyboard_interrupt():
             assert 'Goodbye!' in output
 
 
+def test_calculator_input_failure_recovery():
+    """Confirm a failing input source is reported and the loop continues."""
+    with patch('builtins.input', side_effect=[OSError("input closed"), 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            Calculator().run()
+            output = fake_out.getvalue()
+            assert 'Unexpected error: input closed' in output
+            assert 'Goodbye!' in output
+
+
+def test_calculator_process_single_lines():
+    """Verify process() handles one line and reports when to stop."""
+    outputs = []
+    calc = Calculator(output_func=outputs.append)
+    assert calc.process('  add 2 2\n')
+    assert calc.process('')
+    assert not calc.process('EXIT')
+    assert outputs == ['2.0 add 2.0 = 4.0', 'Goodbye!']
+
+
 def test_calculator_error_recovery():
     """Confirm the loop continues after a bad command."""
     # Ensure the REPL continues after a bad command.
@@ -116,13 +168,9 @@ def test_calculator_unexpected_exception():
     # Ensure unexpected errors are surfaced without crashing the loop.
     with patch('builtins.input', side_effect=['add 1 1', 'exit']):
         with patch('sys.stdout', new=StringIO()) as fake_out:
-            # Mock the factory to return a calculation that raises unexpectedly.
-            mock_calc = Mock()
-            mock_calc.execute.side_effect = RuntimeError("Unexpected error")
-            with patch(
-                'app.calculator.CalculationFactory.create_calculation',
-                return_value=mock_calc,
-            ):
+            # Mock the dispatch table with an operation that raises unexpectedly.
+            failing = Mock(side_effect=RuntimeError("Unexpected error"))
+            with patch.object(CalculationFactory, 'dispatch', {'add': failing}):
                 Calculator().run()
                 output = fake_out.getvalue()
                 assert "Unexpected error" in output
@@ -236,3 +284,94 @@ def test_calculator_mixed_session():
             # Verify history (should only have 2 entries when history was called)
             assert '2 entries' in output
             assert 'Goodbye!' in output
+
+
+def test_calculator_stream_evaluates_jobs():
+    """Verify stream mode evaluates lines without prompts or banners."""
+    writes = []
+    calc = Calculator()
+    calc.stream(
+        ["add 1 2\n", "\n", "divide 1 0\n", "bogus\n", "power 2 3\n"],
+        writes.append,
+    )
+    assert writes == [
+        "1.0 add 2.0 = 3.0\n"
+        "Error: Cannot divide by zero.\n"
+        "Error: Invalid format. Please provide: operation operand1 operand2\n"
+        "2.0 power 3.0 = 8.0\n"
+    ]
+    assert not calc.history
+
+
+def test_calculator_stream_writes_in_chunks():
+    """Verify stream mode writes one buffered block per chunk."""
+    writes = []
+    Calculator().stream((f"add {n} 1" for n in range(5)), writes.append, chunk_size=2)
+    assert len(writes) == 3
+    assert writes[-1] == "4.0 add 1.0 = 5.0\n"
+
+
+def test_calculator_stream_reports_unexpected_errors():
+    """Verify stream mode reports unexpected errors and keeps going."""
+    writes = []
+    with patch.object(Calculator, '_execute', side_effect=RuntimeError("boom")):
+        Calculator().stream(["add 1 1"], writes.append)
+    assert writes == ["Unexpected error: boom\n"]
+
+
+def test_calculator_stream_rejects_invalid_chunk_size():
+    """Ensure stream mode requires a positive chunk size."""
+    with pytest.raises(ValueError, match="Chunk size must be at least 1"):
+        Calculator().stream([], print, chunk_size=0)
+
+
+@pytest.mark.parametrize(
+    "user_input,expected",
+    [
+        ("divide 2 3", "2.000 divide 3.000 = 0.667"),
+        ("mean 1 2", "mean of 2 values = 1.500"),
+        ("(1 + 2) / 3", "(1 + 2) / 3 = 1.000"),
+        ("add 1 2 3", "1.000 add 2.000 add 3.000 = 6.000"),
+        ("a = 2", "a = 2.000"),
+    ],
+    ids=[
+        "formats binary calculations",
+        "formats aggregates",
+        "formats expressions",
+        "formats reductions",
+        "formats assignments",
+    ],
+)
+def test_calculator_number_format(user_input, expected):
+    """Verify every kind of result goes through the number format."""
+    outputs = []
+    calc = Calculator(
+        input_func=Mock(side_effect=[user_input, 'exit']),
+        output_func=outputs.append,
+        number_format="{:.3f}".format,
+    )
+    calc.run()
+    assert expected in outputs
+    writes = []
+    calc.stream([user_input], writes.append)
+    assert writes == [expected + "\n"]
+
+
+def test_calculator_number_format_for_variables():
+    """Verify variable lookups and listings use the number format."""
+    outputs = []
+    script = ['a = 2', 'b = divide a 0', 'a', 'vars', 'exit']
+    Calculator(
+        input_func=Mock(side_effect=script),
+        output_func=outputs.append,
+        number_format="{:.1f}".format,
+    ).run()
+    assert outputs.count("a = 2.0") == 3
+    assert "b = divide a 0.0 = Error: Cannot divide by zero." in outputs
+
+
+def test_calculator_ends_at_end_of_input():
+    """Ensure end of input ends the session instead of looping on errors."""
+    outputs = []
+    Calculator(input_func=Mock(side_effect=EOFError), output_func=outputs.append).run()
+    assert outputs[-1] == "\n\nGoodbye!"
@@ -0,0 +1,345 @@
+"""Tests for the command-line entry point."""
+
+import math
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+import pytest
+
+from app.cache import PersistentCache
+from app.calculator import Calculator
+from app.cli import main
+from app.records import STATUS_DIVIDE_BY_ZERO, STATUS_OK, pack_jobs, unpack_results
+
+
+def test_main_runs_repl_by_default():
+    """Verify the REPL starts when no options are given."""
+    with patch('builtins.input', side_effect=['add 1 1', 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main([]) == 0
+            output = fake_out.getvalue()
+            assert 'Welcome to the Calculator REPL!' in output
+            assert '1.0 add 1.0 = 2.0' in output
+
+
+def test_main_streams_stdin():
+    """Verify --stream evaluates jobs from stdin without the banner."""
+    with patch('sys.stdin', new=StringIO("add 1 1\nmultiply 2 3\n")):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--stream']) == 0
+            assert fake_out.getvalue() == "1.0 add 1.0 = 2.0\n2.0 multiply 3.0 = 6.0\n"
+
+
+def test_main_streams_file(tmp_path):
+    """Verify a job file argument is streamed to stdout."""
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("subtract 5 3\ndivide 1 0\n", encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main([str(jobs), '--chunk-size', '1']) == 0
+        assert fake_out.getvalue() == (
+            "5.0 subtract 3.0 = 2.0\nError: Cannot divide by zero.\n"
+        )
+
+
+def test_main_rejects_invalid_chunk_size():
+    """Ensure a non-positive chunk size is a usage error."""
+    with patch('sys.stderr', new=StringIO()):
+        with pytest.raises(SystemExit) as excinfo:
+            main(['--stream', '--chunk-size', '0'])
+    assert excinfo.value.code == 2
+
+
+def test_main_runs_sharded_workers(tmp_path):
+    """Verify --workers evaluates the input file across processes."""
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("add 1 1\ndivide 1 0\npower 2 3\n", encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main([str(jobs), '--workers', '2']) == 0
+        assert fake_out.getvalue() == (
+            "1.0 add 1.0 = 2.0\nError: Cannot divide by zero.\n2.0 power 3.0 = 8.0\n"
+        )
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (['--stream', '--workers', '0'], "--workers must be at least 1"),
+        (['--workers', '2'], "--workers requires an input file"),
+    ],
+    ids=[
+        "rejects a non-positive worker count",
+        "requires a file for multiple workers",
+    ],
+)
+def test_main_rejects_invalid_workers(argv, message):
+    """Ensure invalid worker options are usage errors."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+    assert excinfo.value.code == 2
+    assert message in fake_err.getvalue()
+
+
+def test_main_enables_result_cache():
+    """Verify --cache-size puts a result cache in front of evaluation."""
+    with patch('sys.stdin', new=StringIO("power 2 8\npower 2 8\n")):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            with patch('app.cli.Calculator', wraps=Calculator) as calculator:
+                assert main(['--stream', '--cache-size', '16']) == 0
+            cache = calculator.call_args.kwargs['cache']
+            assert cache.capacity == 16
+            assert cache.hits == 1
+            assert fake_out.getvalue().count("= 256.0") == 2
+
+
+def test_main_workers_use_result_cache(tmp_path):
+    """Verify --cache-size gives each worker shard a result cache."""
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("power 2 8\npower 2 8\n", encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        with patch('app.cli.run_sharded') as run_sharded:
+            assert main([str(jobs), '--workers', '2', '--cache-size', '16']) == 0
+        assert run_sharded.call_args.args[3].cache_size == 16
+        assert main([str(jobs), '--workers', '2', '--cache-size', '16']) == 0
+    assert fake_out.getvalue().count("= 256.0") == 2
+
+
+def test_main_rejects_negative_cache_size():
+    """Ensure a negative cache size is a usage error."""
+    with patch('sys.stderr', new=StringIO()):
+        with pytest.raises(SystemExit):
+            main(['--cache-size', '-1'])
+
+
+def test_main_persistent_cache(tmp_path):
+    """Verify --cache-file shares results across runs and worker processes."""
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("power 3 500\nadd 1 2\n", encoding="utf-8")
+    cache_file = str(tmp_path / "results.db")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main([str(jobs), '--cache-file', cache_file, '--cache-ttl', '60']) == 0
+        assert main([str(jobs), '--workers', '2', '--cache-file', cache_file]) == 0
+    assert fake_out.getvalue().count("1.0 add 2.0 = 3.0") == 2
+    with PersistentCache(cache_file) as cache:
+        assert len(cache) == 2
+
+    with patch('builtins.input', side_effect=['add 1 2', 'exit']):
+        with patch('sys.stdout', new=StringIO()):
+            with patch('app.cli.Calculator', wraps=Calculator) as calculator:
+                assert main(['--cache-file', cache_file]) == 0
+    assert calculator.call_args.kwargs['cache'].hits == 1
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (['--cache-file', 'x.db', '--cache-size', '4'], "cannot be combined"),
+        (['--cache-file', 'x.db', '--cache-ttl', '0'], "--cache-ttl must be positive"),
+    ],
+    ids=["rejects two caches", "rejects a non-positive TTL"],
+)
+def test_main_rejects_invalid_persistent_cache(argv, message):
+    """Ensure invalid persistent cache options are usage errors."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert message in fake_err.getvalue()
+
+
+def test_main_configures_history(tmp_path):
+    """Verify the history options reach the REPL calculator."""
+    spill_path = str(tmp_path / "spill.txt")
+    with patch('app.cli.Calculator') as calculator:
+        assert main(['--history-size', '8', '--history-spill', spill_path]) == 0
+    history = calculator.call_args.kwargs['history']
+    assert history.capacity == 8
+    assert history.spill_path == spill_path
+    calculator.return_value.run.assert_called_once_with()
+
+
+def test_main_rejects_invalid_history_size():
+    """Ensure a non-positive history size is a usage error."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(['--history-size', '0'])
+    assert "--history-size must be at least 1" in fake_err.getvalue()
+
+
+def test_main_uses_persistent_history(tmp_path):
+    """Verify --history-file keeps the REPL history across runs."""
+    path = str(tmp_path / "history.bin")
+    with patch('builtins.input', side_effect=['add 2 3', 'exit']):
+        with patch('sys.stdout', new=StringIO()):
+            assert main(['--history-file', path]) == 0
+    with patch('builtins.input', side_effect=['history', 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--history-file', path]) == 0
+    assert '1. 2.0 add 3.0 = 5.0' in fake_out.getvalue()
+
+
+def test_main_serves_over_tcp():
+    """Verify --serve starts the server with the configured limits."""
+    with patch('app.cli.serve') as serve:
+        assert main(['--serve', '7000', '--max-connections', '5', '--idle-timeout', '2']) == 0
+    serve.assert_called_once_with(
+        "127.0.0.1", 7000, max_connections=5, idle_timeout=2.0, history_size=1000
+    )
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (['--serve', '0', '--max-connections', '0'], "--max-connections must be at least 1"),
+        (['--serve', '0', '--idle-timeout', '0'], "--idle-timeout must be positive"),
+    ],
+    ids=["rejects a zero connection limit", "rejects a zero idle timeout"],
+)
+def test_main_rejects_invalid_server_options(argv, message):
+    """Ensure invalid server limits are usage errors."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert message in fake_err.getvalue()
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (['--serve', '0', '--cache-size', '8'], "--cache-size cannot be combined with --serve"),
+        (['--http', '0', '--metrics'], "--metrics cannot be combined with --http"),
+        (['--binary', '--cache-file', 'x.db'], "--cache-file cannot be combined with --binary"),
+        (['--aggregate', 'mean', '--metrics'], "--metrics cannot be combined with --aggregate"),
+        (['jobs.txt', '--workers', '2', '--metrics-file', 'm.prom'],
+         "--metrics-file cannot be combined with --workers"),
+    ],
+    ids=[
+        "rejects a cache for server sessions",
+        "rejects metrics for the HTTP endpoint",
+        "rejects a cache for binary records",
+        "rejects metrics for aggregates",
+        "rejects metrics across worker processes",
+    ],
+)
+def test_main_rejects_ignored_cache_and_metrics_options(argv, message):
+    """Ensure modes that cannot apply cache or metrics options reject them."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert message in fake_err.getvalue()
+
+
+def test_main_serves_http():
+    """Verify --http starts the JSON endpoint on the configured address."""
+    with patch('app.cli.serve_http') as serve_http:
+        assert main(['--http', '8080', '--host', '0.0.0.0']) == 0
+    serve_http.assert_called_once_with("0.0.0.0", 8080)
+
+
+def test_main_writes_metrics_file(tmp_path):
+    """Verify --metrics-file dumps Prometheus metrics after a stream run."""
+    path = tmp_path / "metrics.prom"
+    with patch('sys.stdin', new=StringIO("add 1 2\ndivide 1 0\n")):
+        with patch('sys.stdout', new=StringIO()):
+            assert main(['--stream', '--metrics-file', str(path)]) == 0
+    dump = path.read_text(encoding="utf-8")
+    assert 'calculator_calculations_total{operation="add"} 1' in dump
+    assert 'calculator_errors_total{operation="divide",error="ZeroDivisionError"} 1' in dump
+
+
+def test_main_repl_metrics(tmp_path):
+    """Verify --metrics enables the stats command in the REPL."""
+    path = tmp_path / "metrics.prom"
+    with patch('builtins.input', side_effect=['add 1 2', 'stats', 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--metrics', '--metrics-file', str(path)]) == 0
+    assert '=== Operation Metrics ===' in fake_out.getvalue()
+    assert 'operation="add"' in path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("from_file", [True, False], ids=["reads a file", "reads stdin"])
+def test_main_binary_records(tmp_path, from_file):
+    """Verify --binary evaluates packed jobs to packed results on stdout."""
+    jobs = pack_jobs([("add", 1, 2), ("divide", 1, 0)])
+    path = tmp_path / "jobs.bin"
+    path.write_bytes(jobs)
+    argv = ['--binary', str(path)] if from_file else ['--binary']
+    output = BytesIO()
+    with patch('sys.stdin') as stdin, patch('sys.stdout') as stdout:
+        stdin.buffer = BytesIO(jobs)
+        stdout.buffer = output
+        assert main(argv) == 0
+    results = unpack_results(output.getvalue())
+    assert results[0] == (STATUS_OK, 3.0)
+    assert results[1] == (STATUS_DIVIDE_BY_ZERO, math.inf)
+
+
+def test_main_formats_numbers():
+    """Verify --format and --precision apply to stream and REPL output."""
+    with patch('sys.stdin', new=StringIO("divide 2 3\n")):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--stream', '--format', 'fixed', '--precision', '2']) == 0
+    assert fake_out.getvalue() == "2.00 divide 3.00 = 0.67\n"
+
+    with patch('builtins.input', side_effect=['add 1 2', 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--format', 'compact']) == 0
+    assert "1 add 2 = 3\n" in fake_out.getvalue()
+
+
+def test_main_selects_number_backend(tmp_path):
+    """Verify --numbers applies to stream, sharded and REPL calculations."""
+    with patch('sys.stdin', new=StringIO("add 1 2\nadd 0.1 0.2\n")):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--stream', '--numbers', 'auto']) == 0
+    assert fake_out.getvalue() == "1 add 2 = 3\n0.1 add 0.2 = 0.30000000000000004\n"
+
+    jobs = tmp_path / "jobs.txt"
+    jobs.write_text("divide 1 3\n", encoding="utf-8")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        assert main([str(jobs), '--workers', '2', '--numbers', 'fraction']) == 0
+    assert fake_out.getvalue() == "1 divide 3 = 1/3\n"
+
+    with patch('builtins.input', side_effect=['add 0.1 0.2', 'exit']):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            assert main(['--numbers', 'decimal']) == 0
+    assert "0.1 add 0.2 = 0.3\n" in fake_out.getvalue()
+
+
+@pytest.mark.parametrize("interactive", [True, False], ids=["terminal", "piped input"])
+def test_main_repl_buffers_output(interactive):
+    """Verify the REPL flushes at prompts only when stdin is a terminal."""
+    writes = []
+    with patch('builtins.input', side_effect=['add 1 2', 'add 3 4', 'exit']), \
+            patch('sys.stdin') as stdin, patch('sys.stdout') as stdout:
+        stdin.isatty.return_value = interactive
+        stdout.write.side_effect = writes.append
+        assert main(['--flush-interval', '60']) == 0
+    assert "3.0 add 4.0 = 7.0" in "".join(writes)
+    assert len(writes) == (4 if interactive else 1)
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (['--precision', '-1'], "--precision must not be negative"),
+        (['--buffer-size', '-1'], "--buffer-size must not be negative"),
+        (['--flush-interval', '0'], "--flush-interval must be positive"),
+        (['--format', 'roman'], "invalid choice"),
+        (['--numbers', 'complex'], "invalid choice"),
+        (['--numbers', 'fraction', '--format', 'fixed'], "needs --format repr"),
+    ],
+    ids=[
+        "rejects negative precision",
+        "rejects a negative buffer",
+        "rejects a zero flush interval",
+        "rejects unknown formats",
+        "rejects unknown number backends",
+        "rejects formatting fractions",
+    ],
+)
+def test_main_rejects_invalid_output_options(argv, message):
+    """Ensure invalid output options are usage errors."""
+    with patch('sys.stderr', new=StringIO()) as fake_err:
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert message in fake_err.getvalue()
@@ -0,0 +1,129 @@
+"""Tests for the infix expression compiler."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.expression import CompiledExpression, compile_expression
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("(1 + 2) * 3 ^ 2", 27.0),
+        ("10 - 4 - 3", 3.0),
+        ("12 / 3 / 2", 2.0),
+        ("2 ^ 3 ^ 2", 512.0),
+        ("2 ** -1", 0.5),
+        ("-2^2", -4.0),
+        ("+1.5e1 - .5", 14.5),
+        ("POWER(2, 10) / add(1, 3)", 256.0),
+        ("subtract(10, 1, 2 * 3) + multiply(1, 2, 3, 4)", 27.0),
+    ],
+    ids=[
+        "honours parentheses and precedence",
+        "subtracts left to right",
+        "divides left to right",
+        "raises powers right to left",
+        "accepts ** and a signed exponent",
+        "binds power tighter than unary minus",
+        "parses signs, exponents and leading dots",
+        "calls registered operations by name",
+        "folds calls with more than two arguments left to right",
+    ],
+)
+def test_compile_expression_values(source, expected):
+    """Verify expressions evaluate with the usual arithmetic rules."""
+    assert compile_expression(source).evaluate() == expected
+
+
+def test_compile_expression_folds_constants():
+    """Verify constant subexpressions compile to a single value."""
+    compiled = compile_expression("(1 + 2) * 4")
+    assert compiled.code == (12.0,)
+    assert repr(compiled) == "CompiledExpression('(1 + 2) * 4', code=(12.0,))"
+
+
+def test_compile_expression_caches_compiled_form():
+    """Verify repeated expression text skips tokenizing and parsing."""
+    compile_expression.cache_clear()
+    first = compile_expression("7 * 6")
+    second = compile_expression("7 * 6")
+    assert first is second
+    assert compile_expression.cache_info().hits == 1
+
+
+def test_unfoldable_subexpressions_raise_on_evaluation():
+    """Ensure errors in constant parts surface when the expression runs."""
+    compiled = compile_expression("-(1 / 0) + 2")
+    assert compiled.code == (-1.0, 1.0, 0.0, "divide", "multiply", 2.0, "add")
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        compiled.evaluate()
+
+
+def test_compiled_code_runs_through_the_dispatch_table():
+    """Verify the stack machine applies operations in postfix order."""
+    compiled = CompiledExpression("1 - 2 * 3", (1.0, 2.0, 3.0, "multiply", "subtract"))
+    with patch.object(CalculationFactory, 'evaluate', wraps=CalculationFactory.evaluate) as run:
+        assert compiled.evaluate() == -5.0
+    assert run.call_count == 2
+
+
+def test_negation_keeps_the_sign_of_zero():
+    """Verify unary minus on zero yields negative zero."""
+    assert str(compile_expression("-0").evaluate()) == "-0.0"
+
+
+@pytest.mark.parametrize(
+    "source,message",
+    [
+        ("", "nothing to evaluate"),
+        ("1 +", "unexpected end of input"),
+        ("(1 + 2", "unexpected end of input"),
+        ("1 2", "unexpected '2'"),
+        ("3 $ 4", "unexpected '\\$'"),
+        ("* 2", "unexpected '\\*'"),
+        ("modulo(1, 2)", "Unknown operation 'modulo'"),
+        ("add(1 2)", "expected ',' but got '2'"),
+        ("add(1)", "expected ',' but got '\\)'"),
+        ("add(1, 2, 3", "unexpected end of input"),
+    ],
+    ids=[
+        "rejects an empty expression",
+        "rejects a dangling operator",
+        "rejects an unclosed parenthesis",
+        "rejects adjacent numbers",
+        "rejects unknown symbols",
+        "rejects a leading binary operator",
+        "rejects unregistered operations",
+        "rejects malformed calls",
+        "rejects calls with one argument",
+        "rejects unclosed n-ary calls",
+    ],
+)
+def test_compile_expression_errors(source, message):
+    """Ensure malformed expressions raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        compile_expression(source)
+
+
+def test_calculator_evaluates_expressions():
+    """Verify the REPL and stream mode accept expressions next to 'op a b'."""
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=['(1 + 2) * 3', 'add -1 2', '2 / 0', 'exit']),
+        output_func=outputs.append,
+    ).run()
+    assert '(1 + 2) * 3 = 9.0' in outputs
+    assert '-1.0 add 2.0 = 1.0' in outputs
+    assert 'Error: Cannot divide by zero.' in outputs
+
+    writes = []
+    Calculator().stream(["2 ^ 10\n", "add 1 2\n", "invalid 1 2\n"], writes.append)
+    assert writes == [
+        "2 ^ 10 = 1024.0\n"
+        "1.0 add 2.0 = 3.0\n"
+        "Error: Unknown operation 'invalid'\n"
+    ]
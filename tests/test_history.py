@@ -0,0 +1,250 @@
+"""Tests for the bounded calculation history."""
+
+import os
+import tracemalloc
+from fractions import Fraction
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculator import HISTORY_PAGE_SIZE, Calculator
+from app.history import RECORD, History, HistoryLog, format_calculation
+from app.output import number_formatter
+
+
+def test_history_formats_entries_on_read():
+    """Verify entries keep the typed operation spelling and non-float results."""
+    history = History(capacity=4)
+    history.append("add", 1.0, 2.0, 3.0)
+    history.append("ADD", 2.0, 2.0, 4.0)
+    history.append("power", -8.0, 0.5, (-8.0) ** 0.5)
+    assert len(history) == 3
+    assert list(history) == [
+        "1.0 add 2.0 = 3.0",
+        "2.0 ADD 2.0 = 4.0",
+        format_calculation("power", -8.0, 0.5, (-8.0) ** 0.5),
+    ]
+
+
+def test_history_overwrites_oldest_entries():
+    """Verify a full history drops its oldest entries."""
+    history = History(capacity=2)
+    history.append("power", -1.0, 0.5, (-1.0) ** 0.5)
+    for n in range(2, 5):
+        history.append("add", float(n), 0.0, float(n))
+    assert list(history) == ["3.0 add 0.0 = 3.0", "4.0 add 0.0 = 4.0"]
+    assert history.spilled == 0
+
+
+def test_history_spills_to_disk(tmp_path):
+    """Verify overflowing entries are appended to the spill file in blocks."""
+    spill_path = tmp_path / "history.txt"
+    history = History(capacity=4, spill_path=str(spill_path))
+    for n in range(1, 7):
+        history.append("multiply", float(n), 2.0, n * 2.0)
+    assert history.spilled == 2
+    assert spill_path.read_text(encoding="utf-8") == (
+        "1.0 multiply 2.0 = 2.0\n2.0 multiply 2.0 = 4.0\n"
+    )
+    assert list(history) == [
+        f"{n:.1f} multiply 2.0 = {n * 2:.1f}" for n in range(3, 7)
+    ]
+
+
+def test_history_keeps_exact_operands():
+    """Verify non-float operands are kept aside and print as typed."""
+    history = History(capacity=2)
+    history.append("add", 1, 2, 3)
+    history.append("divide", Fraction(1, 3), Fraction(1), Fraction(1, 3))
+    assert list(history) == ["1 add 2 = 3", "1/3 divide 1 = 1/3"]
+    history.append("add", 1.0, 2.0, 3.0)
+    history.append("add", 2.0, 2.0, 4.0)
+    assert list(history) == ["1.0 add 2.0 = 3.0", "2.0 add 2.0 = 4.0"]
+    history.append("add", 5, 5, 10)
+    history.clear()
+    history.append("add", 1.0, 1.0, 2.0)
+    assert list(history) == ["1.0 add 1.0 = 2.0"]
+
+
+def test_history_stores_exact_integers_in_an_int64_column():
+    """Verify 64-bit ints stay exact in a typed column and larger ints are kept aside."""
+    history = History(capacity=3)
+    history.append("add", 1.0, 2.0, 3.0)
+    history.append("multiply", 2**62, -3, -3 * 2**62)
+    history.append("add", 2**63, 1, 2**63 + 1)
+    assert list(history) == [
+        "1.0 add 2.0 = 3.0",
+        f"{2**62} multiply -3 = {-3 * 2**62}",
+        f"{2**63} add 1 = {2**63 + 1}",
+    ]
+    history.append("divide", 7, 2, 3.5)
+    history.append("add", True, 1, 2)
+    assert list(history)[1:] == ["7 divide 2 = 3.5", "True add 1 = 2"]
+
+    history = History(capacity=1000)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for n in range(1000):
+            history.append("add", n, 1, n + 1)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert used < 64 * 1000
+    assert list(history)[-1] == "999 add 1 = 1000"
+
+
+def test_history_grows_up_to_capacity():
+    """Verify an idle history allocates nothing for its capacity."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        history = History(capacity=100_000)
+        idle = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert idle < 4096
+    for n in range(5):
+        history.append("add", float(n), 1.0, n + 1.0)
+    assert list(history)[-1] == "4.0 add 1.0 = 5.0"
+
+
+def test_history_clear():
+    """Verify clear empties the buffer."""
+    history = History()
+    history.append("add", 1.0, 1.0, 2.0)
+    history.clear()
+    assert not history
+    history.append("subtract", 3.0, 1.0, 2.0)
+    assert list(history) == ["3.0 subtract 1.0 = 2.0"]
+
+
+def test_history_rejects_invalid_capacity():
+    """Ensure the history capacity must be positive."""
+    with pytest.raises(ValueError, match="History capacity must be at least 1"):
+        History(capacity=0)
+
+
+def test_calculator_history_is_bounded():
+    """Verify the REPL only prints the most recent entries."""
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=['add 1 1', 'add 2 2', 'add 3 3', 'history', 'exit']),
+        output_func=outputs.append,
+        history=History(capacity=2),
+    ).run()
+    assert '\n=== Calculation History (2 entries) ===' in outputs
+    assert '1. 2.0 add 2.0 = 4.0' in outputs
+    assert '2. 3.0 add 3.0 = 6.0' in outputs
+
+
+def test_history_log_persists_across_reopen(tmp_path):
+    """Verify logged calculations are read back after reopening the file."""
+    path = str(tmp_path / "history.bin")
+    with HistoryLog(path) as log:
+        assert not log
+        assert not list(log)
+        log.append("add", 1.0, 2.0, 3.0)
+        log.append("POWER", -8.0, 0.5, (-8.0) ** 0.5)
+        assert len(log) == 2
+    with HistoryLog(path) as log:
+        log.append("divide", 6.0, 3.0, 2.0)
+        assert len(log) == 3
+        assert list(log) == [
+            "1.0 add 2.0 = 3.0",
+            format_calculation("POWER", -8.0, 0.5, (-8.0) ** 0.5),
+            "6.0 divide 3.0 = 2.0",
+        ]
+        log.append("subtract", 5.0, 1.0, 4.0)
+        assert list(log)[-1] == "5.0 subtract 1.0 = 4.0"
+    assert os.path.getsize(path) == 4 * RECORD.size
+
+
+def test_history_log_stores_exact_values_as_doubles(tmp_path):
+    """Verify exact operands and results are rounded, saturating huge integers."""
+    path = str(tmp_path / "history.bin")
+    with HistoryLog(path) as log:
+        log.append("add", 1, 2, 3)
+        log.append("power", 10, 400, 10**400)
+        log.append("multiply", -(10**400), 1.5, -(10**400))
+        assert list(log) == [
+            "1.0 add 2.0 = 3.0",
+            "10.0 power 400.0 = inf",
+            "-inf multiply 1.5 = -inf",
+        ]
+
+
+def test_history_log_drops_partial_record(tmp_path):
+    """Verify a torn trailing record is discarded on open."""
+    path = tmp_path / "history.bin"
+    with HistoryLog(str(path)) as log:
+        log.append("add", 1.0, 1.0, 2.0)
+    with open(path, "ab") as handle:
+        handle.write(b"\x00" * 5)
+    with HistoryLog(str(path)) as log:
+        assert list(log) == ["1.0 add 1.0 = 2.0"]
+    assert path.stat().st_size == RECORD.size
+
+
+def test_calculator_pages_long_history():
+    """Verify the history command pauses between pages and can stop early."""
+    outputs = []
+    history = History()
+    for n in range(HISTORY_PAGE_SIZE * 2 + 1):
+        history.append("add", float(n), 0.0, float(n))
+    prompts = Mock(side_effect=['history', '', '', 'history', 'q', 'exit'])
+    Calculator(
+        input_func=prompts, output_func=outputs.append, history=history, paginate=True
+    ).run()
+    assert outputs.count(f'{HISTORY_PAGE_SIZE * 2 + 1}. 100.0 add 0.0 = 100.0') == 1
+    assert outputs.count('1. 0.0 add 0.0 = 0.0') == 2
+    assert prompts.call_count == 6
+
+
+@pytest.mark.parametrize("interactive", [True, False], ids=["terminal", "piped input"])
+def test_calculator_pages_only_interactive_input(interactive):
+    """Verify scripted input is never consumed by the history pager."""
+    outputs = []
+    lines = ['add 1 1'] * (HISTORY_PAGE_SIZE + 10) + ['history', 'multiply 7 6', 'exit']
+    with patch('sys.stdin') as stdin, patch('builtins.input', side_effect=lines):
+        stdin.isatty.return_value = interactive
+        Calculator(output_func=outputs.append).run()
+    assert ('7.0 multiply 6.0 = 42.0' in outputs) is not interactive
+
+
+def test_format_calculation_number_format():
+    """Verify a number format renders operands and result."""
+    assert format_calculation("divide", 2.0, 3.0, 2 / 3, lambda number: f"{number:.2f}") == (
+        "2.00 divide 3.00 = 0.67"
+    )
+
+
+@pytest.mark.parametrize("persistent", [False, True], ids=["ring buffer", "history log"])
+def test_calculator_history_uses_number_format(tmp_path, persistent):
+    """Verify the history command renders numbers in the calculator's format."""
+    outputs = []
+    history = HistoryLog(str(tmp_path / "history.bin")) if persistent else History()
+    Calculator(
+        input_func=Mock(side_effect=['divide 2 3', 'history', 'exit']),
+        output_func=outputs.append,
+        history=history,
+        number_format=number_formatter("fixed", 2),
+    ).run()
+    assert '1. 2.00 divide 3.00 = 0.67' in outputs
+    assert list(history.entries(number_formatter("fixed", 1))) == ['2.0 divide 3.0 = 0.7']
+    if persistent:
+        history.close()
+
+
+def test_calculator_records_only_printed_results():
+    """Ensure a result the number format rejects is not added to the history."""
+    outputs = []
+    history = History()
+    Calculator(
+        input_func=Mock(side_effect=['add 1 2', 'exit']),
+        output_func=outputs.append,
+        history=history,
+        number_format=Mock(side_effect=ValueError("cannot format")),
+    ).run()
+    assert not history
+    assert any("cannot format" in line for line in outputs)
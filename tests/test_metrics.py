@@ -0,0 +1,124 @@
+"""Tests for per-operation metrics."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.cache import ResultCache
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.metrics import BUCKETS_NS, Metrics
+
+
+def test_metrics_count_calls_errors_and_latency():
+    """Verify successes land in the histogram and errors are counted by type."""
+    metrics = Metrics()
+    evaluate = CalculationFactory.evaluate
+    assert metrics.observe(evaluate, "add", 1.0, 2.0) == 3.0
+    assert metrics.observe(evaluate, "add", 2.0, 2.0) == 4.0
+    with pytest.raises(ZeroDivisionError):
+        metrics.observe(evaluate, "divide", 1.0, 0.0)
+
+    assert metrics.errors == {("divide", "ZeroDivisionError"): 1}
+    summary = metrics.summary()
+    assert summary[0].startswith("add        2 calls, 0 errors, mean ")
+    assert summary[1] == "divide     1 calls, 1 errors"
+
+
+def test_metrics_prometheus_dump():
+    """Verify the text exposition has counters and cumulative buckets."""
+    metrics = Metrics()
+    with patch('app.metrics.perf_counter_ns', side_effect=[0, 500, 0, 5_000, 0, 2_000_000]):
+        for _ in range(3):
+            metrics.observe(CalculationFactory.evaluate, "multiply", 2.0, 3.0)
+    with pytest.raises(ValueError):
+        metrics.observe(Mock(side_effect=ValueError("bad")), "power", 1.0, 1.0)
+
+    dump = metrics.to_prometheus()
+    assert dump.startswith("# HELP calculator_calculations_total")
+    assert 'calculator_calculations_total{operation="multiply"} 3' in dump
+    assert 'calculator_calculations_total{operation="power"} 1' in dump
+    assert 'calculator_errors_total{operation="power",error="ValueError"} 1' in dump
+    bucket = 'calculator_operation_duration_seconds_bucket{operation="multiply",le="%s"} %d'
+    assert bucket % ("2.56e-07", 0) in dump
+    assert bucket % ("5.12e-07", 1) in dump
+    assert bucket % ("8.192e-06", 2) in dump
+    assert bucket % ("0.00209715", 3) in dump
+    assert bucket % ("+Inf", 3) in dump
+    assert 'calculator_operation_duration_seconds_sum{operation="multiply"} 0.0020055' in dump
+    assert 'calculator_operation_duration_seconds_count{operation="multiply"} 3' in dump
+    assert len(BUCKETS_NS) + 1 == dump.count('_bucket{operation="multiply"')
+
+
+@pytest.mark.parametrize(
+    "durations,expected",
+    [
+        ([100], "mean 0.10 us, p50 < 256 ns, p99 < 256 ns"),
+        ([500, 5_000, 2_000_000], "mean 668.50 us, p50 < 8.19 us, p99 < 2.1 ms"),
+        ([50_000_000], "mean 50000.00 us, p50 >= 16.8 ms, p99 >= 16.8 ms"),
+    ],
+    ids=["reports nanoseconds", "reports bucket bounds", "reports overflow"],
+)
+def test_metrics_summary_latency_estimates(durations, expected):
+    """Verify summaries estimate quantiles from the histogram buckets."""
+    metrics = Metrics()
+    ticks = [tick for duration in durations for tick in (0, duration)]
+    with patch('app.metrics.perf_counter_ns', side_effect=ticks):
+        for _ in durations:
+            metrics.observe(CalculationFactory.evaluate, "add", 1.0, 1.0)
+    assert metrics.summary() == [f"add        {len(durations)} calls, 0 errors, {expected}"]
+    metrics.reset()
+    assert not metrics.summary()
+
+
+def test_calculator_stats_command():
+    """Verify the stats command reports metrics, including through the cache."""
+    outputs = []
+    calc = Calculator(
+        input_func=Mock(
+            side_effect=['stats', 'add 1 2', 'add 1 2', 'divide 1 0', 'stats', 'exit']
+        ),
+        output_func=outputs.append,
+        cache=ResultCache(),
+        metrics=Metrics(),
+    )
+    calc.run()
+    assert 'No calculations measured yet.' in outputs
+    assert '\n=== Operation Metrics ===' in outputs
+    assert any(line.startswith('add        2 calls, 0 errors') for line in outputs)
+    assert 'divide     1 calls, 1 errors' in outputs
+    assert calc.cache.hits == 1
+
+
+def test_calculator_measures_every_line_kind():
+    """Verify metrics cover n-ary, aggregate, ternary, expression and assignment lines."""
+    metrics = Metrics()
+    calc = Calculator(output_func=lambda _text: None, cache=ResultCache(), metrics=metrics)
+    for line in ['add 1 2 3', 'mean 1 2', 'powmod 4 13 497', '(1 + 2) * 3', 'x = add 1 2',
+                 'x', 'multiply 1 2 0 nan']:
+        calc.process(line)
+    calc.process('powmod 1 1 0')
+    calls = {line.split()[0]: line.split()[1] for line in metrics.summary()}
+    assert calls == {
+        'reduce.add': '1', 'mean': '1', 'powmod': '2', 'expression': '1', 'assignment': '1',
+        'reduce.multiply': '1',
+    }
+    assert metrics.errors == {('powmod', 'ValueError'): 1}
+
+
+def test_calculator_caches_binary_calculations_only():
+    """Verify only two-operand calculations go through the result cache."""
+    cache = ResultCache()
+    calc = Calculator(output_func=lambda _text: None, cache=cache)
+    for line in ['add 1 2 3', 'mean 1 2', 'powmod 4 13 497', '(1 + 2) * 3', 'x = add 1 2']:
+        calc.process(line)
+    assert (cache.hits, cache.misses) == (0, 0)
+    calc.process('add 1 2')
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_calculator_stats_disabled():
+    """Verify the stats command explains when metrics are off."""
+    outputs = []
+    Calculator(input_func=Mock(side_effect=['STATS', 'exit']), output_func=outputs.append).run()
+    assert 'Metrics are disabled.' in outputs
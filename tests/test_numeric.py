@@ -0,0 +1,148 @@
+"""Tests for the typed number backends and exact evaluation."""
+
+from decimal import Decimal
+from fractions import Fraction
+from unittest.mock import Mock
+
+import pytest
+
+from app.cache import ResultCache
+from app.calculator import Calculator
+from app.numeric import (
+    NUMBER_BACKENDS,
+    number_parser,
+    parse_auto,
+    parse_decimal,
+    parse_fraction,
+)
+
+
+@pytest.mark.parametrize(
+    "token,expected",
+    [("42", 42), ("-7", -7), ("+3", 3), ("1.5", 1.5), ("1e3", 1000.0), ("inf", float("inf"))],
+    ids=["integer", "negative", "explicit sign", "fraction", "exponent", "infinity"],
+)
+def test_parse_auto_keeps_integers_exact(token, expected):
+    """Verify integral tokens parse as ints and everything else as floats."""
+    value = parse_auto(token)
+    assert value == expected
+    assert type(value) is type(expected)  # pylint: disable=unidiomatic-typecheck
+
+
+@pytest.mark.parametrize(
+    "backend,token,expected",
+    [
+        ("float", "2", 2.0),
+        ("auto", "12345678901234567890", 12345678901234567890),
+        ("decimal", "0.1", Decimal("0.1")),
+        ("fraction", "1/3", Fraction(1, 3)),
+        ("fraction", "0.25", Fraction(1, 4)),
+    ],
+    ids=["float", "auto", "decimal", "fraction", "decimal fraction"],
+)
+def test_number_parser(backend, token, expected):
+    """Verify each backend parses operands into its own type."""
+    value = number_parser(backend)(token)
+    assert value == expected
+    assert type(value) is type(expected)  # pylint: disable=unidiomatic-typecheck
+
+
+@pytest.mark.parametrize(
+    "backend,token",
+    [("auto", "abc"), ("decimal", "abc"), ("fraction", "abc"), ("fraction", "1/0")],
+    ids=["auto", "decimal", "fraction", "zero denominator"],
+)
+def test_number_parser_rejects_invalid_tokens(backend, token):
+    """Ensure every backend raises ValueError for bad operands, as float does."""
+    with pytest.raises(ValueError):
+        number_parser(backend)(token)
+
+
+def test_number_parser_rejects_unknown_backends():
+    """Ensure unknown backends are rejected up front."""
+    assert NUMBER_BACKENDS == ("float", "auto", "decimal", "fraction")
+    with pytest.raises(ValueError, match="must be one of"):
+        number_parser("complex")
+
+
+@pytest.mark.parametrize(
+    "backend,line,expected",
+    [
+        ("float", "add 1 2", "1.0 add 2.0 = 3.0"),
+        ("auto", "add 1 2", "1 add 2 = 3"),
+        ("auto", "multiply 9007199254740993 3", "9007199254740993 multiply 3 = 27021597764222979"),
+        ("auto", "power 2 100", "2 power 100 = 1267650600228229401496703205376"),
+        ("auto", "divide 7 2", "7 divide 2 = 3.5"),
+        ("auto", "add 1 0.5", "1 add 0.5 = 1.5"),
+        ("auto", "add 1 2 3", "1 add 2 add 3 = 6"),
+        ("decimal", "add 0.1 0.2", "0.1 add 0.2 = 0.3"),
+        ("decimal", "power 1.1 2", "1.1 power 2 = 1.21"),
+        ("fraction", "divide 1 3", "1 divide 3 = 1/3"),
+        ("fraction", "power 2/3 -2", "2/3 power -2 = 9/4"),
+        ("fraction", "power 4 1/2", "4 power 1/2 = 2.0"),
+    ],
+    ids=[
+        "float by default",
+        "exact integers",
+        "beyond float precision",
+        "exact integer power",
+        "integer division falls back to float",
+        "mixed operands",
+        "exact reduction",
+        "decimal",
+        "decimal power",
+        "exact quotient",
+        "exact fraction power",
+        "fractional exponent falls back to float",
+    ],
+)
+def test_calculator_shows_the_backend_in_its_output(backend, line, expected):
+    """Verify results keep the operand type and print in it."""
+    output = Mock()
+    calculator = Calculator(output_func=output, number_parser=number_parser(backend))
+    calculator.process(line)
+    output.assert_called_once_with(expected)
+    assert list(calculator.history) == ([expected] if line.count(" ") == 2 else [])
+
+
+@pytest.mark.parametrize(
+    "backend,line,message",
+    [
+        ("auto", f"divide {10 ** 400} 3", "Error: integer division result too large"),
+        ("decimal", "power -8 0.5", "Error: -8 ** 0.5 is undefined for decimals."),
+        ("decimal", "power 2 1e9", "Error: Result too large for a Decimal."),
+        ("decimal", "power 0 -1", "Error: 0 cannot be raised to a negative power"),
+        ("fraction", "power 0 -1", "Error: 0 cannot be raised to a negative power"),
+        ("decimal", "add 1 x", "Error: Operands must be numbers. Got '1' and 'x'"),
+    ],
+    ids=[
+        "integer quotient beyond floats",
+        "undefined decimal power",
+        "decimal overflow",
+        "decimal zero to a negative power",
+        "fraction zero to a negative power",
+        "invalid decimal",
+    ],
+)
+def test_calculator_reports_backend_errors(backend, line, message):
+    """Ensure arithmetic errors of every backend are reported as errors."""
+    output = Mock()
+    Calculator(output_func=output, number_parser=number_parser(backend)).process(line)
+    assert output.call_args.args[0].startswith(message)
+
+
+def test_result_cache_keys_exact_operands_by_type():
+    """Verify an exact result is never served for a float key, or the reverse."""
+    output = Mock()
+    cache = ResultCache()
+    for parser in (float, parse_auto, parse_fraction, parse_auto, parse_decimal):
+        Calculator(output_func=output, cache=cache, number_parser=parser).process("add 1 2")
+    assert [call.args[0] for call in output.call_args_list] == [
+        "1.0 add 2.0 = 3.0",
+        "1 add 2 = 3",
+        "1 add 2 = 3",
+        "1 add 2 = 3",
+        "1 add 2 = 3",
+    ]
+    assert isinstance(cache.evaluate("add", Fraction(1), Fraction(2)), Fraction)
+    assert (len(cache), cache.hits) == (3, 2)
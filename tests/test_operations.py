@@ -1,8 +1,25 @@
 """Tests for arithmetic operations."""
 
+import math
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import pytest
 
-from app.calculation import CalculationFactory
+from app.calculation import (
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_INVALID,
+    STATUS_OK,
+    STATUS_OVERFLOW,
+    AddCalculation,
+    Calculation,
+    CalculationBatch,
+    CalculationFactory,
+    DivideCalculation,
+    PowerCalculation,
+)
 from app.operations import Operations
 
 
@@ -257,10 +274,15 @@ def test_calculation_repr():
     assert "b=4" in repr_str
 
 
-def test_unregistered_operation():
+@pytest.mark.parametrize(
+    "operation",
+    ["unknown_operation", ["add"]],
+    ids=["rejects unknown names", "rejects unhashable operations"],
+)
+def test_unregistered_operation(operation):
     """Ensure attempting to create an unregistered operation raises ValueError."""
     with pytest.raises(ValueError, match="is not registered"):
-        CalculationFactory.create_calculation("unknown_operation", 1, 2)
+        CalculationFactory.create_calculation(operation, 1, 2)
 
 
 def test_duplicate_registration():
@@ -276,3 +298,589 @@ def test_duplicate_registration():
             def execute(self):
                 """Return a deterministic value for test registration."""
                 return self.a + self.b
+
+
+@pytest.mark.parametrize(
+    "operation",
+    ["add", "subtract", "multiply", "divide", "power"],
+)
+def test_execute_batch_matches_scalar(operation):
+    """Verify batch evaluation matches the scalar calculation classes."""
+    a_values = array("d", [1.0, -2.5, 3.0, 4.0])
+    b_values = array("d", [2.0, 4.0, -1.5, 0.5])
+    results = CalculationFactory.execute_batch(operation, a_values, b_values)
+    expected = [
+        _create_calculation(operation, a, b).execute()
+        for a, b in zip(a_values, b_values)
+    ]
+    assert isinstance(results, array)
+    assert list(results) == expected
+
+
+def test_execute_batch_groups_mixed_operations():
+    """Verify per-row operation names and registry positions are grouped."""
+    operations = ["add", "multiply", 0, "DIVIDE", 4]
+    a_values = [1.0, 2.0, 3.0, 8.0, 2.0]
+    b_values = [1.0, 3.0, 4.0, 2.0, 3.0]
+    results = CalculationFactory.execute_batch(operations, a_values, b_values)
+    assert list(results) == [2.0, 6.0, 7.0, 4.0, 8.0]
+
+
+def test_execute_batch_single_group_sequence():
+    """Verify a sequence holding one operation skips regrouping."""
+    results = CalculationFactory.execute_batch(["add", "add"], [1, 2], [3, 4])
+    assert list(results) == [4.0, 6.0]
+
+
+def test_execute_batch_default_kernel():
+    """Verify calculations without a batch kernel fall back to execute()."""
+    class _ModuloCalculation(Calculation):  # pylint: disable=too-few-public-methods
+        """Calculation that relies on the default batch implementation."""
+        def execute(self):
+            return self.a % self.b
+
+    assert _ModuloCalculation.execute_batch([7, 9], [4, 5]) == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "operations,a_values,b_values,error,match",
+    [
+        ("divide", [1.0, 2.0], [1.0, 0.0], ZeroDivisionError, "Cannot divide by zero"),
+        ("add", [1.0, 2.0], [1.0], ValueError, "same length"),
+        (["add"], [1.0, 2.0], [1.0, 2.0], ValueError, "same length"),
+        (["add", "modulo"], [1.0, 2.0], [1.0, 2.0], ValueError, "is not registered"),
+        ("power", [-8.0], [0.5], ValueError, "is not real"),
+        ([1, True], [1.0, 2.0], [1.0, 2.0], ValueError, "'true' is not registered"),
+    ],
+    ids=[
+        "rejects division by zero",
+        "rejects mismatched operand columns",
+        "rejects mismatched operation column",
+        "rejects unknown operation codes",
+        "rejects complex results",
+        "rejects bool operation codes",
+    ],
+)
+def test_execute_batch_errors(operations, a_values, b_values, error, match):
+    """Ensure invalid batches raise the same errors as scalar calculations."""
+    with pytest.raises(error, match=match):
+        CalculationFactory.execute_batch(operations, a_values, b_values)
+
+
+@pytest.mark.parametrize(
+    "operation",
+    ["add", "subtract", "multiply", "divide", "power"],
+)
+def test_reduce_matches_chained_calculations(operation):
+    """Verify n-ary reductions equal chaining the binary calculation."""
+    operands = [1.5, -2.25, 0.75, 3.0, 1.25]
+    expected = operands[0]
+    for operand in operands[1:]:
+        expected = _create_calculation(operation, expected, operand).execute()
+    assert CalculationFactory.reduce(operation, operands) == expected
+    assert CalculationFactory.reduce(operation, array("d", operands)) == expected
+
+
+def test_reduce_large_operand_counts():
+    """Verify reductions consume large typed columns in one pass."""
+    operands = array("d", [0.5] * 100_000)
+    assert CalculationFactory.reduce("add", operands) == 50_000.0
+    assert CalculationFactory.reduce("multiply", array("d", [1.0] * 100_000)) == 1.0
+    assert CalculationFactory.reduce("add", [-0.0, -0.0, -0.0]) == 0.0
+    assert str(CalculationFactory.reduce("add", [-0.0, -0.0, -0.0])) == "-0.0"
+
+
+def test_reduce_add_rounds_like_chained_adds():
+    """Verify n-ary add rounds every step, without compensated summation."""
+    assert CalculationFactory.reduce("add", [1e16, 1.0, -1e16]) == (1e16 + 1.0) - 1e16 == 0.0
+
+
+def test_reduce_default_kernel():
+    """Verify calculations without a reduce kernel fold through execute()."""
+    class _ModuloCalculation(Calculation):  # pylint: disable=too-few-public-methods
+        """Calculation that relies on the default reduction."""
+        def execute(self):
+            return self.a % self.b
+
+    assert _ModuloCalculation.reduce([100, 7, 3]) == 2
+
+
+@pytest.mark.parametrize(
+    "operation,operands,error,match",
+    [
+        ("add", [1.0], ValueError, "At least two operands"),
+        ("divide", [1.0, 2.0, 0.0], ZeroDivisionError, "Cannot divide by zero"),
+        ("modulo", [1.0, 2.0, 3.0], ValueError, "is not registered"),
+        ("power", [10.0, 10.0, 400.0], ValueError, "Result too large"),
+    ],
+    ids=[
+        "rejects a single operand",
+        "rejects division by zero in any divisor",
+        "rejects unknown operations",
+        "keeps power bounded at every step",
+    ],
+)
+def test_reduce_errors(operation, operands, error, match):
+    """Ensure invalid reductions raise the same errors as binary calculations."""
+    with pytest.raises(error, match=match):
+        CalculationFactory.reduce(operation, operands)
+
+
+@pytest.mark.parametrize(
+    "operation",
+    ["add", "subtract", "multiply", "divide", "power"],
+)
+def test_evaluate_matches_scalar(operation):
+    """Verify the dispatch table matches the calculation classes."""
+    assert CalculationFactory.evaluate(operation, 6.0, 4.0) == (
+        _create_calculation(operation, 6.0, 4.0).execute()
+    )
+
+
+def test_evaluate_falls_back_to_factory():
+    """Verify names outside the dispatch table resolve through the factory."""
+    assert CalculationFactory.evaluate("ADD", 1.0, 2.0) == 3.0
+    with pytest.raises(ValueError, match="is not registered"):
+        CalculationFactory.evaluate("unknown_operation", 1.0, 2.0)
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        CalculationFactory.evaluate("divide", 1.0, 0.0)
+
+
+def test_registration_refreshes_dispatch_table():
+    """Verify new registrations are dispatched, using execute() if needed."""
+    with patch.object(CalculationFactory, "calculations", CalculationFactory.calculations), \
+            patch.object(CalculationFactory, "dispatch", CalculationFactory.dispatch):
+        @CalculationFactory.register_calculation("Modulo")
+        class _ModuloCalculation(Calculation):  # pylint: disable=too-few-public-methods
+            """Calculation without a direct operation callable."""
+            def execute(self):
+                return self.a % self.b
+
+        @CalculationFactory.register_calculation("double_add")
+        class _DoubleAddCalculation(AddCalculation):  # pylint: disable=too-few-public-methods
+            """Subclass whose execute() must not be bypassed."""
+            def execute(self):
+                return 2 * (self.a + self.b)
+
+        assert CalculationFactory.evaluate("modulo", 7.0, 4.0) == 3.0
+        assert CalculationFactory.evaluate("double_add", 1.0, 2.0) == 6.0
+    assert "modulo" not in CalculationFactory.dispatch
+
+
+def test_calculations_use_slots():
+    """Ensure calculation instances carry no per-instance dictionary."""
+    calculation = _create_calculation("add", 1.0, 2.0)
+    assert not hasattr(calculation, "__dict__")
+    assert CalculationFactory.dispatch["add"] is Operations.addition
+
+
+def test_registries_are_read_only_snapshots():
+    """Ensure registries cannot be changed in place, only republished."""
+    with pytest.raises(TypeError):
+        CalculationFactory.calculations["modulo"] = AddCalculation
+    with pytest.raises(TypeError):
+        CalculationFactory.dispatch["modulo"] = Operations.addition
+    with pytest.raises(TypeError):
+        CalculationFactory.aggregates["count"] = len
+
+
+def test_registration_publishes_new_snapshots():
+    """Verify registering copies the registry and leaves old snapshots intact."""
+    with patch.object(CalculationFactory, "calculations", CalculationFactory.calculations), \
+            patch.object(CalculationFactory, "dispatch", CalculationFactory.dispatch):
+        calculations = CalculationFactory.calculations
+        dispatch = CalculationFactory.dispatch
+        CalculationFactory.register_calculation("Plus")(AddCalculation)
+        assert CalculationFactory.calculations is not calculations
+        assert "plus" not in calculations and "plus" not in dispatch
+        assert CalculationFactory.evaluate("plus", 1.0, 2.0) == 3.0
+
+        CalculationFactory.unregister_calculation("PLUS")
+        assert "plus" not in CalculationFactory.calculations
+        assert "plus" not in CalculationFactory.dispatch
+        with pytest.raises(ValueError, match="'plus' is not registered"):
+            CalculationFactory.unregister_calculation("plus")
+
+
+def test_concurrent_reads_during_registration():
+    """Ensure readers never see a partial registry while a writer churns it."""
+    stop = threading.Event()
+    errors = []
+
+    def write():
+        register = CalculationFactory.register_calculation("churn")
+        while not stop.is_set():
+            register(AddCalculation)
+            CalculationFactory.unregister_calculation("churn")
+
+    def read():
+        try:
+            for _ in range(2000):
+                assert CalculationFactory.evaluate("multiply", 3.0, 2.0) == 6.0
+                for name in CalculationFactory.calculations:
+                    assert name in CalculationFactory.dispatch or name == "churn"
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            errors.append(exc)
+
+    with patch.object(CalculationFactory, "calculations", CalculationFactory.calculations), \
+            patch.object(CalculationFactory, "dispatch", CalculationFactory.dispatch):
+        writer = threading.Thread(target=write)
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        writer.start()
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        stop.set()
+        writer.join()
+    assert not errors
+    assert "churn" not in CalculationFactory.calculations
+
+
+@pytest.mark.parametrize(
+    "operations,threads,chunk_size",
+    [
+        ("add", 4, 3),
+        (["add", "subtract", "multiply", "divide", "power"] * 2, 3, 4),
+        ("multiply", 1, 2),
+        ("add", None, 100),
+    ],
+    ids=[
+        "splits one operation into chunks",
+        "splits a per-row operation column",
+        "runs inline on one thread",
+        "runs inline when one chunk covers the batch",
+    ],
+)
+def test_execute_parallel_matches_execute_batch(operations, threads, chunk_size):
+    """Verify chunked evaluation on a thread pool keeps the input order."""
+    a_values = [float(value) for value in range(1, 11)]
+    b_values = [1.5] * 10
+    results = CalculationFactory.execute_parallel(
+        operations, a_values, b_values, threads=threads, chunk_size=chunk_size
+    )
+    assert list(results) == list(
+        CalculationFactory.execute_batch(operations, a_values, b_values)
+    )
+
+
+def test_execute_parallel_reuses_executor():
+    """Verify a caller-supplied pool is used and left running."""
+    a_values = array("d", range(100))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for _ in range(2):
+            results = CalculationFactory.execute_parallel(
+                "add", a_values, a_values, threads=1, chunk_size=7, executor=executor
+            )
+            assert list(results) == [2.0 * value for value in range(100)]
+
+
+@pytest.mark.parametrize(
+    "kwargs,error,match",
+    [
+        ({"b_values": [1.0]}, ValueError, "same length"),
+        ({"operations": ["add"]}, ValueError, "same length"),
+        ({"threads": 0}, ValueError, "Thread count must be at least 1"),
+        ({"chunk_size": 0}, ValueError, "Chunk size must be at least 1"),
+        ({"b_values": [1.0, 1.0, 0.0, 1.0]}, ZeroDivisionError, "Cannot divide by zero"),
+    ],
+    ids=[
+        "rejects mismatched operand columns",
+        "rejects mismatched operation column",
+        "rejects zero threads",
+        "rejects empty chunks",
+        "raises errors from worker threads",
+    ],
+)
+def test_execute_parallel_errors(kwargs, error, match):
+    """Ensure invalid parallel batches raise like execute_batch."""
+    arguments = {
+        "operations": "divide",
+        "a_values": [1.0, 2.0, 3.0, 4.0],
+        "b_values": [1.0, 1.0, 1.0, 1.0],
+        "threads": 2,
+        "chunk_size": 1,
+    }
+    arguments.update(kwargs)
+    with pytest.raises(error, match=match):
+        CalculationFactory.execute_parallel(**arguments)
+
+
+def test_create_batch_matches_instances():
+    """Verify a batch behaves like the instances it stands in for."""
+    a_values = [6.0, 7.5, -3.0]
+    b_values = [2.0, 0.5, 4.0]
+    batch = CalculationFactory.create_batch("Divide", a_values, b_values)
+    instances = [
+        CalculationFactory.create_calculation("divide", a, b)
+        for a, b in zip(a_values, b_values)
+    ]
+    assert isinstance(batch, CalculationBatch)
+    assert batch.calculation_class is DivideCalculation
+    assert len(batch) == 3
+    assert [str(item) for item in batch] == [str(item) for item in instances]
+    assert repr(batch[-1]) == repr(instances[-1]) == "DivideCalculation(a=-3.0, b=4.0)"
+    assert list(batch.execute()) == [item.execute() for item in instances]
+    assert repr(batch) == "CalculationBatch(DivideCalculation, 3 pending)"
+
+
+def test_create_batch_appends_and_stores_compactly():
+    """Verify a batch grows one pair at a time in two float64 columns."""
+    batch = CalculationFactory.create_batch("add")
+    for value in range(1000):
+        batch.append(value, 0.5)
+    assert len(batch) == 1000
+    assert batch.a_values.itemsize == batch.b_values.itemsize == 8
+    assert batch.a_values.buffer_info()[1] == 1000
+    assert batch.execute()[999] == 999.5
+
+
+@pytest.mark.parametrize(
+    "operation,a_values,b_values,error,match",
+    [
+        ("add", [1.0, 2.0], [1.0], ValueError, "same length"),
+        ("modulo", [1.0], [1.0], ValueError, "is not registered"),
+        ("divide", [1.0], [0.0], ZeroDivisionError, "Cannot divide by zero"),
+    ],
+    ids=[
+        "rejects mismatched operand columns",
+        "rejects unknown operations",
+        "raises errors on execute",
+    ],
+)
+def test_create_batch_errors(operation, a_values, b_values, error, match):
+    """Ensure invalid batches fail like single calculations."""
+    with pytest.raises(error, match=match):
+        CalculationFactory.create_batch(operation, a_values, b_values).execute()
+
+
+@pytest.mark.parametrize(
+    "operations,a_values,b_values,typecode,expected",
+    [
+        ("add", array("f", [1.5, 2.0]), array("f", [0.25, 1.0]), None, array("f", [1.75, 3.0])),
+        ("multiply", array("q", [2**53 + 1, -3]), array("q", [1, 5]), None,
+         array("q", [2**53 + 1, -15])),
+        ("divide", array("q", [7, 8]), array("q", [2, 4]), None, array("d", [3.5, 2.0])),
+        (["add", "subtract"], array("q", [1, 2]), array("q", [3, 4]), None, array("q", [4, -2])),
+        (["add", "divide"], array("q", [1, 2]), array("q", [3, 4]), None, array("d", [4.0, 0.5])),
+        ("add", array("q", [1]), array("f", [0.5]), None, array("d", [1.5])),
+        ("add", [1.0, 2.0], [0.5, 0.5], "f", array("f", [1.5, 2.5])),
+        ("subtract", [5, 2**60], [1, 1], "q", array("q", [4, 2**60 - 1])),
+        (["add", "multiply"], [1.5, 2.0], [1.0, 3.0], "f", array("f", [2.5, 6.0])),
+    ],
+    ids=[
+        "float32 operands give float32 results",
+        "int64 operands stay exact",
+        "int64 division gives float64",
+        "int64 mixed integer operations",
+        "int64 mixed with division gives float64",
+        "mixed operand types give float64",
+        "explicit float32",
+        "explicit int64",
+        "explicit float32 for mixed operations",
+    ],
+)
+def test_execute_batch_typecodes(operations, a_values, b_values, typecode, expected):
+    """Verify batch results follow the operand typecodes unless one is given."""
+    results = CalculationFactory.execute_batch(operations, a_values, b_values, typecode)
+    assert results.typecode == expected.typecode
+    assert results == expected
+
+
+@pytest.mark.parametrize(
+    "operations,a_values,b_values,typecode,match",
+    [
+        ("add", [1.0], [1.0], "i", "typecode must be one of"),
+        ("divide", [1], [2], "q", "must be integers"),
+        ("multiply", array("q", [2**62]), array("q", [4]), None, "do not fit in typecode 'q'"),
+    ],
+    ids=["rejects unknown typecodes", "rejects fractional int64 results", "rejects int64 overflow"],
+)
+def test_execute_batch_typecode_errors(operations, a_values, b_values, typecode, match):
+    """Ensure results that do not fit the typecode raise instead of wrapping."""
+    with pytest.raises(ValueError, match=match):
+        CalculationFactory.execute_batch(operations, a_values, b_values, typecode)
+
+
+@pytest.mark.parametrize("executor", [False, True], ids=["own pool", "given executor"])
+def test_execute_parallel_keeps_the_typecode(executor):
+    """Verify chunked results are joined in the chunks' typecode."""
+    a_values = array("q", range(10))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = CalculationFactory.execute_parallel(
+            "add", a_values, a_values, threads=2, chunk_size=3,
+            executor=pool if executor else None,
+        )
+        floats = CalculationFactory.execute_parallel(
+            "add", a_values, a_values, threads=2, chunk_size=3, typecode="f"
+        )
+    assert results == array("q", range(0, 20, 2))
+    assert floats == array("f", range(0, 20, 2))
+
+
+def test_create_batch_typecodes():
+    """Verify a float32 batch halves its columns and an int64 batch stays exact."""
+    half = CalculationFactory.create_batch("add", [1.5, 2.5], [1.0, 1.0], typecode="f")
+    assert half.a_values.itemsize == half.b_values.itemsize == 4
+    assert half.execute() == array("f", [2.5, 3.5])
+    exact = CalculationFactory.create_batch("multiply", [2**40], [2**20], typecode="q")
+    assert exact.execute() == array("q", [2**60])
+    assert CalculationFactory.create_batch("divide", [3], [2], typecode="q").execute() == array(
+        "d", [1.5]
+    )
+    with pytest.raises(ValueError, match="typecode must be one of"):
+        CalculationFactory.create_batch("add", typecode="b")
+
+
+INF = math.inf
+NAN = math.nan
+
+
+@pytest.mark.parametrize(
+    "operation,a_values,b_values,results,statuses",
+    [
+        (
+            "add",
+            [1.0, 1e308, INF, -INF],
+            [2.0, 1e308, 1.0, 1.0],
+            [3.0, INF, INF, -INF],
+            [STATUS_OK, STATUS_OVERFLOW, STATUS_OK, STATUS_OK],
+        ),
+        ("multiply", [2.0, -1e200], [3.0, 1e200], [6.0, -INF], [STATUS_OK, STATUS_OVERFLOW]),
+        (
+            "divide",
+            [6.0, 1.0, -1.0, 1.0, 0.0, 1e308],
+            [3.0, 0.0, 0.0, -0.0, 0.0, 1e-10],
+            [2.0, INF, -INF, -INF, NAN, INF],
+            [STATUS_OK] + [STATUS_DIVIDE_BY_ZERO] * 4 + [STATUS_OVERFLOW],
+        ),
+        ("divide", [1e308, INF], [-1e-10, 2.0], [-INF, INF], [STATUS_OVERFLOW, STATUS_OK]),
+        ("divide", array("d", [1.0, 2.0]), array("d", [4.0, 8.0]), [0.25, 0.25], [0, 0]),
+        (
+            "power",
+            [2, 0.0, -8.0, 10.0, -10.0, -8.0],
+            [10, -1.0, 0.5, 400.0, 401.0, float("inf")],
+            [1024.0, INF, NAN, INF, -INF, INF],
+            [STATUS_OK, STATUS_DIVIDE_BY_ZERO, STATUS_INVALID, STATUS_OVERFLOW,
+             STATUS_OVERFLOW, STATUS_OK],
+        ),
+        ("divide", [10**400, 10**400, 6.0], [1, 10**399, 3], [NAN, 10.0, 2.0],
+         [STATUS_OVERFLOW, STATUS_OK, STATUS_OK]),
+        ("divide", [None, 6.0], [2.0, 0.0], [NAN, NAN], [STATUS_INVALID, STATUS_DIVIDE_BY_ZERO]),
+        ("power", [10**400, 2.0], [2, 3.0], [NAN, 8.0], [STATUS_OVERFLOW, STATUS_OK]),
+        ("power", [2.0, None], [3.0, 2.0], [8.0, NAN], [STATUS_OK, STATUS_INVALID]),
+    ],
+    ids=[
+        "flags additions that overflow",
+        "flags products that overflow",
+        "gives IEEE quotients for zero divisors",
+        "flags quotients that overflow",
+        "divides buffers without zero divisors",
+        "flags power failures before computing",
+        "flags quotients of integers beyond float range",
+        "flags quotients of operands that do not divide",
+        "flags powers of integers beyond float range",
+        "flags powers of operands that are not numbers",
+    ],
+)
+def test_execute_batch_status_kernels(operation, a_values, b_values, results, statuses):
+    """Verify failing rows get a status and a NaN or infinite result."""
+    values, codes = CalculationFactory.execute_batch_status(operation, a_values, b_values)
+    assert codes.typecode == "B" and list(codes) == statuses
+    assert [str(value) for value in values] == [str(value) for value in results]
+
+
+def test_execute_batch_status_matches_scalar_errors():
+    """Ensure a row fails exactly when evaluating it alone would raise."""
+    rows = [
+        (operation, a, b)
+        for operation in ["add", "subtract", "multiply", "divide", "power"]
+        for a in [-8.0, -1.5, 0.0, 2.0, 1e200]
+        for b in [-2.0, 0.0, 0.5, 3.0, 1e3]
+    ]
+    operations, a_values, b_values = zip(*rows)
+    values, codes = CalculationFactory.execute_batch_status(operations, a_values, b_values)
+    for (operation, a, b), value, code in zip(rows, values, codes):
+        try:
+            expected = float(CalculationFactory.evaluate(operation, a, b))
+        except (ArithmeticError, ValueError, TypeError):
+            assert code != STATUS_OK, (operation, a, b)
+        else:
+            assert code == STATUS_OK, (operation, a, b)
+            assert value == pytest.approx(expected, rel=1e-12) or value == expected
+
+
+def test_execute_batch_status_overflow_policy():
+    """Verify overflowing powers succeed as infinity under the inf policy."""
+    with patch("app.calculation.DEFAULT_ENGINE.overflow", "inf"):
+        values, codes = PowerCalculation.execute_batch_status([10.0], [400.0])
+    assert (values[0], codes[0]) == (INF, STATUS_OK)
+    with patch("math.log10", return_value=0.0):
+        values, codes = PowerCalculation.execute_batch_status([10.0], [400.0])
+    assert (values[0], codes[0]) == (INF, STATUS_OVERFLOW)
+
+
+def test_execute_batch_status_mixed_and_unknown_operations():
+    """Verify per-row codes are grouped, and unknown codes marked invalid."""
+    values, codes = CalculationFactory.execute_batch_status(
+        ["add", "modulo", 0, "divide", 99], [1.0, 2.0, 3.0, 4.0, 5.0], [1.0, 2.0, 3.0, 0.0, 5.0]
+    )
+    assert list(codes) == [
+        STATUS_OK, STATUS_INVALID, STATUS_OK, STATUS_DIVIDE_BY_ZERO, STATUS_INVALID,
+    ]
+    assert [values[0], values[2], values[3]] == [2.0, 6.0, INF]
+    assert math.isnan(values[1]) and math.isnan(values[4])
+
+    values, codes = CalculationFactory.execute_batch_status(["divide"] * 2, [1, 2], [1, 0])
+    assert (list(values), list(codes)) == ([1.0, INF], [STATUS_OK, STATUS_DIVIDE_BY_ZERO])
+
+    values, codes = CalculationFactory.execute_batch_status([1, True, 0], [1.0] * 3, [1.0] * 3)
+    assert list(codes) == [STATUS_OK, STATUS_INVALID, STATUS_OK]
+
+
+def test_execute_batch_status_default_kernel():
+    """Verify calculations without a no-raise kernel fall back row by row."""
+    def fail(a, b):
+        if b == 0:
+            raise ZeroDivisionError("zero")
+        if b == 1:
+            raise OverflowError("too big")
+        if b == 2:
+            return complex(a, b)
+        if b == 3:
+            return a * 1e308
+        return a % b
+
+    class _ModuloCalculation(Calculation):  # pylint: disable=too-few-public-methods
+        """Calculation relying on the default batch methods."""
+        def execute(self):
+            return fail(self.a, self.b)
+
+    values, codes = _ModuloCalculation.execute_batch_status([7.0] * 3, [4.0, 5.0, 6.0])
+    assert (list(values), list(codes)) == ([3.0, 2.0, 1.0], [STATUS_OK] * 3)
+    values, codes = _ModuloCalculation.execute_batch_status([7.0] * 4, [0.0, 1.0, 2.0, 4.0])
+    assert list(codes) == [STATUS_DIVIDE_BY_ZERO, STATUS_OVERFLOW, STATUS_INVALID, STATUS_OK]
+    assert values[3] == 3.0 and all(math.isnan(value) for value in values[:3])
+    values, codes = _ModuloCalculation.execute_batch_status([7.0, INF], [3.0, 3.0])
+    assert (list(values), list(codes)) == ([INF, INF], [STATUS_OVERFLOW, STATUS_OK])
+    values, codes = _ModuloCalculation.execute_batch_status([7.0, 7.0], [3.0, 0.0])
+    assert (values[0], list(codes)) == (INF, [STATUS_OVERFLOW, STATUS_DIVIDE_BY_ZERO])
+
+
+@pytest.mark.parametrize(
+    "operations,a_values,b_values,match",
+    [
+        ("add", [1.0, 2.0], [1.0], "same length"),
+        (["add"], [1.0, 2.0], [1.0, 2.0], "same length"),
+        ("modulo", [1.0], [1.0], "is not registered"),
+    ],
+    ids=[
+        "rejects mismatched operand columns",
+        "rejects mismatched operation column",
+        "rejects an unknown single operation",
+    ],
+)
+def test_execute_batch_status_errors(operations, a_values, b_values, match):
+    """Ensure malformed calls still raise instead of returning statuses."""
+    with pytest.raises(ValueError, match=match):
+        CalculationFactory.execute_batch_status(operations, a_values, b_values)
@@ -0,0 +1,154 @@
+"""Tests for the buffered output sink and number formatting."""
+
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculator import Calculator
+from app.output import NUMBER_FORMATS, OutputSink, number_formatter
+
+
+@pytest.mark.parametrize(
+    "mode,precision,value,expected",
+    [
+        ("repr", 6, 2 / 3, "0.6666666666666666"),
+        ("repr", 2, 3.0, "3.0"),
+        ("fixed", 2, 2 / 3, "0.67"),
+        ("fixed", 0, 2.5, "2"),
+        ("fixed", 3, complex(1, -2), "1.000-2.000j"),
+        ("compact", 6, 3.0, "3"),
+        ("compact", 4, 2 / 3, "0.6667"),
+        ("compact", 6, 1e20, "1e+20"),
+        ("fixed", 1, 10**400 + 3, f"{10**400 + 3}.0"),
+        ("compact", 4, -123456 * 10**400, "-1.235e+405"),
+        ("compact", 0, 10**400, "1e+400"),
+    ],
+    ids=[
+        "prints floats as str does",
+        "ignores precision for repr",
+        "rounds to fixed decimals",
+        "rounds half to even with no decimals",
+        "formats complex results",
+        "drops a trailing .0",
+        "limits significant digits",
+        "uses exponents for large values",
+        "formats ints beyond float range exactly",
+        "rounds ints beyond float range to significant digits",
+        "keeps one digit of ints beyond float range",
+    ],
+)
+def test_number_formatter(mode, precision, value, expected):
+    """Verify each number format renders results as documented."""
+    assert number_formatter(mode, precision)(value) == expected
+
+
+@pytest.mark.parametrize(
+    "mode,precision,match",
+    [("scientific", 6, "must be one of"), ("fixed", -1, "must not be negative")],
+    ids=["rejects unknown formats", "rejects negative precision"],
+)
+def test_number_formatter_errors(mode, precision, match):
+    """Ensure invalid formats are rejected up front."""
+    with pytest.raises(ValueError, match=match):
+        number_formatter(mode, precision)
+
+
+def test_number_formats_are_listed():
+    """Verify every listed format can be built."""
+    assert NUMBER_FORMATS == ("repr", "fixed", "compact")
+    for mode in NUMBER_FORMATS:
+        assert number_formatter(mode)(1.5)
+
+
+def test_sink_buffers_until_flushed():
+    """Verify lines are joined into one write per flush."""
+    write = Mock()
+    flush = Mock()
+    sink = OutputSink(write, flush)
+    sink("1.0 add 2.0 = 3.0")
+    sink("")
+    write.assert_not_called()
+    sink.flush()
+    write.assert_called_once_with("1.0 add 2.0 = 3.0\n\n")
+    flush.assert_called_once_with()
+    sink.flush()
+    assert sink.writes == 1
+
+
+def test_sink_flushes_by_size():
+    """Verify the buffer is written once it reaches the buffer size."""
+    writes = []
+    sink = OutputSink(writes.append, buffer_size=10)
+    for line in ["four", "five", "six"]:
+        sink(line)
+    assert writes == ["four\nfive\n"]
+    with sink:
+        sink("!")
+    assert writes == ["four\nfive\n", "six\n!\n"]
+
+
+def test_sink_flushes_every_line_without_a_buffer():
+    """Verify a zero buffer size writes each line as it comes."""
+    writes = []
+    sink = OutputSink(writes.append, buffer_size=0)
+    sink("a")
+    sink("b")
+    assert writes == ["a\n", "b\n"]
+
+
+def test_sink_flushes_by_time():
+    """Verify buffered output is written once the flush interval passes."""
+    writes = []
+    with patch('app.output.monotonic', side_effect=[0.0, 0.5, 1.5, 1.5, 1.6]):
+        sink = OutputSink(writes.append, flush_interval=1.0)
+        sink("first")
+        assert not writes
+        sink("second")
+        assert writes == ["first\nsecond\n"]
+        sink("third")
+    assert writes == ["first\nsecond\n"]
+
+
+def test_sink_writes_to_stdout_by_default():
+    """Verify the default target is sys.stdout at flush time."""
+    sink = OutputSink()
+    sink("hello")
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        sink.close()
+    assert fake_out.getvalue() == "hello\n"
+
+
+@pytest.mark.parametrize(
+    "kwargs,match",
+    [({"buffer_size": -1}, "must not be negative"), ({"flush_interval": 0}, "must be positive")],
+    ids=["rejects a negative buffer", "rejects a zero interval"],
+)
+def test_sink_rejects_invalid_policies(kwargs, match):
+    """Ensure flush policies are validated."""
+    with pytest.raises(ValueError, match=match):
+        OutputSink(**kwargs)
+
+
+def test_sink_flushes_at_interactive_prompts():
+    """Verify output is written before the prompt when flushing on prompts."""
+    writes = []
+    sink = OutputSink(writes.append)
+    sink("result")
+    with patch('builtins.input', return_value="add 1 2") as fake_input:
+        assert sink.read_line(">>> ") == "add 1 2"
+    fake_input.assert_called_once_with(">>> ")
+    assert writes == ["result\n"]
+
+
+def test_sink_buffers_prompts_for_piped_input():
+    """Verify a piped REPL session is written in order, in a single write."""
+    writes = []
+    sink = OutputSink(writes.append, flush_on_prompt=False)
+    calculator = Calculator(input_func=sink.read_line, output_func=sink)
+    with patch('builtins.input', side_effect=['add 1 2', 'exit']) as fake_input:
+        calculator.run()
+    sink.flush()
+    fake_input.assert_called_with()
+    assert len(writes) == 1
+    assert writes[0].endswith(">>> 1.0 add 2.0 = 3.0\n>>> Goodbye!\n")
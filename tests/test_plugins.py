@@ -0,0 +1,182 @@
+"""Tests for lazy plugin discovery through package entry points."""
+
+import sys
+from time import perf_counter
+from types import MappingProxyType
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculation import PLUGIN_GROUP, AddCalculation, CalculationFactory
+from app.calculator import Calculator
+
+# Every heavy plugin sleeps on import, so importing them all at startup
+# would blow the startup budget many times over.
+HEAVY_PLUGINS = 40
+IMPORT_DELAY = 0.05
+STARTUP_BUDGET = 0.5
+
+HEAVY_MODULE = '''
+import time
+
+from app.calculation import Calculation
+
+time.sleep({delay})
+
+
+class HeavyCalculation(Calculation):
+    """Plugin calculation with an expensive import."""
+
+    def execute(self):
+        return self.a * 100 + self.b
+'''
+
+SELF_REGISTERING_MODULE = '''
+from app.calculation import Calculation, CalculationFactory
+
+
+@CalculationFactory.register_calculation("modulo")
+class ModuloCalculation(Calculation):
+    """Plugin calculation that registers itself on import."""
+
+    def execute(self):
+        return self.a % self.b
+'''
+
+NOT_A_CALCULATION_MODULE = '''
+def hypot(a, b):
+    return (a * a + b * b) ** 0.5
+'''
+
+
+@pytest.fixture
+def plugin_path(tmp_path, monkeypatch):
+    """Install a fake plugin distribution and isolate the factory registry."""
+    lines = [f"[{PLUGIN_GROUP}]"]
+    for index in range(HEAVY_PLUGINS):
+        (tmp_path / f"heavy_plugin_{index}.py").write_text(
+            HEAVY_MODULE.format(delay=IMPORT_DELAY)
+        )
+        lines.append(f"heavy_{index} = heavy_plugin_{index}:HeavyCalculation")
+    (tmp_path / "modulo_plugin.py").write_text(SELF_REGISTERING_MODULE)
+    (tmp_path / "hypot_plugin.py").write_text(NOT_A_CALCULATION_MODULE)
+    lines += [
+        "Modulo = modulo_plugin:ModuloCalculation",
+        "hypot = hypot_plugin:hypot",
+        "missing = missing_plugin_module:MissingCalculation",
+        "add = hypot_plugin:hypot",
+    ]
+    dist_info = tmp_path / "calculator_plugins-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: calculator-plugins\nVersion: 1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text("\n".join(lines) + "\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(CalculationFactory, "_plugins_discovered", False)
+    # Registration publishes new snapshots, so restoring the attributes undoes it.
+    with patch.object(CalculationFactory, "calculations", CalculationFactory.calculations), \
+            patch.object(CalculationFactory, "dispatch", CalculationFactory.dispatch), \
+            patch.object(CalculationFactory, "plugins", MappingProxyType({})):
+        yield tmp_path
+    for name in list(sys.modules):
+        if name.startswith(("heavy_plugin_", "modulo_plugin", "hypot_plugin")):
+            del sys.modules[name]
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_startup_lists_plugins_without_importing_them():
+    """Verify plugin names come from metadata within the startup budget."""
+    start = perf_counter()
+    calculator = Calculator()
+    elapsed = perf_counter() - start
+
+    assert elapsed < STARTUP_BUDGET
+    assert "heavy_0" in calculator.operations
+    assert f"heavy_{HEAVY_PLUGINS - 1}" in calculator.operations
+    assert "modulo" in calculator.operations
+    assert not any(name.startswith("heavy_plugin_") for name in sys.modules)
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_plugin_is_imported_on_first_use():
+    """Verify only the used plugin's module is imported, exactly once."""
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=['heavy_3 2 5', 'heavy_3 1 1', 'exit']),
+        output_func=outputs.append,
+    ).run()
+
+    assert '2.0 heavy_3 5.0 = 205.0' in outputs
+    assert '1.0 heavy_3 1.0 = 101.0' in outputs
+    assert "heavy_plugin_3" in sys.modules
+    assert "heavy_plugin_4" not in sys.modules
+    assert "heavy_3" in CalculationFactory.calculations
+    assert "heavy_3" not in CalculationFactory.plugins
+    assert CalculationFactory.evaluate("heavy_3", 1.0, 2.0) == 102.0
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_self_registering_plugin():
+    """Verify plugins that register themselves on import are used as-is."""
+    assert CalculationFactory.evaluate("modulo", 7.0, 4.0) == 3.0
+    assert "modulo" not in CalculationFactory.plugins
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_plugins_in_expressions_and_batches():
+    """Verify plugin operations work in expressions and batch evaluation."""
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=['heavy_1(1, 2) + 1', 'exit']),
+        output_func=outputs.append,
+    ).run()
+    assert 'heavy_1(1, 2) + 1 = 103.0' in outputs
+    assert list(CalculationFactory.execute_batch("heavy_2", [1.0, 2.0], [0.0, 1.0])) == [
+        100.0,
+        201.0,
+    ]
+
+
+@pytest.mark.usefixtures("plugin_path")
+@pytest.mark.parametrize(
+    "name,message",
+    [
+        ("missing", "Plugin operation 'missing' failed to load"),
+        ("hypot", "Plugin operation 'hypot' is not a Calculation subclass"),
+        ("unknown", "'unknown' is not registered"),
+    ],
+    ids=[
+        "reports plugins that cannot be imported",
+        "rejects plugins that are not calculations",
+        "still rejects unknown operations",
+    ],
+)
+def test_plugin_errors(name, message):
+    """Ensure broken plugins fail with a ValueError the REPL can report."""
+    with pytest.raises(ValueError, match=message):
+        CalculationFactory.evaluate(name, 1.0, 2.0)
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_registered_operations_take_precedence():
+    """Verify a plugin cannot shadow an already registered operation."""
+    CalculationFactory.discover_plugins()
+    assert "add" not in CalculationFactory.plugins
+    assert CalculationFactory.evaluate("add", 1.0, 2.0) == 3.0
+    assert not CalculationFactory.discover_plugins()
+
+
+@pytest.mark.usefixtures("plugin_path")
+def test_explicit_registration_replaces_pending_plugin():
+    """Verify registering a discovered name drops the pending plugin entry."""
+    CalculationFactory.discover_plugins()
+    assert "hypot" in CalculationFactory.plugins
+
+    @CalculationFactory.register_calculation("hypot")
+    class _HypotCalculation(AddCalculation):  # pylint: disable=too-few-public-methods
+        """Explicitly registered replacement for the plugin."""
+
+    assert "hypot" not in CalculationFactory.plugins
+    assert CalculationFactory.evaluate("hypot", 1.0, 2.0) == 3.0
@@ -0,0 +1,186 @@
+"""Tests for bounded-cost exponentiation."""
+
+import math
+from decimal import Decimal
+from fractions import Fraction
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculation import CalculationFactory
+from app.calculator import Calculator
+from app.power import DEFAULT_ENGINE, PowerEngine, estimate_log10, powmod
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (2.0, 10.0, 1024.0),
+        (-2.0, 3.0, -8.0),
+        (0.0, 5.0, 0.0),
+        (10.0, -400.0, 0.0),
+        (math.inf, 2.0, math.inf),
+        (2, 100, 2**100),
+        (3, -1, 1 / 3),
+    ],
+    ids=[
+        "computes float powers",
+        "keeps the sign of odd powers",
+        "handles a zero base",
+        "underflows to zero",
+        "passes infinities through",
+        "uses exact integers under the bit limit",
+        "uses floats for negative integer exponents",
+    ],
+)
+def test_power_within_limits(a, b, expected):
+    """Verify powers inside the limits match plain exponentiation."""
+    assert PowerEngine().power(a, b) == expected
+
+
+def test_power_rejects_estimated_overflow():
+    """Ensure oversized float results are rejected before computing them."""
+    with pytest.raises(ValueError, match=r"Result too large: about 10\^400"):
+        PowerEngine().power(10.0, 400.0)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (10.0, 400.0, math.inf),
+        (-10.0, 401.0, -math.inf),
+        (-10.0, 400.0, math.inf),
+        (-10.0, 400.5, complex(math.inf, math.inf)),
+    ],
+    ids=[
+        "returns infinity",
+        "returns negative infinity for odd powers",
+        "returns infinity for even powers",
+        "returns complex infinity for fractional powers",
+    ],
+)
+def test_power_inf_overflow_policy(a, b, expected):
+    """Verify the inf policy replaces overflow with a signed infinity."""
+    assert PowerEngine(overflow="inf", allow_complex=True).power(a, b) == expected
+
+
+def test_power_handles_overflow_missed_by_the_estimate():
+    """Verify an overflow right at the limit still follows the policy."""
+    with patch('app.power.estimate_log10', return_value=308.0):
+        with pytest.raises(ValueError, match="Result too large"):
+            PowerEngine().power(10.0, 400.0)
+
+
+def test_power_falls_back_to_float_beyond_integer_limit():
+    """Verify oversized integer powers are computed as floats instead."""
+    engine = PowerEngine(max_int_bits=64)
+    assert engine.power(2, 31) == 2**31
+    assert isinstance(engine.power(2, 31), int)
+    result = engine.power(2, 200)
+    assert isinstance(result, float)
+    assert result == 2.0**200
+    with pytest.raises(ValueError, match="Result too large"):
+        engine.power(10, 10**6)
+
+
+def test_power_keeps_exact_types():
+    """Verify Fraction powers stay exact within the limit and Decimals stay decimal."""
+    engine = PowerEngine(max_int_bits=64)
+    assert engine.power(Fraction(2, 3), Fraction(-3)) == Fraction(27, 8)
+    assert engine.power(Fraction(4), Fraction(1, 2)) == 2.0
+    result = engine.power(Fraction(3, 2), Fraction(100))
+    assert isinstance(result, float)
+    assert result == 1.5**100
+    assert engine.power(Decimal("1.5"), Decimal("2")) == Decimal("2.25")
+    with pytest.raises(ZeroDivisionError, match="negative power"):
+        engine.power(Fraction(0), Fraction(-1))
+    with pytest.raises(ValueError, match="too large for a Decimal"):
+        engine.power(Decimal(10), Decimal(10**7))
+    with pytest.raises(ValueError, match="undefined for decimals"):
+        engine.power(Decimal(0), Decimal(0))
+
+
+def test_power_complex_results_are_opt_in():
+    """Verify negative bases with fractional exponents follow allow_complex."""
+    with pytest.raises(ValueError, match="is not real"):
+        PowerEngine().power(-8.0, 0.5)
+    with pytest.raises(ValueError, match="is not real"):
+        CalculationFactory.evaluate("power", -8.0, 0.5)
+    assert isinstance(PowerEngine(allow_complex=True).power(-8.0, 0.5), complex)
+
+
+@pytest.mark.parametrize(
+    "options,message",
+    [
+        ({"max_int_bits": 0}, "Integer bit limit must be at least 1"),
+        ({"overflow": "wrap"}, "Overflow policy must be one of"),
+    ],
+    ids=["rejects a zero bit limit", "rejects unknown overflow policies"],
+)
+def test_power_engine_rejects_invalid_options(options, message):
+    """Ensure invalid engine limits raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        PowerEngine(**options)
+
+
+def test_estimate_log10():
+    """Verify magnitude estimates, including zero bases."""
+    assert estimate_log10(10.0, 3.0) == pytest.approx(3.0)
+    assert estimate_log10(0.0, 2.0) == -math.inf
+    assert estimate_log10(0.0, 0.0) == 0.0
+
+
+def test_powmod():
+    """Verify modular exponentiation on integral operands."""
+    assert powmod(4, 13, 497) == 445
+    assert powmod(2.0, 10**18, 1_000_000_007.0) == pow(2, 10**18, 1_000_000_007)
+    assert powmod(Decimal(3), Fraction(4), 5) == 1
+    with pytest.raises(ValueError, match="must be integers"):
+        powmod(2.5, 2, 7)
+    with pytest.raises(ValueError, match="must not be zero"):
+        powmod(2, 2, 0)
+
+
+def test_powmod_is_a_registered_ternary():
+    """Verify powmod evaluates through the factory's ternary registry."""
+    assert CalculationFactory.ternary("POWMOD", 4.0, 13.0, 497.0) == 445
+    with pytest.raises(ValueError, match="is not registered"):
+        CalculationFactory.ternary("clamp", 1.0, 2.0, 3.0)
+    with patch.object(CalculationFactory, "ternaries", CalculationFactory.ternaries):
+        CalculationFactory.register_ternary("Clamp")(lambda x, low, high: min(max(x, low), high))
+        assert CalculationFactory.ternary("clamp", 5.0, 0.0, 3.0) == 3.0
+        with pytest.raises(ValueError, match="already registered"):
+            CalculationFactory.register_ternary("powmod")(powmod)
+    assert "clamp" not in CalculationFactory.ternaries
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("powmod 4 13 497", "powmod(4.0, 13.0, 497.0) = 445"),
+        ("PowMod -4 3 5", "powmod(-4.0, 3.0, 5.0) = 1"),
+        ("powmod 4 13", "Error: powmod takes exactly 3 operands."),
+        ("powmod 4 x 5", "Error: Operands must be numbers. Got 4 x 5"),
+        ("powmod 4.5 2 5", "Error: powmod operands must be integers."),
+    ],
+    ids=["evaluates", "negative base", "rejects two operands", "rejects text", "rejects floats"],
+)
+def test_calculator_evaluates_powmod(line, expected):
+    """Verify the REPL evaluates three-operand lines through the registry."""
+    output = Mock()
+    Calculator(output_func=output).process(line)
+    output.assert_called_once_with(expected)
+
+
+def test_power_calculation_is_bounded():
+    """Verify the registered power calculation and REPL use the engine."""
+    with patch.object(DEFAULT_ENGINE, 'overflow', 'inf'):
+        assert CalculationFactory.dispatch["power"](10.0, 1000.0) == math.inf
+    with pytest.raises(ValueError, match="Result too large"):
+        CalculationFactory.create_calculation("power", 10.0, 1000.0).execute()
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=['power 10 1000', 'exit']),
+        output_func=outputs.append,
+    ).run()
+    assert 'Error: Result too large: about 10^1000.' in outputs
@@ -0,0 +1,90 @@
+"""Tests for the packed binary job format."""
+
+import math
+import sys
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from app.records import (
+    JOB_RECORD,
+    RESULT_RECORD,
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_INVALID,
+    STATUS_OK,
+    STATUS_OVERFLOW,
+    evaluate_records,
+    pack_jobs,
+    run_records,
+    unpack_results,
+)
+
+
+def test_evaluate_records_mixed_operations():
+    """Verify a batch of mixed operations comes back in record order."""
+    data = pack_jobs([("add", 1, 2), ("multiply", 3, 4), (0, 5, 6), ("POWER", 2, 10)])
+    assert len(data) == 4 * JOB_RECORD.size
+    assert unpack_results(evaluate_records(data)) == [
+        (STATUS_OK, 3.0),
+        (STATUS_OK, 12.0),
+        (STATUS_OK, 11.0),
+        (STATUS_OK, 1024.0),
+    ]
+
+
+def test_evaluate_records_single_operation_uses_batch_kernel():
+    """Verify a uniform batch runs through one kernel over the columns."""
+    data = bytearray(pack_jobs([("divide", n, 2) for n in range(1, 5)]))
+    assert unpack_results(evaluate_records(memoryview(data))) == [
+        (STATUS_OK, n / 2) for n in range(1, 5)
+    ]
+
+
+def test_evaluate_records_reports_failures_per_record():
+    """Verify failing records get their error's status and NaN or infinity."""
+    data = pack_jobs([
+        ("divide", 1, 0),
+        ("add", 1, 1),
+        (99, 1, 1),
+        ("power", -8, 0.5),
+        ("power", 10, 400),
+    ])
+    results = unpack_results(evaluate_records(data))
+    assert [status for status, _ in results] == [
+        STATUS_DIVIDE_BY_ZERO, STATUS_OK, STATUS_INVALID, STATUS_INVALID, STATUS_OVERFLOW,
+    ]
+    assert [results[0][1], results[1][1], results[4][1]] == [math.inf, 2.0, math.inf]
+    assert all(math.isnan(value) for status, value in results if status == STATUS_INVALID)
+
+
+def test_evaluate_records_empty_and_truncated():
+    """Ensure empty input is fine and partial records are rejected."""
+    assert evaluate_records(b"") == bytearray()
+    with pytest.raises(ValueError, match="whole number of 24-byte records"):
+        evaluate_records(b"\x00" * (JOB_RECORD.size + 1))
+
+
+def test_run_records_streams_in_chunks():
+    """Verify records are read and written one chunk at a time."""
+    writes = []
+    source = BytesIO(pack_jobs([("subtract", n, 1) for n in range(5)]))
+    run_records(source, writes.append, chunk_records=2)
+    assert [len(chunk) // RESULT_RECORD.size for chunk in writes] == [2, 2, 1]
+    assert unpack_results(b"".join(writes))[-1] == (STATUS_OK, 3.0)
+    with pytest.raises(ValueError, match="Chunk size must be at least 1"):
+        run_records(source, writes.append, chunk_records=0)
+
+
+def test_pack_jobs_rejects_unknown_names():
+    """Ensure unknown operation names cannot be packed."""
+    with pytest.raises(ValueError):
+        pack_jobs([("modulo", 1, 2)])
+
+
+def test_evaluate_records_on_big_endian_hosts():
+    """Verify hosts whose native order is not the record order get the same results."""
+    data = pack_jobs([("add", 1, 2), ("divide", 1, 0), ("power", 10, 400), (99, 1, 2)])
+    expected = evaluate_records(data)
+    with patch.object(sys, 'byteorder', 'big'):
+        assert evaluate_records(data) == expected
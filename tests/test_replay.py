@@ -0,0 +1,235 @@
+"""Tests for session recording and the replay load generator."""
+
+import runpy
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.calculator import Calculator
+from app.replay import (
+    Divergence,
+    ReplayReport,
+    Session,
+    SessionRecorder,
+    Step,
+    format_report,
+    load_sessions,
+    main,
+    replay,
+    replay_session,
+    save_sessions,
+    synthetic_sessions,
+)
+
+
+def _record(lines):
+    """Record a session that feeds ``lines`` to a calculator."""
+    clock = Mock(side_effect=[float(tick) for tick in range(len(lines) + 1)])
+    recorder = SessionRecorder(Mock(side_effect=lines), Mock(), clock=clock)
+    Calculator(input_func=recorder.input, output_func=recorder.output).run()
+    return recorder.session()
+
+
+def test_recorder_captures_lines_timing_and_outputs():
+    """Verify each line keeps its offset and the output it produced."""
+    session = _record(["add 1 2", "bogus 1 2", "exit"])
+    assert session.preamble[0] == "Welcome to the Calculator REPL!"
+    assert session.steps == (
+        Step(1.0, "add 1 2", ("1.0 add 2.0 = 3.0",)),
+        Step(2.0, "bogus 1 2", ("Error: Unknown operation 'bogus'",)),
+        Step(3.0, "exit", ("Goodbye!",)),
+    )
+    assert session.epilogue == ()
+
+
+def test_recorder_passes_output_through_and_records_the_epilogue():
+    """Verify output still reaches the wrapped function and goodbye goes last."""
+    output = Mock()
+    recorder = SessionRecorder(Mock(side_effect=["add 1 2", EOFError]), output)
+    Calculator(input_func=recorder.input, output_func=recorder.output).run()
+    session = recorder.session()
+    output.assert_any_call("1.0 add 2.0 = 3.0")
+    assert [step.line for step in session.steps] == ["add 1 2"]
+    assert session.epilogue == ("\n\nGoodbye!",)
+
+
+def test_recorder_defaults_to_input_and_print():
+    """Verify the recorder wraps input and print when given nothing."""
+    with patch('builtins.input', return_value="exit"), patch('sys.stdout', new=StringIO()) as out:
+        recorder = SessionRecorder()
+        assert recorder.input(">>> ") == "exit"
+        recorder.output("Goodbye!")
+    assert out.getvalue() == "Goodbye!\n"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Verify sessions survive a save and load, unchecked steps included."""
+    path = str(tmp_path / "sessions.jsonl")
+    sessions = [_record(["add 1 2", "exit"]), synthetic_sessions(1, 3)[0]]
+    save_sessions(path, sessions[:1])
+    save_sessions(path, sessions[1:], append=True)
+    assert load_sessions(path) == sessions
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"steps": [{"at": 0}]}\n', '{"steps": [{"at": "x", "input": "", "output": null}]}\n', "{"],
+    ids=["missing fields", "bad timestamps", "invalid JSON"],
+)
+def test_load_rejects_invalid_sessions(tmp_path, content):
+    """Ensure a malformed file reports the offending line."""
+    path = tmp_path / "sessions.jsonl"
+    path.write_text("\n" + content, encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid session on line 2"):
+        load_sessions(str(path))
+
+
+def test_synthetic_sessions_are_repeatable():
+    """Verify generated sessions depend only on the seed."""
+    sessions = synthetic_sessions(2, 5, seed=3, think_time=0.5)
+    assert sessions == synthetic_sessions(2, 5, seed=3, think_time=0.5)
+    assert sessions != synthetic_sessions(2, 5, seed=4, think_time=0.5)
+    assert [step.at for step in sessions[0].steps] == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert all(step.outputs is None for step in sessions[0].steps)
+    with pytest.raises(ValueError, match="at least 1"):
+        synthetic_sessions(0, 5)
+
+
+def test_replay_session_matches_its_recording():
+    """Verify a faithful replay reports one latency per line and no divergence."""
+    result = replay_session(_record(["add 1 2", "x = 2", "y = add x 1", "exit", "add 5 5"]))
+    assert len(result.latencies) == 4
+    assert not result.divergences
+
+
+def test_replay_session_reports_divergences():
+    """Verify changed output is reported with what was expected."""
+    session = Session((), (Step(0.0, "add 1 2", ("1.0 add 2.0 = 4.0",)),))
+    result = replay_session(session)
+    assert result.divergences == [
+        Divergence(0, "add 1 2", ("1.0 add 2.0 = 4.0",), ("1.0 add 2.0 = 3.0",))
+    ]
+
+
+def test_replay_session_keeps_the_recorded_pace():
+    """Verify steps wait for their recorded time scaled by the speed."""
+    sleep = Mock()
+    session = Session((), (Step(0.0, "add 1 2", None), Step(10.0, "add 1 2", None)))
+    replay_session(session, speed=2.0, sleep=sleep)
+    sleep.assert_called_once()
+    assert 4.9 < sleep.call_args.args[0] <= 5.0
+
+
+def test_replay_session_uses_the_calculator_factory():
+    """Verify each session gets a calculator from the factory."""
+    factory = Mock(side_effect=lambda output: Calculator(output_func=output))
+    replay_session(synthetic_sessions(1, 2)[0], calculator_factory=factory)
+    factory.assert_called_once()
+
+
+@pytest.mark.parametrize("concurrency", [1, 4], ids=["in process", "concurrent"])
+def test_replay_aggregates_sessions(concurrency):
+    """Verify the report counts every replayed session and line."""
+    sessions = [_record(["add 1 2", "exit"]), synthetic_sessions(1, 10)[0]]
+    report = replay(sessions, concurrency=concurrency, repeat=3)
+    assert (report.sessions, report.lines) == (6, 36)
+    assert 0 < report.p50 <= report.p90 <= report.p99 <= report.max_latency
+    assert report.lines_per_sec > 0
+    assert report.divergences == ()
+
+
+def test_replay_of_nothing_reports_zeros():
+    """Verify an empty replay does not divide by zero."""
+    with patch('app.replay.perf_counter', return_value=1.0):
+        report = replay([])
+    assert report == ReplayReport(0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, ())
+
+
+@pytest.mark.parametrize(
+    "kwargs,match",
+    [({"concurrency": 0}, "at least 1"), ({"repeat": 0}, "at least 1"), ({"speed": 0}, "positive")],
+    ids=["rejects zero concurrency", "rejects zero repeats", "rejects a zero speed"],
+)
+def test_replay_rejects_invalid_settings(kwargs, match):
+    """Ensure replay settings are validated."""
+    with pytest.raises(ValueError, match=match):
+        replay([], **kwargs)
+
+
+def test_format_report_lists_divergences():
+    """Verify the report shows throughput, percentiles and divergences."""
+    divergence = Divergence(0, "add 1 2", ("4.0",), ("3.0",))
+    report = ReplayReport(1, 2, 0.5, 4.0, 1e-6, 2e-6, 3e-6, 4e-6, (divergence,) * 2)
+    text = format_report(report, max_divergences=1)
+    assert "throughput    4 lines/s" in text
+    assert "latency p99   3.0 us" in text
+    assert "divergences   2" in text
+    assert text.count("expected ['4.0'], got ['3.0']") == 1
+
+
+def test_main_records_a_session(tmp_path):
+    """Verify the record command appends the REPL session to the file."""
+    path = str(tmp_path / "sessions.jsonl")
+    for _ in range(2):
+        with patch('builtins.input', side_effect=["add 1 2", "exit"]), \
+                patch('sys.stdout', new=StringIO()):
+            assert main(["record", path]) == 0
+    sessions = load_sessions(path)
+    assert len(sessions) == 2
+    assert sessions[0].steps[0].outputs == ("1.0 add 2.0 = 3.0",)
+
+
+def test_main_runs_recorded_sessions(tmp_path):
+    """Verify the run command reports a clean replay and exits with 0."""
+    path = str(tmp_path / "sessions.jsonl")
+    save_sessions(path, [_record(["add 1 2", "exit"])])
+    with patch('sys.stdout', new=StringIO()) as out:
+        assert main(["run", path, "--repeat", "2", "--concurrency", "2"]) == 0
+    assert "sessions      2" in out.getvalue()
+
+
+def test_main_fails_on_divergence(tmp_path):
+    """Verify a diverged replay exits with 1."""
+    path = str(tmp_path / "sessions.jsonl")
+    save_sessions(path, [Session((), (Step(0.0, "add 1 2", ("wrong",)),))])
+    with patch('sys.stdout', new=StringIO()) as out:
+        assert main(["run", path]) == 1
+    assert "divergences   1" in out.getvalue()
+
+
+def test_main_replays_and_saves_synthetic_sessions(tmp_path):
+    """Verify synthetic sessions are replayed, or saved with --save."""
+    path = str(tmp_path / "synthetic.jsonl")
+    with patch('sys.stdout', new=StringIO()) as out:
+        assert main(["synthetic", "--sessions", "2", "--lines", "5"]) == 0
+        assert main(["synthetic", "--sessions", "2", "--lines", "5", "--save", path]) == 0
+    assert "lines         10" in out.getvalue()
+    assert len(load_sessions(path)) == 2
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        (["run", "missing.jsonl"], "No such file"),
+        (["synthetic", "--lines", "0"], "at least 1"),
+        (["synthetic", "--speed", "-1"], "must be positive"),
+    ],
+    ids=["missing file", "invalid line count", "invalid speed"],
+)
+def test_main_reports_errors(tmp_path, monkeypatch, argv, message):
+    """Ensure bad input is reported on stderr with exit code 1."""
+    monkeypatch.chdir(tmp_path)
+    with patch('sys.stderr', new=StringIO()) as err:
+        assert main(argv) == 1
+    assert message in err.getvalue()
+
+
+def test_module_entry_point():
+    """Verify ``python -m app.replay`` replays sessions and exits with main's code."""
+    argv = ['app.replay', 'synthetic', '--sessions', '1', '--lines', '5']
+    with patch('sys.argv', argv), patch('sys.stdout', new=StringIO()) as out:
+        with pytest.raises(SystemExit) as excinfo:
+            runpy.run_module('app.replay', run_name='__main__')
+    assert excinfo.value.code == 0
+    assert "lines         5" in out.getvalue()
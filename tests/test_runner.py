@@ -0,0 +1,175 @@
+"""Tests for the sharded multi-process job runner."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.cache import PersistentCache, ResultCache
+from app.calculator import Calculator
+from app.numeric import parse_fraction
+from app.output import number_formatter
+from app.runner import (
+    ShardOptions,
+    evaluate_shard,
+    has_assignments,
+    run_sharded,
+    shard_offsets,
+)
+
+JOBS = "".join(
+    f"{operation} {index} {index % 4}\n"
+    for index in range(200)
+    for operation in ("add", "divide", "power", "bogus")
+)
+
+
+def _stream_output(text):
+    """Return the single-process stream output for the given jobs."""
+    parts = []
+    Calculator().stream(text.splitlines(), parts.append)
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("shards", [1, 3, 7, 64])
+def test_shard_offsets_cover_file_on_line_boundaries(tmp_path, shards):
+    """Verify shards are contiguous, cover the file and start at line starts."""
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS, encoding="utf-8")
+    data = path.read_bytes()
+
+    offsets = shard_offsets(str(path), shards)
+
+    assert offsets[0][0] == 0
+    assert offsets[-1][1] == len(data)
+    assert len(offsets) <= shards
+    for (_, end), (start, _) in zip(offsets, offsets[1:]):
+        assert end == start
+        assert data[start - 1:start] == b"\n"
+
+
+def test_shard_offsets_handles_tiny_files(tmp_path):
+    """Verify more shards than lines collapses to the available lines."""
+    path = tmp_path / "jobs.txt"
+    path.write_text("add 1 1\n", encoding="utf-8")
+    assert shard_offsets(str(path), 8) == [(0, 8)]
+
+
+def test_shard_offsets_rejects_invalid_count(tmp_path):
+    """Ensure the shard count must be positive."""
+    with pytest.raises(ValueError, match="Shard count must be at least 1"):
+        shard_offsets(str(tmp_path / "missing.txt"), 0)
+
+
+def test_evaluate_shard_matches_stream(tmp_path):
+    """Verify a shard produces the same output as streaming its lines."""
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS, encoding="utf-8")
+    start, end = shard_offsets(str(path), 4)[1]
+    expected = _stream_output(path.read_bytes()[start:end].decode("utf-8"))
+    assert evaluate_shard(str(path), start, end) == expected
+
+
+def test_evaluate_shard_splits_on_newlines_only(tmp_path):
+    """Verify separators other than newlines stay inside their job line."""
+    path = tmp_path / "jobs.txt"
+    path.write_text("add 1\x0c2\nadd 2\u20283\n", encoding="utf-8")
+    expected = "1.0 add 2.0 = 3.0\n2.0 add 3.0 = 5.0\n"
+    assert evaluate_shard(str(path), 0, path.stat().st_size) == expected
+    writes = []
+    run_sharded(str(path), writes.append, workers=1)
+    assert "".join(writes) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sharded_matches_single_process(tmp_path, workers):
+    """Verify sharded output is identical to a single-process run."""
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS, encoding="utf-8")
+    writes = []
+    run_sharded(str(path), writes.append, workers=workers)
+    assert "".join(writes) == _stream_output(JOBS)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sharded_keeps_assignments_in_order(tmp_path, workers):
+    """Verify variables assigned in one part of a file reach jobs in every other."""
+    jobs = "rate = 2\n" + JOBS + "rate = 3\ncost = multiply rate 4\n" + JOBS + "cost\n"
+    path = tmp_path / "jobs.txt"
+    path.write_text(jobs, encoding="utf-8")
+    writes = []
+    run_sharded(str(path), writes.append, workers=workers)
+    assert "".join(writes) == _stream_output(jobs)
+    assert "".join(writes).endswith("cost = 12.0\n")
+
+
+def test_has_assignments_scans_every_block(tmp_path):
+    """Verify an assignment is found wherever it sits in the file."""
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS, encoding="utf-8")
+    assert not has_assignments(str(path), block_size=7)
+    path.write_text(JOBS + "x = 1\n", encoding="utf-8")
+    assert has_assignments(str(path), block_size=7)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sharded_shares_persistent_cache(tmp_path, workers):
+    """Verify workers fill and reuse one persistent result cache."""
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS, encoding="utf-8")
+    cache_path = str(tmp_path / "results.db")
+    for _ in range(2):
+        writes = []
+        run_sharded(str(path), writes.append, workers, ShardOptions(cache_path, cache_ttl=3600))
+        assert "".join(writes) == _stream_output(JOBS)
+    with PersistentCache(cache_path) as cache:
+        assert cache.get_many([("power", 5.0, 1.0), ("add", 7.0, 3.0)]) == {
+            ("power", 5.0, 1.0): 5.0,
+            ("add", 7.0, 3.0): 10.0,
+        }
+
+
+def test_evaluate_shard_uses_result_cache(tmp_path):
+    """Verify a cache size gives the shard its own in-memory result cache."""
+    path = tmp_path / "jobs.txt"
+    path.write_text("power 2 8\npower 2 8\n", encoding="utf-8")
+    with patch('app.runner.ResultCache', wraps=ResultCache) as result_cache:
+        output = evaluate_shard(str(path), 0, path.stat().st_size, ShardOptions(cache_size=4))
+    result_cache.assert_called_once_with(4)
+    assert output == "2.0 power 8.0 = 256.0\n" * 2
+
+
+def test_run_sharded_defaults_to_cpu_count(tmp_path, monkeypatch):
+    """Verify the worker count defaults to the machine's CPU count."""
+    monkeypatch.setattr("app.runner.os.cpu_count", lambda: None)
+    path = tmp_path / "jobs.txt"
+    path.write_text("multiply 2 3\n", encoding="utf-8")
+    writes = []
+    run_sharded(str(path), writes.append)
+    assert writes == ["2.0 multiply 3.0 = 6.0\n"]
+
+
+def test_run_sharded_rejects_invalid_workers(tmp_path):
+    """Ensure the worker count must be positive."""
+    with pytest.raises(ValueError, match="Worker count must be at least 1"):
+        run_sharded(str(tmp_path / "jobs.txt"), print, workers=0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sharded_formats_numbers(tmp_path, workers):
+    """Verify shards render results with the given number format."""
+    path = tmp_path / "jobs.txt"
+    path.write_text("divide 2 3\nadd 1 2\n", encoding="utf-8")
+    writes = []
+    options = ShardOptions(number_format=number_formatter("compact", 3))
+    run_sharded(str(path), writes.append, workers=workers, options=options)
+    assert "".join(writes) == "2 divide 3 = 0.667\n1 add 2 = 3\n"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sharded_parses_numbers(tmp_path, workers):
+    """Verify shards parse operands with the given number backend."""
+    path = tmp_path / "jobs.txt"
+    path.write_text("add 1 2\ndivide 1 3\n", encoding="utf-8")
+    writes = []
+    run_sharded(str(path), writes.append, workers, ShardOptions(number_parser=parse_fraction))
+    assert "".join(writes) == "1 add 2 = 3\n1 divide 3 = 1/3\n"
@@ -0,0 +1,176 @@
+"""Tests for the asyncio calculator server."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.server import CalculatorServer, serve
+
+
+def _run_with_server(scenario, **options):
+    """Start a server on a free localhost port, run a client scenario, stop it."""
+    async def main():
+        server = CalculatorServer(port=0, **options)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+async def _connect(server):
+    """Open a client connection to the server."""
+    return await asyncio.open_connection(server.host, server.port)
+
+
+def test_server_answers_pipelined_requests():
+    """Verify a client can send many lines at once and get ordered answers."""
+    async def scenario(server):
+        reader, writer = await _connect(server)
+        writer.write(b"add 1 2\n\ndivide 1 0\n(1 + 2) * 3\nexit\n")
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    assert _run_with_server(scenario) == (
+        "1.0 add 2.0 = 3.0\n"
+        "Error: Cannot divide by zero.\n"
+        "(1 + 2) * 3 = 9.0\n"
+        "Goodbye!\n"
+    )
+
+
+def test_server_keeps_history_per_session():
+    """Verify concurrent sessions do not share history."""
+    async def scenario(server):
+        first_reader, first = await _connect(server)
+        second_reader, second = await _connect(server)
+        first.write(b"add 1 1\n")
+        second.write(b"multiply 2 3\n")
+        await first_reader.readline()
+        await second_reader.readline()
+        assert server.active_connections == 2
+        first.write(b"history\nexit\n")
+        second.write(b"exit\n")
+        history = (await first_reader.read()).decode()
+        await second_reader.read()
+        first.close()
+        second.close()
+        return history
+
+    history = _run_with_server(scenario)
+    assert "(1 entries)" in history
+    assert "1. 1.0 add 1.0 = 2.0" in history
+    assert "multiply" not in history
+
+
+@pytest.mark.parametrize(
+    "options,request_bytes,expected",
+    [
+        ({"idle_timeout": 0.05}, b"", "Error: idle timeout\n"),
+        ({"line_limit": 16}, b"add " + b"1" * 64 + b" 2\n", "Error: line too long\n"),
+    ],
+    ids=["closes idle sessions", "rejects overlong lines"],
+)
+def test_server_enforces_limits(options, request_bytes, expected):
+    """Ensure idle and oversized connections are closed with an error."""
+    async def scenario(server):
+        reader, writer = await _connect(server)
+        writer.write(request_bytes)
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    assert _run_with_server(scenario, **options) == expected
+
+
+def test_server_rejects_connections_over_limit():
+    """Ensure connections beyond the limit are refused with an error."""
+    async def scenario(server):
+        reader, writer = await _connect(server)
+        writer.write(b"add 1 1\n")
+        await reader.readline()
+        extra_reader, extra = await _connect(server)
+        refused = await extra_reader.read()
+        extra.close()
+        writer.close()
+        await writer.wait_closed()
+        return refused.decode()
+
+    assert _run_with_server(scenario, max_connections=1) == (
+        "Error: server is at its connection limit\n"
+    )
+
+
+def test_server_survives_client_disconnect():
+    """Verify a client vanishing mid-session releases its slot."""
+    async def scenario(server):
+        _, writer = await _connect(server)
+        writer.write(b"add 1 1\n")
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):
+            if server.active_connections == 0:
+                break
+            await asyncio.sleep(0.01)
+        return server.active_connections
+
+    assert _run_with_server(scenario) == 0
+
+
+def test_server_ignores_connection_errors():
+    """Verify a reset while reading or closing still releases the slot."""
+    server = CalculatorServer()
+    reader = Mock(read=AsyncMock(side_effect=ConnectionResetError))
+    writer = Mock(drain=AsyncMock(side_effect=ConnectionResetError))
+    asyncio.run(server._handle(reader, writer))  # pylint: disable=protected-access
+    assert server.active_connections == 0
+    writer.drain.assert_awaited_once()
+    writer.close.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "options,message",
+    [
+        ({"max_connections": 0}, "Connection limit must be at least 1"),
+        ({"idle_timeout": 0}, "Idle timeout must be positive"),
+    ],
+    ids=["rejects a zero connection limit", "rejects a zero idle timeout"],
+)
+def test_server_rejects_invalid_options(options, message):
+    """Ensure invalid server limits raise ValueError."""
+    with pytest.raises(ValueError, match=message):
+        CalculatorServer(**options)
+
+
+def test_serve_runs_until_interrupted():
+    """Verify serve() binds the server and exits cleanly on Ctrl+C."""
+    async def interrupted(self):
+        await self.start()
+        await self.close()
+        raise KeyboardInterrupt
+
+    with patch.object(CalculatorServer, 'serve_forever', interrupted):
+        serve("127.0.0.1", 0, idle_timeout=1.0)
+
+
+def test_server_serve_forever_until_cancelled():
+    """Verify serve_forever binds on demand and stops when cancelled."""
+    async def main():
+        server = CalculatorServer(port=0)
+        task = asyncio.create_task(server.serve_forever())
+        while server.port == 0:
+            await asyncio.sleep(0.01)
+        reader, writer = await _connect(server)
+        writer.write(b"power 2 10\n")
+        response = await reader.readline()
+        writer.close()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return response.decode()
+
+    assert asyncio.run(main()) == "2.0 power 10.0 = 1024.0\n"
@@ -0,0 +1,204 @@
+"""Tests for named variables and incremental recomputation."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.calculator import Calculator
+from app.variables import Formula, Workspace
+
+
+def test_assign_evaluates_formulas():
+    """Verify numbers, references and operations over variables."""
+    workspace = Workspace()
+    assert workspace.assign("a", "2") == [("a", 2.0)]
+    workspace.assign("b", "3")
+    assert workspace.assign("x", "ADD a b") == [("x", 5.0)]
+    assert workspace.assign("y", "multiply x a 10") == [("y", 100.0)]
+    assert workspace.assign("z", "x") == [("z", 5.0)]
+    assert (workspace["x"], workspace["y"], workspace["z"]) == (5.0, 100.0, 5.0)
+    assert list(workspace) == ["a", "b", "x", "y", "z"]
+    assert len(workspace) == 5 and "x" in workspace and "w" not in workspace
+    assert workspace.formula("y") == Formula("multiply", ("x", "a", 10.0))
+    assert str(workspace.formula("y")) == "multiply x a 10.0"
+    assert str(workspace.formula("z")) == "x"
+
+
+def test_update_recomputes_dependents_in_topological_order():
+    """Verify a diamond recomputes each dependent once, after its inputs."""
+    workspace = Workspace()
+    workspace.assign("a", "1")
+    workspace.assign("d", "5")
+    workspace.assign("b", "add a 1")
+    workspace.assign("c", "multiply a 2")
+    workspace.assign("e", "add b c")
+    workspace.assign("unrelated", "add d 1")
+    workspace.evaluations = 0
+
+    assert workspace.assign("a", "10") == [
+        ("a", 10.0), ("b", 11.0), ("c", 20.0), ("e", 31.0),
+    ]
+    assert workspace.evaluations == 4
+    assert workspace["unrelated"] == 6.0
+
+
+def test_unchanged_values_stop_propagation():
+    """Verify dependents of a recomputed but unchanged value are skipped."""
+    workspace = Workspace()
+    workspace.assign("a", "1")
+    workspace.assign("zero", "multiply a 0")
+    workspace.assign("total", "add zero 1")
+    workspace.evaluations = 0
+
+    assert workspace.assign("a", "2") == [("a", 2.0), ("zero", 0.0)]
+    assert workspace.evaluations == 2
+    assert workspace.assign("a", "2") == [("a", 2.0)]
+
+
+def test_work_is_proportional_to_what_changed():
+    """Verify a long chain recomputes only below the changed variable."""
+    workspace = Workspace()
+    workspace.assign("v0", "0")
+    for index in range(1, 5000):
+        workspace.assign(f"v{index}", f"add v{index - 1} 1")
+    workspace.evaluations = 0
+
+    workspace.assign("v4990", "100")
+    assert workspace.evaluations == 10
+    assert workspace["v4999"] == 109.0
+
+    workspace.assign("v0", "1")
+    assert workspace.evaluations == 10 + 4990
+    assert workspace["v4989"] == 4990.0
+
+
+def test_redefinition_drops_old_dependencies():
+    """Verify a variable stops following inputs its new formula dropped."""
+    workspace = Workspace()
+    workspace.assign("a", "1")
+    workspace.assign("b", "2")
+    workspace.assign("x", "add a b")
+    workspace.assign("x", "add b 10")
+    assert workspace.assign("a", "5") == [("a", 5.0)]
+    assert workspace.assign("b", "5") == [("b", 5.0), ("x", 15.0)]
+
+
+@pytest.mark.parametrize(
+    "definitions,name,source",
+    [
+        ([("a", "1")], "a", "add a 1"),
+        ([("a", "1"), ("b", "add a 1"), ("c", "b")], "a", "multiply c 2"),
+    ],
+    ids=["rejects a self reference", "rejects an indirect cycle"],
+)
+def test_circular_references_are_rejected(definitions, name, source):
+    """Ensure cycles are refused and leave the workspace unchanged."""
+    workspace = Workspace()
+    for variable, formula in definitions:
+        workspace.assign(variable, formula)
+    with pytest.raises(ValueError, match=f"Circular reference: '{name}'"):
+        workspace.assign(name, source)
+    assert workspace[name] == 1.0
+    assert str(workspace.formula(name)) == "1.0"
+
+
+def test_errors_propagate_and_recover():
+    """Verify failures are stored, reported downstream and cleared on fix."""
+    workspace = Workspace()
+    workspace.assign("a", "2")
+    workspace.assign("inverse", "divide 1 a")
+    workspace.assign("double", "multiply inverse 2")
+
+    updates = dict(workspace.assign("a", "0"))
+    assert str(updates["inverse"]) == "Cannot divide by zero."
+    assert str(updates["double"]) == "'inverse' has an error"
+    with pytest.raises(ZeroDivisionError):
+        _ = workspace["inverse"]
+
+    assert workspace.assign("a", "4") == [("a", 4.0), ("inverse", 0.25), ("double", 0.5)]
+
+
+@pytest.mark.parametrize(
+    "name,source,message",
+    [
+        ("1x", "1", "Invalid variable name '1x'"),
+        ("add", "1", "'add' is reserved"),
+        ("Mean", "1", "'Mean' is reserved"),
+        ("HELP", "1", "'HELP' is reserved"),
+        ("inf", "1", "'inf' is a number"),
+        ("NaN", "1", "'NaN' is a number"),
+        ("Infinity", "1", "'Infinity' is a number"),
+        ("x", "add a 1", "Unknown variable 'a'"),
+        ("x", "modulo 1 2", "Unknown operation 'modulo'"),
+        ("x", "add 1", "Invalid formula"),
+        ("x", "", "Invalid formula"),
+    ],
+    ids=[
+        "rejects names that are not identifiers",
+        "rejects operation names",
+        "rejects aggregate names",
+        "rejects reserved command names",
+        "rejects infinity",
+        "rejects nan",
+        "rejects spelled-out infinity",
+        "rejects undefined references",
+        "rejects unknown operations",
+        "rejects formulas with one operand",
+        "rejects empty formulas",
+    ],
+)
+def test_assign_errors(name, source, message):
+    """Ensure invalid assignments raise ValueError and define nothing."""
+    workspace = Workspace(reserved_names=["help"])
+    with pytest.raises(ValueError, match=message):
+        workspace.assign(name, source)
+    assert name not in workspace
+
+
+def test_unknown_variable_lookups():
+    """Ensure reading an undefined variable raises ValueError."""
+    workspace = Workspace()
+    with pytest.raises(ValueError, match="Unknown variable 'x'"):
+        _ = workspace["x"]
+    with pytest.raises(ValueError, match="Unknown variable 'x'"):
+        workspace.formula("x")
+
+
+def test_calculator_variables():
+    """Verify assignments, lookups and the vars command in the REPL."""
+    outputs = []
+    Calculator(
+        input_func=Mock(side_effect=[
+            'vars', 'a = 2', 'x = add a 3', 'half = divide x 0', 'a = 5',
+            'x', 'exit = 1', 'vars', 'help', 'exit',
+        ]),
+        output_func=outputs.append,
+    ).run()
+    assert 'No variables defined.' in outputs
+    assert 'a = 2.0' in outputs
+    assert 'half = Error: Cannot divide by zero.' in outputs
+    assert 'a = 5.0\nx = 8.0\nhalf = Error: Cannot divide by zero.' in outputs
+    assert 'x = 8.0' in outputs
+    assert "Error: 'exit' is reserved and cannot be a variable name" in outputs
+    assert 'x = add a 3.0 = 8.0' in outputs
+    assert 'half = divide x 0.0 = Error: Cannot divide by zero.' in outputs
+    assert '  vars       - Show variables, their formulas and values' in outputs
+
+
+def test_calculator_streams_assignments():
+    """Verify job files can define and update variables."""
+    written = []
+    Calculator().stream(["rate = 2", "cost = multiply rate 3", "rate = 4"], written.append)
+    assert written == ["rate = 2.0\ncost = 6.0\nrate = 4.0\ncost = 12.0\n"]
+
+
+def test_calculator_streams_variable_values():
+    """Verify a bare variable name prints its value in streams as in the REPL."""
+    written = []
+    Calculator().stream(["rate = 2", "rate", "missing"], written.append)
+    assert written[0].splitlines()[:2] == ["rate = 2.0", "rate = 2.0"]
+    output = Mock()
+    calculator = Calculator(output_func=output)
+    calculator.process("rate = 2")
+    calculator.process("rate")
+    output.assert_called_with("rate = 2.0")